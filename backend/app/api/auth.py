@@ -1,33 +1,44 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from sqlalchemy import select
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBasic, HTTPBasicCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password
 from app.db import get_db_session
-from app.models import User
-from app.schemas import UserOut
+from app.schemas import LoginRequest, TokenOut, UserOut
+from app.services.auth_service import (
+    AuthenticatedUser,
+    TokenSigningUnavailable,
+    authenticate,
+    issue_token,
+    verify_token,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-security = HTTPBasic()
+login_router = APIRouter(prefix="/auth", tags=["auth"])
+security = HTTPBasic(auto_error=False)
+bearer = HTTPBearer(auto_error=False)
 
 
 def require_user(
-    credentials: HTTPBasicCredentials = Depends(security),
+    token: HTTPAuthorizationCredentials | None = Depends(bearer),
+    credentials: HTTPBasicCredentials | None = Depends(security),
     session: Session = Depends(get_db_session),
-) -> User:
-    """Require a valid user."""
+) -> AuthenticatedUser:
+    """Require a valid session token or HTTP Basic credentials."""
 
-    result = session.execute(select(User).where(User.username == credentials.username))
-    user = result.scalar_one_or_none()
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if token is not None:
+        user = verify_token(token.credentials)
+    elif credentials is not None:
+        user = authenticate(session, credentials.username, credentials.password)
+    else:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Basic"})
+    if user is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return user
 
 
-def require_admin(user: User = Depends(require_user)) -> User:
+def require_admin(user: AuthenticatedUser = Depends(require_user)) -> AuthenticatedUser:
     """Require admin role."""
 
     if user.role != "admin":
@@ -35,8 +46,22 @@ def require_admin(user: User = Depends(require_user)) -> User:
     return user
 
 
+@login_router.post("/login", response_model=TokenOut)
+def login(payload: LoginRequest, session: Session = Depends(get_db_session)) -> TokenOut:
+    """Exchange username and password for a short-lived session token."""
+
+    user = authenticate(session, payload.username, payload.password)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        token = issue_token(user)
+    except TokenSigningUnavailable as exc:
+        raise HTTPException(status_code=503, detail="Token login is not configured, use HTTP Basic") from exc
+    return TokenOut(access_token=token.value, expires_in=token.expires_in)
+
+
 @router.get("/me", response_model=UserOut)
-def me(user: User = Depends(require_user)) -> UserOut:
+def me(user: AuthenticatedUser = Depends(require_user)) -> UserOut:
     """Return current user."""
 
     return UserOut(id=user.id, username=user.username, role=user.role)
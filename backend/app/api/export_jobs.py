@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import get_db_session
+from app.models import ExportJob
+from app.schemas import ExportJobCreate, ExportJobOut
+from app.services.export_jobs import JOB_DONE, create_export_job, get_export_job, requeue_missing_result
+
+router = APIRouter(tags=["exports"])
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.post("/projects/{project_id}/exports", response_model=ExportJobOut, status_code=202)
+def create_export(
+    project_id: int,
+    payload: ExportJobCreate,
+    session: Session = Depends(get_db_session),
+) -> ExportJobOut:
+    """Queue a background export of the project."""
+
+    try:
+        job = create_export_job(session, project_id, payload.format)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
+    return _serialize_job(job)
+
+
+@router.get("/exports/{job_id}", response_model=ExportJobOut)
+def get_export(
+    job_id: int,
+    session: Session = Depends(get_db_session),
+) -> ExportJobOut:
+    """Return export job status; a done job whose file was lost is queued again."""
+
+    return _serialize_job(_get_job(session, job_id))
+
+
+@router.get("/exports/{job_id}/download")
+def download_export(
+    job_id: int,
+    session: Session = Depends(get_db_session),
+) -> FileResponse:
+    """Download the result of a finished export job.
+
+    A lost file (restart, redeploy, another replica) queues the job again,
+    so the client gets 409 and polls the job until it is done.
+    """
+
+    job = _get_job(session, job_id)
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=409, detail="Export is not ready")
+    return FileResponse(
+        job.file_path,
+        media_type=EXPORT_MEDIA_TYPES[job.format],
+        filename=f"project-{job.project_id}-export.{job.format}",
+    )
+
+
+def _get_job(session: Session, job_id: int) -> ExportJob:
+    job = get_export_job(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    requeue_missing_result(session, job)
+    return job
+
+
+def _serialize_job(job: ExportJob) -> ExportJobOut:
+    download_url = None
+    if job.status == JOB_DONE:
+        download_url = f"{settings.api_prefix}/exports/{job.id}/download"
+    return ExportJobOut(
+        id=job.id,
+        project_id=job.project_id,
+        format=job.format,
+        status=job.status,
+        progress=job.progress,
+        error=job.error,
+        file_size=job.file_size,
+        created_at=job.created_at.isoformat(),
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+        expires_at=job.expires_at.isoformat(),
+        download_url=download_url,
+    )
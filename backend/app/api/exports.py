@@ -1,333 +1,221 @@
 from __future__ import annotations
 
-import csv
-import io
-from collections import defaultdict
-from dataclasses import dataclass
+import os
+import time
+from collections.abc import Callable, Iterator
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response, StreamingResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
-
-from app.core.calculator import (
-    ModuleHours,
-    apply_project_coefficients,
-    merge_module_overrides,
-    resolve_effective_levels,
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+from app.db import SessionLocal, get_db_session, open_snapshot_session
+from app.services.bulk_export import iter_projects_zip, resolve_bulk_project_ids
+from app.services.export_cache import etag_for, etag_matches, export_cache, export_cache_key, iter_file_chunks
+from app.services.export_render import render_pdf
+from app.services.export_service import (
+    ExportRows,
+    collect_export_rows,
+    iter_portfolio_parquet,
+    iter_project_csv,
+    iter_project_parquet,
+    iter_project_xlsx,
 )
-from app.db import get_db_session
-from app.models import Assignment, Project, ProjectInfrastructure, ProjectModule, Rate
+from app.services.metrics import EXPORT_RENDER_SECONDS
+from app.services.render_pool import RenderPoolBusy, render_pool
 
 router = APIRouter(prefix="/projects", tags=["exports"])
+bulk_router = APIRouter(prefix="/exports", tags=["exports"])
 
-
-ROLE_DEFAULT_LEVEL = {
-    "frontend": "middle",
-    "backend": "senior",
-    "qa": "middle",
-}
-
-
-@dataclass(frozen=True)
-class WorkRow:
-    """Work row for export."""
-
-    module_name: str
-    role: str
-    level: str
-    hours: float
-    rate: float
-    cost: float
-
-
-@dataclass(frozen=True)
-class InfraRow:
-    """Infrastructure row for export."""
-
-    name: str
-    quantity: int
-    unit_cost: float
-    total_cost: float
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 @router.get("/{project_id}/export.csv")
-def export_project_csv(
-    project_id: int,
-    session: Session = Depends(get_db_session),
-) -> Response:
+def export_project_csv(project_id: int, request: Request) -> Response:
     """Export project data to CSV."""
 
-    data = _collect_export_data(session, project_id)
-    csv_text = _build_csv(data)
-    filename = f"project-{project_id}-export.csv"
-    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return Response(content=csv_text, media_type="text/csv; charset=utf-8", headers=headers)
-
-
-@router.get("/{project_id}/export.pdf")
-def export_project_pdf(
-    project_id: int,
-    session: Session = Depends(get_db_session),
-) -> StreamingResponse:
-    """Export project data to PDF."""
-
-    data = _collect_export_data(session, project_id)
-    buffer = io.BytesIO()
-    _build_pdf(data, buffer)
-    buffer.seek(0)
-    filename = f"project-{project_id}-export.pdf"
-    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
-
+    return _streamed_export(request, project_id, "csv", "text/csv; charset=utf-8", iter_project_csv)
 
-def _collect_export_data(session: Session, project_id: int) -> dict[str, list]:
-    project = _get_project(session, project_id)
-    project_modules = _load_project_modules(session, project_id)
-    assignments = _load_assignments(session, project_id)
-    rates = _load_rates(session)
-    infra = _load_project_infrastructure(session, project_id)
-
-    work_rows = _build_work_rows(project, project_modules, assignments, rates)
-    infra_rows = _build_infra_rows(infra)
-    return {
-        "project": project,
-        "work": work_rows,
-        "infra": infra_rows,
-    }
-
-
-def _build_csv(data: dict[str, list]) -> str:
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=";")
-
-    writer.writerow(["Работы"])
-    writer.writerow(["Модуль", "Роль", "Уровень", "Часы", "Ставка", "Стоимость"])
-    for row in data["work"]:
-        writer.writerow(
-            [
-                row.module_name,
-                row.role,
-                row.level,
-                _format_number(row.hours),
-                _format_number(row.rate),
-                _format_number(row.cost),
-            ]
-        )
 
-    writer.writerow([])
-    writer.writerow(["Инфраструктура"])
-    writer.writerow(["Элемент", "Количество", "Стоимость/ед.", "Итого"])
-    for row in data["infra"]:
-        writer.writerow(
-            [
-                row.name,
-                row.quantity,
-                _format_number(row.unit_cost),
-                _format_number(row.total_cost),
-            ]
-        )
+@router.get("/{project_id}/export.xlsx")
+def export_project_xlsx(project_id: int, request: Request) -> Response:
+    """Export project data to an Excel workbook."""
 
-    return output.getvalue()
+    return _streamed_export(request, project_id, "xlsx", XLSX_MEDIA_TYPE, iter_project_xlsx)
 
 
-def _build_pdf(data: dict[str, list], buffer: io.BytesIO) -> None:
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=24, leftMargin=24, topMargin=24, bottomMargin=24)
-    elements = []
+@router.get("/{project_id}/export.parquet")
+def export_project_parquet(project_id: int, request: Request) -> Response:
+    """Export project line items to Parquet."""
 
-    elements.append(Paragraph("Экспорт оценки проекта", styles["Title"]))
-    elements.append(Spacer(1, 12))
+    return _streamed_export(request, project_id, "parquet", PARQUET_MEDIA_TYPE, iter_project_parquet)
 
-    work_table = _build_work_table(data["work"])
-    elements.append(Paragraph("Работы", styles["Heading2"]))
-    elements.append(work_table)
-    elements.append(Spacer(1, 16))
 
-    infra_table = _build_infra_table(data["infra"])
-    elements.append(Paragraph("Инфраструктура", styles["Heading2"]))
-    elements.append(infra_table)
+@router.get("/{project_id}/export.pdf")
+async def export_project_pdf(project_id: int, request: Request) -> Response:
+    """Export project data to PDF."""
 
-    doc.build(elements)
+    session = await run_in_threadpool(open_snapshot_session)
+    try:
+        key = await run_in_threadpool(_export_key, session, project_id, "pdf")
+        if etag_matches(request.headers.get("if-none-match"), key):
+            return _not_modified(key)
+        headers = _export_headers(project_id, "pdf", key)
+        cached = await run_in_threadpool(_cached_export, key, "application/pdf", headers)
+        if cached is not None:
+            return cached
+        data = await run_in_threadpool(_collect_export_data, session, project_id)
+    finally:
+        await run_in_threadpool(session.close)
+
+    started = time.perf_counter()
+    try:
+        content = await render_pool.run(render_pdf, data.work, data.infra)
+    except RenderPoolBusy as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="Export queue is full, try again later",
+            headers={"Retry-After": str(settings.render_retry_after_seconds)},
+        ) from exc
+    EXPORT_RENDER_SECONDS.observe(time.perf_counter() - started, format="pdf")
+    await run_in_threadpool(export_cache.put, key, content)
+    return Response(content=content, media_type="application/pdf", headers=headers)
+
+
+@bulk_router.get("/projects.zip")
+def export_projects_zip(
+    ids: list[int] | None = Query(default=None),
+    formats: list[Literal["csv", "pdf", "xlsx"]] = Query(default=["csv", "pdf"]),
+    session: Session = Depends(get_db_session),
+) -> StreamingResponse:
+    """Export the given projects, or all projects, as a ZIP of per-project files."""
+
+    try:
+        project_ids = resolve_bulk_project_ids(session, ids)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        iter_projects_zip(project_ids, list(dict.fromkeys(formats))),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="projects-export.zip"'},
+    )
 
 
-def _build_work_table(rows: list[WorkRow]) -> Table:
-    table_data = [["Модуль", "Роль", "Уровень", "Часы", "Ставка", "Стоимость"]]
-    for row in rows:
-        table_data.append(
-            [
-                row.module_name,
-                row.role,
-                row.level,
-                _format_number(row.hours),
-                _format_number(row.rate),
-                _format_number(row.cost),
-            ]
-        )
-    table = Table(table_data, colWidths=[160, 60, 70, 55, 65, 70])
-    _apply_table_style(table)
-    return table
-
-
-def _build_infra_table(rows: list[InfraRow]) -> Table:
-    table_data = [["Элемент", "Количество", "Стоимость/ед.", "Итого"]]
-    for row in rows:
-        table_data.append(
-            [
-                row.name,
-                str(row.quantity),
-                _format_number(row.unit_cost),
-                _format_number(row.total_cost),
-            ]
-        )
-    table = Table(table_data, colWidths=[210, 80, 100, 80])
-    _apply_table_style(table)
-    return table
-
-
-def _apply_table_style(table: Table) -> None:
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
+@bulk_router.get("/portfolio.parquet")
+def export_portfolio_parquet(
+    ids: list[int] | None = Query(default=None),
+    session: Session = Depends(get_db_session),
+) -> StreamingResponse:
+    """Export line items of the given projects, or all projects, to one Parquet file."""
+
+    try:
+        project_ids = resolve_bulk_project_ids(session, ids)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        _stream_portfolio_parquet(project_ids),
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="portfolio-export.parquet"'},
     )
 
 
-def _build_work_rows(
-    project: Project,
-    project_modules: list[ProjectModule],
-    assignments: dict[tuple[int, str], str],
-    rates: dict[tuple[str, str], float],
-) -> list[WorkRow]:
-    rows: list[WorkRow] = []
-    for project_module in project_modules:
-        base_hours = ModuleHours(
-            frontend=project_module.module.hours_frontend,
-            backend=project_module.module.hours_backend,
-            qa=project_module.module.hours_qa,
-        )
-        merged = merge_module_overrides(
-            base_hours=base_hours,
-            override_frontend=project_module.override_frontend,
-            override_backend=project_module.override_backend,
-            override_qa=project_module.override_qa,
-        )
-        uncertainty_level = resolve_effective_levels(
-            project.uncertainty_level,
-            project_module.uncertainty_level,
-        )
-        uiux_level = resolve_effective_levels(
-            project.uiux_level,
-            project_module.uiux_level,
-        )
-        legacy_code = (
-            project_module.legacy_code if project_module.legacy_code is not None else project.legacy_code
-        )
-        adjusted = apply_project_coefficients(
-            hours=merged,
-            uncertainty_level=uncertainty_level,
-            uiux_level=uiux_level,
-            legacy_code=legacy_code,
-        )
-        role_hours = {
-            "frontend": adjusted.frontend,
-            "backend": adjusted.backend,
-            "qa": adjusted.qa,
-        }
-        for role, hours in role_hours.items():
-            level = _resolve_level(assignments, project_module.id, role)
-            rate = rates.get((role, level), 0.0)
-            rows.append(
-                WorkRow(
-                    module_name=project_module.module.name,
-                    role=role,
-                    level=level,
-                    hours=hours,
-                    rate=rate,
-                    cost=hours * rate,
-                )
-            )
-    return rows
-
-
-def _build_infra_rows(items: list[ProjectInfrastructure]) -> list[InfraRow]:
-    rows: list[InfraRow] = []
-    for item in items:
-        unit_cost = item.infrastructure_item.unit_cost if item.infrastructure_item else 0.0
-        rows.append(
-            InfraRow(
-                name=item.infrastructure_item.name if item.infrastructure_item else "Инфраструктура",
-                quantity=item.quantity,
-                unit_cost=unit_cost,
-                total_cost=unit_cost * item.quantity,
-            )
+def _streamed_export(
+    request: Request,
+    project_id: int,
+    export_format: str,
+    media_type: str,
+    stream: Callable[[Session, int], Iterator[str | bytes]],
+) -> Response:
+    """Serve a cached export or stream a fresh one into the cache.
+
+    The cache key and the streamed rows come from one snapshot session, so a
+    concurrent edit cannot leave content stored under a stale key. The
+    session lives as long as the stream.
+    """
+
+    session = open_snapshot_session()
+    streaming = False
+    try:
+        key = _export_key(session, project_id, export_format)
+        if etag_matches(request.headers.get("if-none-match"), key):
+            return _not_modified(key)
+        headers = _export_headers(project_id, export_format, key)
+        cached = _cached_export(key, media_type, headers)
+        if cached is not None:
+            return cached
+        response = StreamingResponse(
+            export_cache.tee(key, _session_chunks(session, stream(session, project_id))),
+            media_type=media_type,
+            headers=headers,
+            background=BackgroundTask(session.close),
         )
-    return rows
-
-
-def _load_project_modules(session: Session, project_id: int) -> list[ProjectModule]:
-    result = session.execute(
-        select(ProjectModule)
-        .where(ProjectModule.project_id == project_id)
-        .join(ProjectModule.module)
+        streaming = True
+        return response
+    finally:
+        if not streaming:
+            session.close()
+
+
+def _cached_export(key: str, media_type: str, headers: dict[str, str]) -> Response | None:
+    """Stream a cached export from an open handle, or return None on a miss.
+
+    Holding the handle keeps the content readable even if the entry is
+    evicted before the response is sent.
+    """
+
+    file = export_cache.open(key)
+    if file is None:
+        return None
+    return StreamingResponse(
+        iter_file_chunks(file),
+        media_type=media_type,
+        headers={**headers, "Content-Length": str(os.fstat(file.fileno()).st_size)},
+        background=BackgroundTask(file.close),
     )
-    return list(result.scalars())
 
 
-def _load_project_infrastructure(
-    session: Session,
-    project_id: int,
-) -> list[ProjectInfrastructure]:
-    result = session.execute(
-        select(ProjectInfrastructure)
-        .where(ProjectInfrastructure.project_id == project_id)
-        .join(ProjectInfrastructure.infrastructure_item)
-    )
-    return list(result.scalars())
+def _session_chunks(session: Session, chunks: Iterator[str | bytes]) -> Iterator[str | bytes]:
+    try:
+        yield from chunks
+    finally:
+        session.close()
 
 
-def _load_assignments(session: Session, project_id: int) -> dict[tuple[int, str], str]:
-    result = session.execute(select(Assignment).where(Assignment.project_id == project_id))
-    assignments: dict[tuple[int, str], str] = {}
-    for assignment in result.scalars():
-        assignments[(assignment.project_module_id, assignment.role)] = assignment.level
-    return assignments
+def _export_key(session: Session, project_id: int, export_format: str) -> str:
+    try:
+        return export_cache_key(session, project_id, export_format)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
 
 
-def _load_rates(session: Session) -> dict[tuple[str, str], float]:
-    result = session.execute(select(Rate))
-    rates: dict[tuple[str, str], float] = {}
-    for rate in result.scalars():
-        rates[(rate.role, rate.level)] = rate.hourly_rate
-    return rates
+def _export_headers(project_id: int, export_format: str, key: str) -> dict[str, str]:
+    filename = f"project-{project_id}-export.{export_format}"
+    return {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": etag_for(key),
+        "Cache-Control": "private, no-cache",
+    }
 
 
-def _get_project(session: Session, project_id: int) -> Project:
-    result = session.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+def _not_modified(key: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag_for(key), "Cache-Control": "private, no-cache"},
+    )
 
 
-def _resolve_level(
-    assignments: dict[tuple[int, str], str],
-    project_module_id: int,
-    role: str,
-) -> str:
-    return assignments.get((project_module_id, role), ROLE_DEFAULT_LEVEL.get(role, "middle"))
+def _collect_export_data(session: Session, project_id: int) -> ExportRows:
+    try:
+        return collect_export_rows(session, project_id)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
 
 
-def _format_number(value: float) -> str:
-    return f"{value:.2f}"
+def _stream_portfolio_parquet(project_ids: list[int]) -> Iterator[bytes]:
+    with SessionLocal() as session:
+        yield from iter_portfolio_parquet(session, project_ids)
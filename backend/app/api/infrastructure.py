@@ -12,6 +12,8 @@ from app.schemas import (
     ProjectInfrastructureOut,
     ProjectInfrastructureUpsert,
 )
+from app.services.revision_service import bump_project_revision
+from app.services.upsert_service import bulk_upsert, rows_as_applied
 
 router = APIRouter(tags=["infrastructure"])
 
@@ -71,21 +73,17 @@ def upsert_project_infrastructure(
     """Upsert infrastructure items for project."""
 
     _get_project(session, project_id)
-    results: list[ProjectInfrastructureOut] = []
-    for entry in payload:
-        _get_infrastructure_item(session, entry.infrastructure_item_id)
-        record = _get_project_infrastructure(session, project_id, entry.infrastructure_item_id)
-        if record:
-            record.quantity = entry.quantity
-        else:
-            record = ProjectInfrastructure(
-                project_id=project_id,
-                infrastructure_item_id=entry.infrastructure_item_id,
-                quantity=entry.quantity,
-            )
-            session.add(record)
-        session.flush()
-        results.append(ProjectInfrastructureOut(**record.__dict__))
+    _require_infrastructure_items(session, {entry.infrastructure_item_id for entry in payload})
+    rows = [{"project_id": project_id, **entry.model_dump()} for entry in payload]
+    records = bulk_upsert(
+        session,
+        ProjectInfrastructure,
+        rows,
+        key_columns=("project_id", "infrastructure_item_id"),
+        update_columns=("quantity",),
+    )
+    results = [ProjectInfrastructureOut(**row) for row in rows_as_applied(records, rows)]
+    bump_project_revision(session, project_id)
     session.commit()
     return results
 
@@ -98,15 +96,12 @@ def _get_project(session: Session, project_id: int) -> Project:
     return project
 
 
-def _get_infrastructure_item(
-    session: Session,
-    item_id: int,
-) -> InfrastructureItem:
-    result = session.execute(select(InfrastructureItem).where(InfrastructureItem.id == item_id))
-    item = result.scalar_one_or_none()
-    if not item:
+def _require_infrastructure_items(session: Session, item_ids: set[int]) -> None:
+    if not item_ids:
+        return
+    found = set(session.execute(select(InfrastructureItem.id).where(InfrastructureItem.id.in_(item_ids))).scalars())
+    if found != item_ids:
         raise HTTPException(status_code=404, detail="Infrastructure item not found")
-    return item
 
 
 def _find_infrastructure_item(
@@ -115,16 +110,3 @@ def _find_infrastructure_item(
 ) -> InfrastructureItem | None:
     result = session.execute(select(InfrastructureItem).where(InfrastructureItem.code == code))
     return result.scalar_one_or_none()
-
-
-def _get_project_infrastructure(
-    session: Session,
-    project_id: int,
-    item_id: int,
-) -> ProjectInfrastructure | None:
-    result = session.execute(
-        select(ProjectInfrastructure)
-        .where(ProjectInfrastructure.project_id == project_id)
-        .where(ProjectInfrastructure.infrastructure_item_id == item_id)
-    )
-    return result.scalar_one_or_none()
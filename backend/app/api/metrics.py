@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+from app.services.metrics import metrics_registry
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def require_metrics_token(token: HTTPAuthorizationCredentials | None = Depends(bearer)) -> None:
+    """Require ``Authorization: Bearer <METRICS_TOKEN>``."""
+
+    expected = settings.metrics_token or ""
+    if token is None or not expected or not hmac.compare_digest(token.credentials.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(tags=["monitoring"], dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """Return process metrics in the Prometheus text format."""
+
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
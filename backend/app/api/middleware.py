@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.log_config import REQUEST_LOGGER
+from app.services.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+from app.services.profiler import note_request_finished
+from app.services.query_stats import server_timing_header, track_queries
+
+logger = logging.getLogger(REQUEST_LOGGER)
+
+
+class RequestTimingMiddleware:
+    """Report request duration and database usage.
+
+    Adds a Server-Timing header, logs one structured record per request and
+    feeds the request latency metrics. The log record and latency are taken
+    once the body is sent, so statements issued by streaming responses are
+    counted there but not in the header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing_header(stats, time.perf_counter() - started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                HTTP_REQUESTS_IN_FLIGHT.dec()
+                note_request_finished()
+                duration = time.perf_counter() - started
+                route = scope.get("route")
+                route_path = getattr(route, "path", None)
+                HTTP_REQUEST_SECONDS.observe(
+                    duration,
+                    method=scope["method"],
+                    route=route_path or "unmatched",
+                    status=str(status_code),
+                )
+                logger.info(
+                    "%s %s %s %.1fms db_queries=%d db_ms=%.1f",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    duration * 1000,
+                    stats.count,
+                    stats.total_seconds * 1000,
+                    extra={
+                        "http_method": scope["method"],
+                        "http_path": scope["path"],
+                        "http_route": route_path,
+                        "http_status": status_code,
+                        "duration_ms": round(duration * 1000, 3),
+                        "db_queries": stats.count,
+                        "db_ms": round(stats.total_seconds * 1000, 3),
+                        "db_slowest_ms": round(stats.slowest_seconds * 1000, 3),
+                        "db_slowest_statement": stats.slowest_statement,
+                    },
+                )
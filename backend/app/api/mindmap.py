@@ -27,6 +27,8 @@ from app.schemas import (
     ProjectNoteBase,
     ProjectNoteOut,
 )
+from app.services.revision_service import bump_project_revision
+from app.services.summary_service import apply_project_node_change, apply_project_node_removal
 
 router = APIRouter(prefix="/projects", tags=["mindmap"])
 
@@ -72,7 +74,9 @@ def create_node(
     session.add(node)
     session.flush()
     _replace_node_role_hours(session, node.id, payload.role_hours)
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_node_change(session, project_id, node.id, revision)
     session.refresh(node)
     return _serialize_node(node)
 
@@ -109,7 +113,9 @@ def update_node(
     node.position_x = payload.position_x
     node.position_y = payload.position_y
     _replace_node_role_hours(session, node.id, payload.role_hours)
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_node_change(session, project_id, node_id, revision)
     session.refresh(node)
     return _serialize_node(node)
 
@@ -139,7 +145,9 @@ def delete_node(
         )
     )
     session.delete(node)
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_node_removal(project_id, node_id, revision)
     return {"status": "ok"}
 
 
@@ -369,6 +377,7 @@ def apply_version(
         raise HTTPException(status_code=404, detail="Version not found")
     snapshot = _snapshot_from_json(version.payload)
     _replace_mindmap(session, project_id, snapshot)
+    bump_project_revision(session, project_id)
     session.commit()
     return {"status": "ok"}
 
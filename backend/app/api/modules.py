@@ -12,6 +12,7 @@ from app.schemas import (
     ModuleRoleHours as ModuleRoleHoursPayload,
     ModuleUpdate,
 )
+from app.services.revision_service import bump_projects_using_module
 
 router = APIRouter(prefix="/modules", tags=["modules"])
 
@@ -79,6 +80,7 @@ def update_module(
         module.hours_qa = payload.hours_qa
     if payload.role_hours is not None:
         _replace_role_hours(session, module.id, payload.role_hours)
+    bump_projects_using_module(session, module.id)
     session.commit()
     session.refresh(module)
     session.refresh(module, attribute_names=["role_hours"])
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+
+from app.api.auth import require_admin
+from app.core.config import settings
+from app.schemas import SummaryCacheStatsOut
+from app.services.auth_service import AuthenticatedUser
+from app.services.profiler import ProfilerBusy, finish_profile, start_profile, to_collapsed, to_pstats
+from app.services.summary_cache import summary_cache
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+
+@router.get("/summary-cache", response_model=SummaryCacheStatsOut)
+def get_summary_cache_stats(_: AuthenticatedUser = Depends(require_admin)) -> SummaryCacheStatsOut:
+    """Return summary cache counters (admin only)."""
+
+    stats = summary_cache.stats()
+    return SummaryCacheStatsOut(
+        size=stats.size,
+        max_size=stats.max_size,
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        deltas=stats.deltas,
+        hit_ratio=stats.hit_ratio,
+    )
+
+
+@router.post("/profile")
+async def profile_process(
+    seconds: float | None = Query(default=None, gt=0),
+    requests: int | None = Query(default=None, ge=1, le=10_000),
+    output: Literal["collapsed", "pstats"] = Query(default="collapsed"),
+    interval_ms: float = Query(default=5.0, ge=1.0, le=100.0),
+    _: AuthenticatedUser = Depends(require_admin),
+) -> Response:
+    """Sample all threads for a time window or until the next N requests finish (admin only).
+
+    Returns collapsed stacks for flame graphs, or a pstats dump.
+    """
+
+    if (seconds is None) == (requests is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of seconds or requests")
+    if seconds is not None and seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiling window is limited to {settings.profiler_max_seconds} seconds",
+        )
+    try:
+        session = start_profile(interval_ms / 1000, requests)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail="A profile is already being recorded") from exc
+
+    try:
+        if seconds is not None:
+            await asyncio.sleep(seconds)
+        else:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.profiler_max_seconds
+            while not session.completed.is_set() and loop.time() < deadline:
+                await asyncio.sleep(0.05)
+    finally:
+        result = finish_profile(session)
+
+    headers = {
+        "X-Profile-Duration": f"{result.duration:.3f}",
+        "X-Profile-Requests": str(result.requests),
+        "X-Profile-Samples": str(sum(result.stacks.values())),
+    }
+    if output == "pstats":
+        headers["Content-Disposition"] = 'attachment; filename="profile.pstats"'
+        return Response(to_pstats(result), media_type="application/octet-stream", headers=headers)
+    headers["Content-Disposition"] = 'attachment; filename="profile.collapsed"'
+    return Response(to_collapsed(result), media_type="text/plain; charset=utf-8", headers=headers)
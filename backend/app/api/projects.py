@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db import get_db_session
 from app.models import Assignment, Module, Project, ProjectCoefficient, ProjectModule
 from app.schemas import (
@@ -18,10 +22,24 @@ from app.schemas import (
     ProjectModuleUpdate,
     ProjectOut,
     ProjectSettings,
+    ProjectSummaryOut,
     ProjectUpdate,
+    SensitivityItemOut,
     SummaryOut,
+    SummarySweepItemOut,
+    SummarySweepRequest,
+)
+from app.services.revision_service import bump_project_revision
+from app.services.summary_service import (
+    apply_project_module_change,
+    apply_project_module_removal,
+    build_portfolio_summary,
+    build_project_sensitivity,
+    build_project_simulation,
+    build_project_summary,
+    build_project_sweep,
 )
-from app.services.summary_service import build_project_summary
+from app.services.upsert_service import bulk_upsert, rows_as_applied
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -54,6 +72,19 @@ def list_projects(
     return [ProjectListOut(**project.__dict__) for project in result.scalars()]
 
 
+@router.get("/summary", response_model=list[ProjectSummaryOut])
+def get_portfolio_summary(
+    ids: list[int] | None = Query(default=None),
+    session: Session = Depends(get_db_session),
+) -> list[ProjectSummaryOut]:
+    """Return summaries for the given projects, or for all projects."""
+
+    try:
+        return build_portfolio_summary(session, ids)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
 @router.get("/{project_id}", response_model=ProjectOut)
 def get_project(
     project_id: int,
@@ -93,6 +124,7 @@ def update_settings(
     project.uncertainty_level = payload.uncertainty_level
     project.uiux_level = payload.uiux_level
     project.legacy_code = payload.legacy_code
+    bump_project_revision(session, project_id)
     session.commit()
     session.refresh(project)
     return ProjectOut(**project.__dict__)
@@ -130,7 +162,10 @@ def add_project_module(
         custom_name=payload.custom_name,
     )
     session.add(project_module)
+    session.flush()
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_module_change(session, project_id, project_module.id, revision)
     session.refresh(project_module)
     return ProjectModuleOut(**project_module.__dict__)
 
@@ -146,7 +181,9 @@ def update_project_module(
 
     project_module = _get_project_module(session, project_id, project_module_id)
     _apply_project_module_updates(project_module, payload)
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_module_change(session, project_id, project_module_id, revision)
     session.refresh(project_module)
     return ProjectModuleOut(**project_module.__dict__)
 
@@ -161,7 +198,9 @@ def delete_project_module(
 
     project_module = _get_project_module(session, project_id, project_module_id)
     session.delete(project_module)
+    revision = bump_project_revision(session, project_id)
     session.commit()
+    apply_project_module_removal(project_id, project_module_id, revision)
     return {"status": "ok"}
 
 
@@ -174,21 +213,16 @@ def upsert_assignments(
     """Upsert role assignments."""
 
     _get_project(session, project_id)
-    results = []
-    for assignment in payload:
-        db_assignment = _get_assignment(session, project_id, assignment)
-        if db_assignment:
-            db_assignment.level = assignment.level
-        else:
-            db_assignment = Assignment(
-                project_id=project_id,
-                project_module_id=assignment.project_module_id,
-                role=assignment.role,
-                level=assignment.level,
-            )
-            session.add(db_assignment)
-        session.flush()
-        results.append(AssignmentOut(**db_assignment.__dict__))
+    rows = [{"project_id": project_id, **assignment.model_dump()} for assignment in payload]
+    assignments = bulk_upsert(
+        session,
+        Assignment,
+        rows,
+        key_columns=("project_id", "project_module_id", "role"),
+        update_columns=("level",),
+    )
+    results = [AssignmentOut(**row) for row in rows_as_applied(assignments, rows)]
+    bump_project_revision(session, project_id)
     session.commit()
     return results
 
@@ -210,11 +244,55 @@ def list_assignments(
 @router.get("/{project_id}/summary", response_model=SummaryOut)
 def get_summary(
     project_id: int,
+    mode: Literal["fixed", "monte_carlo"] = "fixed",
+    distribution: Literal["pert", "triangular"] = "pert",
+    iterations: int = Query(
+        default=settings.monte_carlo_iterations,
+        ge=100,
+        le=settings.monte_carlo_max_iterations,
+    ),
+    seed: int | None = None,
     session: Session = Depends(get_db_session),
 ) -> SummaryOut:
     """Return summary for project."""
 
-    return build_project_summary(session, project_id)
+    try:
+        if mode == "monte_carlo":
+            return build_project_simulation(session, project_id, iterations, seed, distribution)
+        return build_project_summary(session, project_id)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
+
+
+@router.get("/{project_id}/summary/sensitivity", response_model=list[SensitivityItemOut])
+def get_summary_sensitivity(
+    project_id: int,
+    hours_change: float = Query(default=0.1, gt=0, le=1),
+    limit: int | None = Query(default=None, ge=1),
+    session: Session = Depends(get_db_session),
+) -> list[SensitivityItemOut]:
+    """Return modules and nodes ranked by their effect on project cost."""
+
+    try:
+        return build_project_sensitivity(session, project_id, hours_change, limit)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
+
+
+@router.post("/{project_id}/summary/sweep", response_model=list[SummarySweepItemOut])
+def sweep_summary(
+    project_id: int,
+    payload: SummarySweepRequest,
+    session: Session = Depends(get_db_session),
+) -> list[SummarySweepItemOut]:
+    """Return summaries for every combination of what-if settings."""
+
+    try:
+        return build_project_sweep(session, project_id, payload)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail="Project not found") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get("/{project_id}/coefficients", response_model=list[ProjectCoefficientOut])
@@ -247,21 +325,16 @@ def upsert_coefficients(
     """Upsert project coefficients."""
 
     _get_project(session, project_id)
-    results: list[ProjectCoefficientOut] = []
-    for item in payload:
-        existing = _get_project_coefficient(session, project_id, item.name)
-        if existing:
-            existing.multiplier = item.multiplier
-            record = existing
-        else:
-            record = ProjectCoefficient(
-                project_id=project_id,
-                name=item.name,
-                multiplier=item.multiplier,
-            )
-            session.add(record)
-        session.flush()
-        results.append(ProjectCoefficientOut(**record.__dict__))
+    rows = [{"project_id": project_id, **item.model_dump()} for item in payload]
+    coefficients = bulk_upsert(
+        session,
+        ProjectCoefficient,
+        rows,
+        key_columns=("project_id", "name"),
+        update_columns=("multiplier",),
+    )
+    results = [ProjectCoefficientOut(**row) for row in rows_as_applied(coefficients, rows)]
+    bump_project_revision(session, project_id)
     session.commit()
     return results
 
@@ -311,20 +384,6 @@ def _find_project_module(
     return result.scalar_one_or_none()
 
 
-def _get_assignment(
-    session: Session,
-    project_id: int,
-    payload: AssignmentUpsert,
-) -> Assignment | None:
-    result = session.execute(
-        select(Assignment)
-        .where(Assignment.project_id == project_id)
-        .where(Assignment.project_module_id == payload.project_module_id)
-        .where(Assignment.role == payload.role)
-    )
-    return result.scalar_one_or_none()
-
-
 def _apply_project_module_updates(
     project_module: ProjectModule,
     payload: ProjectModuleUpdate,
@@ -345,19 +404,6 @@ def _apply_project_module_updates(
         project_module.legacy_code = payload.legacy_code
 
 
-def _get_project_coefficient(
-    session: Session,
-    project_id: int,
-    name: str,
-) -> ProjectCoefficient | None:
-    result = session.execute(
-        select(ProjectCoefficient)
-        .where(ProjectCoefficient.project_id == project_id)
-        .where(ProjectCoefficient.name == name)
-    )
-    return result.scalar_one_or_none()
-
-
 def _seed_project_coefficients(session: Session, project_id: int) -> None:
     defaults = [
         ProjectCoefficient(project_id=project_id, name="Неопределенность", multiplier=1.0),
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 from app.db import get_db_session
 from app.models import Rate
 from app.schemas import RateOut, RateUpsert
+from app.services.revision_service import bump_all_project_revisions
+from app.services.upsert_service import bulk_upsert, rows_as_applied
 
 router = APIRouter(prefix="/rates", tags=["rates"])
 
@@ -26,26 +28,15 @@ def upsert_rates(
 ) -> list[RateOut]:
     """Upsert rates."""
 
-    results = []
-    for rate_payload in payload:
-        rate = _get_rate(session, rate_payload.role, rate_payload.level)
-        if rate:
-            rate.hourly_rate = rate_payload.hourly_rate
-        else:
-            rate = Rate(
-                role=rate_payload.role,
-                level=rate_payload.level,
-                hourly_rate=rate_payload.hourly_rate,
-            )
-            session.add(rate)
-        session.flush()
-        results.append(RateOut(**rate.__dict__))
+    rows = [item.model_dump() for item in payload]
+    rates = bulk_upsert(
+        session,
+        Rate,
+        rows,
+        key_columns=("role", "level"),
+        update_columns=("hourly_rate",),
+    )
+    results = [RateOut(**row) for row in rows_as_applied(rates, rows)]
+    bump_all_project_revisions(session)
     session.commit()
     return results
-
-
-def _get_rate(session: Session, role: str, level: str) -> Rate | None:
-    result = session.execute(
-        select(Rate).where(Rate.role == role).where(Rate.level == level)
-    )
-    return result.scalar_one_or_none()
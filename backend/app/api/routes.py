@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 
-from app.api.auth import require_user, router as auth_router
+from app.api.auth import login_router, require_user, router as auth_router
 from app.api.connections import router as connections_router
 from app.api.ai import router as ai_router
-from app.api.exports import router as exports_router
+from app.api.export_jobs import router as export_jobs_router
+from app.api.exports import bulk_router as bulk_exports_router, router as exports_router
 from app.api.infrastructure import router as infrastructure_router
 from app.api.mindmap import router as mindmap_router
 from app.api.modules import router as modules_router
+from app.api.monitoring import router as monitoring_router
 from app.api.projects import router as projects_router
 from app.api.rates import router as rates_router
 from app.api.users import router as users_router
@@ -17,15 +19,21 @@ from app.api.users import router as users_router
 def get_api_router() -> APIRouter:
     """Build main API router."""
 
-    router = APIRouter(dependencies=[Depends(require_user)])
-    router.include_router(auth_router)
-    router.include_router(modules_router)
-    router.include_router(projects_router)
-    router.include_router(connections_router)
-    router.include_router(rates_router)
-    router.include_router(ai_router)
-    router.include_router(mindmap_router)
-    router.include_router(infrastructure_router)
-    router.include_router(exports_router)
-    router.include_router(users_router)
+    protected = APIRouter(dependencies=[Depends(require_user)])
+    protected.include_router(auth_router)
+    protected.include_router(modules_router)
+    protected.include_router(projects_router)
+    protected.include_router(connections_router)
+    protected.include_router(rates_router)
+    protected.include_router(ai_router)
+    protected.include_router(mindmap_router)
+    protected.include_router(infrastructure_router)
+    protected.include_router(exports_router)
+    protected.include_router(bulk_exports_router)
+    protected.include_router(export_jobs_router)
+    protected.include_router(users_router)
+    protected.include_router(monitoring_router)
+    router = APIRouter()
+    router.include_router(login_router)
+    router.include_router(protected)
     return router
@@ -9,13 +9,14 @@ from app.core.security import hash_password
 from app.db import get_db_session
 from app.models import User
 from app.schemas import UserCreate, UserOut
+from app.services.auth_service import AuthenticatedUser, credential_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("", response_model=list[UserOut])
 def list_users(
-    _: User = Depends(require_admin),
+    _: AuthenticatedUser = Depends(require_admin),
     session: Session = Depends(get_db_session),
 ) -> list[UserOut]:
     """List users (admin only)."""
@@ -27,7 +28,7 @@ def list_users(
 @router.post("", response_model=UserOut)
 def create_user(
     payload: UserCreate,
-    _: User = Depends(require_admin),
+    _: AuthenticatedUser = Depends(require_admin),
     session: Session = Depends(get_db_session),
 ) -> UserOut:
     """Create user (admin only)."""
@@ -43,4 +44,5 @@ def create_user(
     session.add(user)
     session.commit()
     session.refresh(user)
+    credential_cache.invalidate(user.username)
     return UserOut(id=user.id, username=user.username, role=user.role)
@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.inputs import EstimationInputs
+from app.core.line_items import EXTRA_ROLE_DEFAULT_LEVEL, ROLE_DEFAULT_LEVEL, combine_coefficients
+from app.schemas import SummaryTotals
+
+
+# Column order of every per-role array; hours and override columns are read by role name.
+BASE_ROLES = tuple(ROLE_DEFAULT_LEVEL)
+INHERIT = -1
+ITEM_MODULE = 0
+ITEM_NODE = 1
+
+
+@dataclass(frozen=True)
+class EstimationColumns:
+    """Columnar view over the modules and nodes of one or many projects.
+
+    Item arrays have one row per project module or mindmap node, modules
+    first, in the same order as the per-object calculation walks them.
+    Level arrays hold vocabulary codes, with ``INHERIT`` meaning the item
+    falls back to its project setting.
+    """
+
+    project_ids: np.ndarray
+    project_uncertainty: np.ndarray
+    project_uiux: np.ndarray
+    project_legacy: np.ndarray
+    project_extra_multiplier: np.ndarray
+    project_infra_cost: np.ndarray
+    rate_table: np.ndarray
+    item_project: np.ndarray
+    item_kind: np.ndarray
+    item_ids: np.ndarray
+    item_names: list[str]
+    item_hours: np.ndarray
+    item_overrides: np.ndarray
+    item_uncertainty: np.ndarray
+    item_uiux: np.ndarray
+    item_legacy: np.ndarray
+    item_level: np.ndarray
+    extra_item: np.ndarray
+    extra_hours: np.ndarray
+    extra_role: np.ndarray
+    extra_level: np.ndarray
+    uncertainty_levels: list[str]
+    uiux_levels: list[str]
+    roles: list[str]
+    levels: list[str]
+
+    @property
+    def project_count(self) -> int:
+        """Return number of projects in the batch."""
+
+        return len(self.project_ids)
+
+
+@dataclass(frozen=True)
+class ColumnarEstimate:
+    """Per-item and per-project results of a columnar estimation."""
+
+    item_hours: np.ndarray
+    item_extra_hours: np.ndarray
+    item_cost: np.ndarray
+    project_hours: np.ndarray
+    project_extra_hours: np.ndarray
+    project_work_cost: np.ndarray
+    project_infra_cost: np.ndarray
+
+    def totals(self, index: int) -> SummaryTotals:
+        """Return summary totals for the project at batch position."""
+
+        hours = self.project_hours[index]
+        role_hours = dict(zip(BASE_ROLES, hours))
+        hours_total = hours[0] + hours[1] + hours[2] + self.project_extra_hours[index]
+        infra_cost = float(self.project_infra_cost[index])
+        return SummaryTotals(
+            hours_frontend=float(role_hours["frontend"]),
+            hours_backend=float(role_hours["backend"]),
+            hours_qa=float(role_hours["qa"]),
+            hours_total=float(hours_total),
+            infra_cost=infra_cost,
+            cost_total=float(self.project_work_cost[index]) + infra_cost,
+        )
+
+
+@dataclass(frozen=True)
+class ProjectVariant:
+    """Alternative project-level settings for a what-if evaluation."""
+
+    uncertainty_level: str
+    uiux_level: str
+    legacy_code: bool
+    extra_multiplier: float
+    rates: dict[tuple[str, str], float]
+
+
+@dataclass(frozen=True)
+class ItemSensitivity:
+    """Change of every item's hours and cost under single-item perturbations.
+
+    Delta arrays have one row per change; ``NaN`` marks changes that do not
+    apply to an item because it already has the target setting.
+    """
+
+    changes: list[str]
+    item_hours: np.ndarray
+    item_cost: np.ndarray
+    delta_hours: np.ndarray
+    delta_cost: np.ndarray
+
+
+class _Vocabulary:
+    """Assign stable integer codes to strings."""
+
+    def __init__(self, initial: tuple[str, ...] | list[str] = ()) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def optional_code(self, value: str | None) -> int:
+        if not value:
+            return INHERIT
+        return self.code(value)
+
+
+def build_columns(batch: list[EstimationInputs]) -> EstimationColumns:
+    """Pack estimation inputs of many projects into NumPy arrays."""
+
+    uncertainty_vocab = _Vocabulary(tuple(settings.uncertainty_coefficients))
+    uiux_vocab = _Vocabulary(tuple(settings.uiux_coefficients))
+    role_vocab = _Vocabulary(BASE_ROLES)
+    level_vocab = _Vocabulary(tuple(ROLE_DEFAULT_LEVEL.values()))
+    default_levels = [level_vocab.code(ROLE_DEFAULT_LEVEL[role]) for role in BASE_ROLES]
+    extra_default_level = level_vocab.code(EXTRA_ROLE_DEFAULT_LEVEL)
+
+    project_count = len(batch)
+    project_ids = np.empty(project_count, dtype=np.int64)
+    project_uncertainty = np.empty(project_count, dtype=np.int64)
+    project_uiux = np.empty(project_count, dtype=np.int64)
+    project_legacy = np.empty(project_count, dtype=bool)
+    project_extra_multiplier = np.empty(project_count, dtype=np.float64)
+    project_infra_cost = np.empty(project_count, dtype=np.float64)
+
+    item_project: list[int] = []
+    item_kind: list[int] = []
+    item_ids: list[int] = []
+    item_names: list[str] = []
+    item_hours: list[tuple[float, float, float]] = []
+    item_overrides: list[tuple[float, float, float]] = []
+    item_uncertainty: list[int] = []
+    item_uiux: list[int] = []
+    item_legacy: list[int] = []
+    item_level: list[list[int]] = []
+    extra_item: list[int] = []
+    extra_hours: list[float] = []
+    extra_role: list[int] = []
+    extra_level: list[int] = []
+
+    for position, inputs in enumerate(batch):
+        project = inputs.project
+        project_ids[position] = project.id
+        project_uncertainty[position] = uncertainty_vocab.code(project.uncertainty_level)
+        project_uiux[position] = uiux_vocab.code(project.uiux_level)
+        project_legacy[position] = project.legacy_code
+        project_extra_multiplier[position] = combine_coefficients(inputs.coefficients)
+        project_infra_cost[position] = sum(
+            item.unit_cost * item.quantity for item in inputs.infrastructure
+        )
+
+        for project_module in inputs.project_modules:
+            index = len(item_ids)
+            module = project_module.module
+            item_project.append(position)
+            item_kind.append(ITEM_MODULE)
+            item_ids.append(project_module.id)
+            item_names.append(module.name)
+            item_hours.append(tuple(getattr(module, f"hours_{role}") for role in BASE_ROLES))
+            item_overrides.append(
+                tuple(_nan_if_none(getattr(project_module, f"override_{role}")) for role in BASE_ROLES)
+            )
+            item_uncertainty.append(uncertainty_vocab.optional_code(project_module.uncertainty_level))
+            item_uiux.append(uiux_vocab.optional_code(project_module.uiux_level))
+            item_legacy.append(_legacy_code(project_module.legacy_code))
+            item_level.append(
+                [
+                    level_vocab.code(inputs.assignments[(project_module.id, role)])
+                    if (project_module.id, role) in inputs.assignments
+                    else default_levels[role_index]
+                    for role_index, role in enumerate(BASE_ROLES)
+                ]
+            )
+            for role_hours in module.role_hours:
+                level = inputs.assignments.get((project_module.id, role_hours.role))
+                extra_item.append(index)
+                extra_hours.append(role_hours.hours)
+                extra_role.append(role_vocab.code(role_hours.role))
+                extra_level.append(level_vocab.code(level) if level else extra_default_level)
+
+        for node in inputs.project_nodes:
+            index = len(item_ids)
+            item_project.append(position)
+            item_kind.append(ITEM_NODE)
+            item_ids.append(node.id)
+            item_names.append(node.title)
+            item_hours.append(tuple(getattr(node, f"hours_{role}") for role in BASE_ROLES))
+            item_overrides.append((np.nan, np.nan, np.nan))
+            item_uncertainty.append(uncertainty_vocab.optional_code(node.uncertainty_level))
+            item_uiux.append(uiux_vocab.optional_code(node.uiux_level))
+            item_legacy.append(_legacy_code(node.legacy_code))
+            item_level.append(list(default_levels))
+            for role_hours in node.role_hours:
+                extra_item.append(index)
+                extra_hours.append(role_hours.hours)
+                extra_role.append(role_vocab.code(role_hours.role))
+                extra_level.append(extra_default_level)
+
+    rate_table = np.zeros((project_count, len(role_vocab.values), len(level_vocab.values)))
+    for position, inputs in enumerate(batch):
+        for (role, level), hourly_rate in inputs.rates.items():
+            role_code = role_vocab.codes.get(role)
+            level_code = level_vocab.codes.get(level)
+            if role_code is None or level_code is None:
+                continue
+            rate_table[position, role_code, level_code] = hourly_rate
+
+    return EstimationColumns(
+        project_ids=project_ids,
+        project_uncertainty=project_uncertainty,
+        project_uiux=project_uiux,
+        project_legacy=project_legacy,
+        project_extra_multiplier=project_extra_multiplier,
+        project_infra_cost=project_infra_cost,
+        rate_table=rate_table,
+        item_project=np.asarray(item_project, dtype=np.int64),
+        item_kind=np.asarray(item_kind, dtype=np.int64),
+        item_ids=np.asarray(item_ids, dtype=np.int64),
+        item_names=item_names,
+        item_hours=np.asarray(item_hours, dtype=np.float64).reshape(-1, 3),
+        item_overrides=np.asarray(item_overrides, dtype=np.float64).reshape(-1, 3),
+        item_uncertainty=np.asarray(item_uncertainty, dtype=np.int64),
+        item_uiux=np.asarray(item_uiux, dtype=np.int64),
+        item_legacy=np.asarray(item_legacy, dtype=np.int64),
+        item_level=np.asarray(item_level, dtype=np.int64).reshape(-1, 3),
+        extra_item=np.asarray(extra_item, dtype=np.int64),
+        extra_hours=np.asarray(extra_hours, dtype=np.float64),
+        extra_role=np.asarray(extra_role, dtype=np.int64),
+        extra_level=np.asarray(extra_level, dtype=np.int64),
+        uncertainty_levels=uncertainty_vocab.values,
+        uiux_levels=uiux_vocab.values,
+        roles=role_vocab.values,
+        levels=level_vocab.values,
+    )
+
+
+def tile_columns(columns: EstimationColumns, variants: list[ProjectVariant]) -> EstimationColumns:
+    """Repeat a single-project column set once per variant of its settings.
+
+    Item arrays are tiled without revisiting the source inputs, so the cost
+    of evaluating a grid is dominated by array operations.
+    """
+
+    if columns.project_count != 1:
+        raise ValueError("Variants can only be tiled from a single project")
+    count = len(variants)
+    item_count = len(columns.item_ids)
+    uncertainty_vocab = _Vocabulary(columns.uncertainty_levels)
+    uiux_vocab = _Vocabulary(columns.uiux_levels)
+    roles = {role: code for code, role in enumerate(columns.roles)}
+    levels = {level: code for code, level in enumerate(columns.levels)}
+
+    rate_table = np.repeat(columns.rate_table, count, axis=0)
+    for position, variant in enumerate(variants):
+        for (role, level), hourly_rate in variant.rates.items():
+            role_code = roles.get(role)
+            level_code = levels.get(level)
+            if role_code is None or level_code is None:
+                continue
+            rate_table[position, role_code, level_code] = hourly_rate
+
+    offsets = np.arange(count, dtype=np.int64)[:, None] * item_count
+    return replace(
+        columns,
+        project_ids=np.repeat(columns.project_ids, count),
+        project_uncertainty=np.asarray(
+            [uncertainty_vocab.code(variant.uncertainty_level) for variant in variants],
+            dtype=np.int64,
+        ),
+        project_uiux=np.asarray(
+            [uiux_vocab.code(variant.uiux_level) for variant in variants],
+            dtype=np.int64,
+        ),
+        project_legacy=np.asarray([variant.legacy_code for variant in variants], dtype=bool),
+        project_extra_multiplier=np.asarray(
+            [variant.extra_multiplier for variant in variants],
+            dtype=np.float64,
+        ),
+        project_infra_cost=np.repeat(columns.project_infra_cost, count),
+        rate_table=rate_table,
+        item_project=np.repeat(np.arange(count, dtype=np.int64), item_count),
+        item_kind=np.tile(columns.item_kind, count),
+        item_ids=np.tile(columns.item_ids, count),
+        item_names=columns.item_names * count,
+        item_hours=np.tile(columns.item_hours, (count, 1)),
+        item_overrides=np.tile(columns.item_overrides, (count, 1)),
+        item_uncertainty=np.tile(columns.item_uncertainty, count),
+        item_uiux=np.tile(columns.item_uiux, count),
+        item_legacy=np.tile(columns.item_legacy, count),
+        item_level=np.tile(columns.item_level, (count, 1)),
+        extra_item=(offsets + columns.extra_item[None, :]).reshape(-1),
+        extra_hours=np.tile(columns.extra_hours, count),
+        extra_role=np.tile(columns.extra_role, count),
+        extra_level=np.tile(columns.extra_level, count),
+        uncertainty_levels=uncertainty_vocab.values,
+        uiux_levels=uiux_vocab.values,
+    )
+
+
+def estimate_sensitivity(columns: EstimationColumns, hours_change: float) -> ItemSensitivity:
+    """Evaluate hour changes and level flips of every item of a single project.
+
+    Each level flip is applied to all items at once, which is valid because an
+    item's cost depends only on itself and the project settings. The base
+    estimate and all flips are stacked as virtual projects and evaluated in a
+    single columnar pass.
+    """
+
+    item_count = len(columns.item_ids)
+    item_project = columns.item_project
+    uncertainty = _resolve(columns.item_uncertainty, columns.project_uncertainty[item_project])
+    uiux = _resolve(columns.item_uiux, columns.project_uiux[item_project])
+    legacy = _resolve(columns.item_legacy, columns.project_legacy[item_project].astype(np.int64))
+
+    changes: list[str] = []
+    masks: list[np.ndarray] = []
+    variants = [(columns.item_uncertainty, columns.item_uiux, columns.item_legacy)]
+    for level in settings.uncertainty_coefficients:
+        code = columns.uncertainty_levels.index(level)
+        changes.append(f"uncertainty_level={level}")
+        masks.append(uncertainty != code)
+        variants.append((np.full(item_count, code), columns.item_uiux, columns.item_legacy))
+    for level in settings.uiux_coefficients:
+        code = columns.uiux_levels.index(level)
+        changes.append(f"uiux_level={level}")
+        masks.append(uiux != code)
+        variants.append((columns.item_uncertainty, np.full(item_count, code), columns.item_legacy))
+    for flag in (0, 1):
+        changes.append(f"legacy_code={'true' if flag else 'false'}")
+        masks.append(legacy != flag)
+        variants.append((columns.item_uncertainty, columns.item_uiux, np.full(item_count, flag)))
+
+    base = ProjectVariant(
+        uncertainty_level=columns.uncertainty_levels[columns.project_uncertainty[0]],
+        uiux_level=columns.uiux_levels[columns.project_uiux[0]],
+        legacy_code=bool(columns.project_legacy[0]),
+        extra_multiplier=float(columns.project_extra_multiplier[0]),
+        rates={},
+    )
+    stacked = replace(
+        tile_columns(columns, [base] * len(variants)),
+        item_uncertainty=np.concatenate([variant[0] for variant in variants]),
+        item_uiux=np.concatenate([variant[1] for variant in variants]),
+        item_legacy=np.concatenate([variant[2] for variant in variants]),
+    )
+    estimate = estimate_columns(stacked)
+    hours = (estimate.item_hours.sum(axis=1) + estimate.item_extra_hours).reshape(len(variants), item_count)
+    cost = estimate.item_cost.reshape(len(variants), item_count)
+
+    applies = np.asarray(masks, dtype=bool).reshape(len(changes), item_count)
+    percent = f"{hours_change * 100:g}%"
+    return ItemSensitivity(
+        changes=[f"hours+{percent}", f"hours-{percent}", *changes],
+        item_hours=hours[0],
+        item_cost=cost[0],
+        delta_hours=np.vstack(
+            [
+                hours[0] * hours_change,
+                -hours[0] * hours_change,
+                np.where(applies, hours[1:] - hours[0], np.nan),
+            ]
+        ),
+        delta_cost=np.vstack(
+            [
+                cost[0] * hours_change,
+                -cost[0] * hours_change,
+                np.where(applies, cost[1:] - cost[0], np.nan),
+            ]
+        ),
+    )
+
+
+def estimate_columns(columns: EstimationColumns) -> ColumnarEstimate:
+    """Apply overrides, coefficients, multipliers and rates as array operations."""
+
+    uncertainty_table = _coefficient_table(columns.uncertainty_levels, settings.uncertainty_coefficients)
+    uiux_table = _coefficient_table(columns.uiux_levels, settings.uiux_coefficients)
+    item_project = columns.item_project
+
+    uncertainty_code = _resolve(columns.item_uncertainty, columns.project_uncertainty[item_project])
+    uiux_code = _resolve(columns.item_uiux, columns.project_uiux[item_project])
+    legacy_flag = _resolve(
+        columns.item_legacy,
+        columns.project_legacy[item_project].astype(np.int64),
+    ).astype(bool)
+
+    uncertainty = uncertainty_table[uncertainty_code]
+    uiux = uiux_table[uiux_code]
+    legacy = np.where(legacy_flag, settings.legacy_multiplier, 1.0)
+    extra_multiplier = columns.project_extra_multiplier[item_project]
+
+    merged = np.where(np.isnan(columns.item_overrides), columns.item_hours, columns.item_overrides)
+    hours = np.empty_like(merged)
+    hours[:, 0] = merged[:, 0] * uncertainty * uiux * legacy * extra_multiplier
+    hours[:, 1] = merged[:, 1] * uncertainty * legacy * extra_multiplier
+    hours[:, 2] = merged[:, 2] * uncertainty * legacy * extra_multiplier
+
+    base_roles = np.arange(len(BASE_ROLES))
+    base_rates = columns.rate_table[item_project[:, None], base_roles[None, :], columns.item_level]
+    item_cost = (hours * base_rates).sum(axis=1)
+
+    extra_role_multiplier = uncertainty * legacy * extra_multiplier
+    extra_hours = columns.extra_hours * extra_role_multiplier[columns.extra_item]
+    extra_rates = columns.rate_table[
+        item_project[columns.extra_item],
+        columns.extra_role,
+        columns.extra_level,
+    ]
+    item_count = len(columns.item_ids)
+    item_extra_hours = np.bincount(columns.extra_item, weights=extra_hours, minlength=item_count)
+    item_cost = item_cost + np.bincount(
+        columns.extra_item,
+        weights=extra_hours * extra_rates,
+        minlength=item_count,
+    )
+
+    project_count = columns.project_count
+    project_hours = np.stack(
+        [
+            np.bincount(item_project, weights=hours[:, role], minlength=project_count)
+            for role in range(len(BASE_ROLES))
+        ],
+        axis=1,
+    ).reshape(project_count, len(BASE_ROLES))
+
+    return ColumnarEstimate(
+        item_hours=hours,
+        item_extra_hours=item_extra_hours,
+        item_cost=item_cost,
+        project_hours=project_hours,
+        project_extra_hours=np.bincount(item_project, weights=item_extra_hours, minlength=project_count),
+        project_work_cost=np.bincount(item_project, weights=item_cost, minlength=project_count),
+        project_infra_cost=columns.project_infra_cost,
+    )
+
+
+def estimate_batch(batch: list[EstimationInputs]) -> list[SummaryTotals]:
+    """Return summary totals for every project in the batch."""
+
+    estimate = estimate_columns(build_columns(batch))
+    return [estimate.totals(index) for index in range(len(batch))]
+
+
+def _coefficient_table(levels: list[str], coefficients: dict[str, float]) -> np.ndarray:
+    return np.asarray([coefficients.get(level, 1.0) for level in levels], dtype=np.float64)
+
+
+def _resolve(item_codes: np.ndarray, project_codes: np.ndarray) -> np.ndarray:
+    return np.where(item_codes == INHERIT, project_codes, item_codes)
+
+
+def _legacy_code(value: bool | None) -> int:
+    if value is None:
+        return INHERIT
+    return int(value)
+
+
+def _nan_if_none(value: float | None) -> float:
+    if value is None:
+        return np.nan
+    return value
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import tempfile
+from pathlib import Path
+
 from pydantic import AnyUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -24,6 +27,16 @@ class Settings(BaseSettings):
 
     optimistic_multiplier: float = 0.85
     pessimistic_multiplier: float = 1.25
+    monte_carlo_spreads: dict[str, tuple[float, float]] = {
+        "known": (0.1, 0.3),
+        "new_tech": (0.25, 0.8),
+    }
+    monte_carlo_default_spread: tuple[float, float] = (0.15, 0.5)
+    monte_carlo_iterations: int = 10000
+    monte_carlo_max_iterations: int = 100000
+    # Bounds iterations x items of one synchronous simulation (about 60 ms of sampling).
+    monte_carlo_max_samples: int = 6_000_000
+    sweep_max_points: int = 2000
 
     uncertainty_coefficients: dict[str, float] = {
         "known": 1.0,
@@ -34,6 +47,26 @@ class Settings(BaseSettings):
         "award": 2.5,
     }
     legacy_multiplier: float = 1.3
+    summary_cache_size: int = 512
+    export_stream_batch_size: int = 1000
+    render_pool_workers: int = 2
+    render_queue_depth: int = 8
+    render_retry_after_seconds: int = 5
+    export_cache_dir: str = str(Path(tempfile.gettempdir()) / "calculateta-exports")
+    export_cache_max_bytes: int = 256 * 1024 * 1024
+    export_jobs_dir: str = str(Path(tempfile.gettempdir()) / "calculateta-export-jobs")
+    export_job_workers: int = 2
+    export_job_ttl_seconds: int = 24 * 60 * 60
+    export_job_lease_seconds: int = 60
+    bulk_export_workers: int = 4
+    metrics_enabled: bool = True
+    metrics_token: str | None = None
+    request_log_level: str = "INFO"
+    profiler_max_seconds: int = 120
+    auth_cache_size: int = 1024
+    auth_cache_ttl_seconds: int = 60
+    session_token_secret: str | None = None
+    session_token_ttl_seconds: int = 15 * 60
     admin_username: str = "admin"
     admin_password: str = "admin"
 
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RoleHoursInput:
+    """Extra role hours attached to a module or node."""
+
+    role: str
+    hours: float
+
+
+@dataclass(frozen=True)
+class ModuleInput:
+    """Catalog module defaults used for estimation."""
+
+    id: int
+    name: str
+    hours_frontend: float
+    hours_backend: float
+    hours_qa: float
+    role_hours: list[RoleHoursInput]
+
+
+@dataclass(frozen=True)
+class ProjectModuleInput:
+    """Project module with overrides."""
+
+    id: int
+    override_frontend: float | None
+    override_backend: float | None
+    override_qa: float | None
+    uncertainty_level: str | None
+    uiux_level: str | None
+    legacy_code: bool | None
+    module: ModuleInput
+
+
+@dataclass(frozen=True)
+class ProjectNodeInput:
+    """Mindmap node used for estimation."""
+
+    id: int
+    title: str
+    hours_frontend: float
+    hours_backend: float
+    hours_qa: float
+    uncertainty_level: str | None
+    uiux_level: str | None
+    legacy_code: bool | None
+    role_hours: list[RoleHoursInput]
+
+
+@dataclass(frozen=True)
+class ProjectInput:
+    """Project-level estimation settings."""
+
+    id: int
+    revision: int
+    uncertainty_level: str
+    uiux_level: str
+    legacy_code: bool
+
+
+@dataclass(frozen=True)
+class CoefficientInput:
+    """Project complexity coefficient."""
+
+    name: str
+    multiplier: float
+
+
+@dataclass(frozen=True)
+class InfrastructureInput:
+    """Infrastructure item usage inside a project."""
+
+    name: str
+    quantity: int
+    unit_cost: float
+
+
+@dataclass(frozen=True)
+class EstimationInputs:
+    """Everything required to estimate a single project."""
+
+    project: ProjectInput
+    project_modules: list[ProjectModuleInput]
+    project_nodes: list[ProjectNodeInput]
+    assignments: dict[tuple[int, str], str]
+    rates: dict[tuple[str, str], float]
+    coefficients: list[CoefficientInput]
+    infrastructure: list[InfrastructureInput]
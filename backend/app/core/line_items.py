@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from app.core.calculator import ModuleHours, merge_module_overrides, resolve_effective_levels
+from app.core.config import settings
+from app.core.inputs import (
+    CoefficientInput,
+    EstimationInputs,
+    ProjectInput,
+    ProjectModuleInput,
+    ProjectNodeInput,
+    RoleHoursInput,
+)
+
+
+ROLE_DEFAULT_LEVEL = {
+    "frontend": "middle",
+    "backend": "senior",
+    "qa": "middle",
+}
+EXTRA_ROLE_DEFAULT_LEVEL = "middle"
+
+
+@dataclass(frozen=True)
+class LineItem:
+    """Estimated hours and cost of one role inside a module or node.
+
+    ``hours`` is ``base_hours`` times all four multipliers.
+    """
+
+    item_type: str
+    item_id: int
+    name: str
+    role: str
+    level: str
+    hours: float
+    rate: float
+    cost: float
+    uncertainty_level: str
+    extra_role: bool
+    base_hours: float
+    uiux_level: str
+    legacy_code: bool
+    uncertainty_multiplier: float
+    uiux_multiplier: float
+    legacy_multiplier: float
+    extra_multiplier: float
+
+
+def iter_line_items(inputs: EstimationInputs) -> Iterator[LineItem]:
+    """Yield line items of all project modules, then all mindmap nodes."""
+
+    extra_multiplier = combine_coefficients(inputs.coefficients)
+    for project_module in inputs.project_modules:
+        yield from module_line_items(
+            inputs.project,
+            project_module,
+            inputs.assignments,
+            inputs.rates,
+            extra_multiplier,
+        )
+    for node in inputs.project_nodes:
+        yield from node_line_items(inputs.project, node, inputs.rates, extra_multiplier)
+
+
+def module_line_items(
+    project: ProjectInput,
+    project_module: ProjectModuleInput,
+    assignments: dict[tuple[int, str], str],
+    rates: dict[tuple[str, str], float],
+    extra_multiplier: float,
+) -> list[LineItem]:
+    """Return line items for a project module."""
+
+    module = project_module.module
+    merged = merge_module_overrides(
+        base_hours=ModuleHours(
+            frontend=module.hours_frontend,
+            backend=module.hours_backend,
+            qa=module.hours_qa,
+        ),
+        override_frontend=project_module.override_frontend,
+        override_backend=project_module.override_backend,
+        override_qa=project_module.override_qa,
+    )
+    base_levels = {
+        role: assignments.get((project_module.id, role), default_level)
+        for role, default_level in ROLE_DEFAULT_LEVEL.items()
+    }
+    extra_levels = [
+        assignments.get((project_module.id, item.role), EXTRA_ROLE_DEFAULT_LEVEL)
+        for item in module.role_hours
+    ]
+    return _line_items(
+        project,
+        "module",
+        project_module.id,
+        module.name,
+        merged,
+        project_module.uncertainty_level,
+        project_module.uiux_level,
+        project_module.legacy_code,
+        module.role_hours,
+        base_levels,
+        extra_levels,
+        rates,
+        extra_multiplier,
+    )
+
+
+def node_line_items(
+    project: ProjectInput,
+    node: ProjectNodeInput,
+    rates: dict[tuple[str, str], float],
+    extra_multiplier: float,
+) -> list[LineItem]:
+    """Return line items for a mindmap node."""
+
+    return _line_items(
+        project,
+        "node",
+        node.id,
+        node.title,
+        ModuleHours(
+            frontend=node.hours_frontend,
+            backend=node.hours_backend,
+            qa=node.hours_qa,
+        ),
+        node.uncertainty_level,
+        node.uiux_level,
+        node.legacy_code,
+        node.role_hours,
+        ROLE_DEFAULT_LEVEL,
+        [EXTRA_ROLE_DEFAULT_LEVEL] * len(node.role_hours),
+        rates,
+        extra_multiplier,
+    )
+
+
+def combine_coefficients(coefficients: list[CoefficientInput]) -> float:
+    """Return combined extra multiplier of project coefficients."""
+
+    multiplier = 1.0
+    for coefficient in coefficients:
+        multiplier *= max(coefficient.multiplier, 0)
+    return multiplier
+
+
+def _line_items(
+    project: ProjectInput,
+    item_type: str,
+    item_id: int,
+    name: str,
+    hours: ModuleHours,
+    uncertainty_override: str | None,
+    uiux_override: str | None,
+    legacy_override: bool | None,
+    role_hours: list[RoleHoursInput],
+    base_levels: dict[str, str],
+    extra_levels: list[str],
+    rates: dict[tuple[str, str], float],
+    extra_multiplier: float,
+) -> list[LineItem]:
+    uncertainty_level = resolve_effective_levels(project.uncertainty_level, uncertainty_override)
+    uiux_level = resolve_effective_levels(project.uiux_level, uiux_override)
+    legacy_code = legacy_override if legacy_override is not None else project.legacy_code
+    context = _ItemContext(
+        item_type=item_type,
+        item_id=item_id,
+        name=name,
+        uncertainty_level=uncertainty_level,
+        uiux_level=uiux_level,
+        legacy_code=legacy_code,
+        uncertainty_multiplier=settings.uncertainty_coefficients.get(uncertainty_level, 1.0),
+        legacy_multiplier=settings.legacy_multiplier if legacy_code else 1.0,
+        extra_multiplier=extra_multiplier,
+    )
+    # UI/UX complexity only affects frontend work.
+    uiux_multiplier = settings.uiux_coefficients.get(uiux_level, 1.0)
+    base_roles = (
+        ("frontend", hours.frontend, uiux_multiplier),
+        ("backend", hours.backend, 1.0),
+        ("qa", hours.qa, 1.0),
+    )
+
+    items = []
+    for role, role_base, role_uiux in base_roles:
+        hours_value = role_base * context.uncertainty_multiplier * role_uiux * context.legacy_multiplier
+        if extra_multiplier != 1.0:
+            hours_value *= extra_multiplier
+        items.append(_line_item(context, role, base_levels[role], role_base, hours_value, role_uiux, rates, False))
+    extra_role_multiplier = context.uncertainty_multiplier * context.legacy_multiplier * extra_multiplier
+    for item, level in zip(role_hours, extra_levels):
+        items.append(
+            _line_item(context, item.role, level, item.hours, item.hours * extra_role_multiplier, 1.0, rates, True)
+        )
+    return items
+
+
+@dataclass(frozen=True)
+class _ItemContext:
+    item_type: str
+    item_id: int
+    name: str
+    uncertainty_level: str
+    uiux_level: str
+    legacy_code: bool
+    uncertainty_multiplier: float
+    legacy_multiplier: float
+    extra_multiplier: float
+
+
+def _line_item(
+    context: _ItemContext,
+    role: str,
+    level: str,
+    base_hours: float,
+    hours: float,
+    uiux_multiplier: float,
+    rates: dict[tuple[str, str], float],
+    extra_role: bool,
+) -> LineItem:
+    rate = rates.get((role, level), 0.0)
+    return LineItem(
+        item_type=context.item_type,
+        item_id=context.item_id,
+        name=context.name,
+        role=role,
+        level=level,
+        hours=hours,
+        rate=rate,
+        cost=hours * rate,
+        uncertainty_level=context.uncertainty_level,
+        extra_role=extra_role,
+        base_hours=base_hours,
+        uiux_level=context.uiux_level,
+        legacy_code=context.legacy_code,
+        uncertainty_multiplier=context.uncertainty_multiplier,
+        uiux_multiplier=uiux_multiplier,
+        legacy_multiplier=context.legacy_multiplier,
+        extra_multiplier=context.extra_multiplier,
+    )
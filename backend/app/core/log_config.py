@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+
+REQUEST_LOGGER = "app.requests"
+_HANDLER_NAME = "app.requests.json"
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including its ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_request_logging(level: str) -> None:
+    """Send request records to stderr as JSON lines.
+
+    The logger gets its own handler and does not propagate, so records are
+    printed once whatever the server configured on the root logger. Safe to
+    call repeatedly.
+    """
+
+    logger = logging.getLogger(REQUEST_LOGGER)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    if any(handler.get_name() == _HANDLER_NAME for handler in logger.handlers):
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.set_name(_HANDLER_NAME)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
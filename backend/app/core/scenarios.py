@@ -1,8 +1,30 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
 from app.core.config import settings
 
 
+QUANTILE_TABLE_SIZE = 4096
+SAMPLES_PER_CHUNK = 4_000_000
+HISTOGRAM_BINS = 30
+MIN_BUDGETED_ITERATIONS = 1_000
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Distribution of simulated project totals."""
+
+    iterations: int
+    hours_percentiles: dict[int, float]
+    cost_percentiles: dict[int, float]
+    hours_histogram: tuple[list[float], list[int]]
+    cost_histogram: tuple[list[float], list[int]]
+
+
 def optimistic_value(value: float) -> float:
     """Return optimistic scenario value."""
 
@@ -13,3 +35,119 @@ def pessimistic_value(value: float) -> float:
     """Return pessimistic scenario value."""
 
     return value * settings.pessimistic_multiplier
+
+
+def uncertainty_spread(uncertainty_level: str) -> tuple[float, float]:
+    """Return relative (down, up) spread of item hours for an uncertainty level."""
+
+    return settings.monte_carlo_spreads.get(
+        uncertainty_level,
+        settings.monte_carlo_default_spread,
+    )
+
+
+def affordable_iterations(requested: int, items: int) -> int:
+    """Clamp iterations so a simulation draws at most ``monte_carlo_max_samples`` values.
+
+    Sampling cost grows with iterations times items, so large projects get
+    fewer iterations; MIN_BUDGETED_ITERATIONS keeps percentiles meaningful.
+    """
+
+    budget = settings.monte_carlo_max_samples // max(items, 1)
+    return min(requested, max(budget, MIN_BUDGETED_ITERATIONS))
+
+
+def simulate_totals(
+    hours: np.ndarray,
+    costs: np.ndarray,
+    spreads: np.ndarray,
+    iterations: int,
+    seed: int | None = None,
+    distribution: str = "pert",
+    fixed_cost: float = 0.0,
+    percentiles: tuple[int, ...] = (10, 50, 90),
+) -> SimulationResult:
+    """Run a Monte Carlo simulation of project totals.
+
+    Every item's hours are scaled by an independent factor drawn from a
+    PERT or triangular distribution on ``[1 - down, 1 + up]`` with mode 1.
+    Item cost scales with the same factor, so a single draw per item and
+    iteration drives both totals. Draws use inverse-CDF lookup tables that
+    are shared by all items with the same spread.
+    """
+
+    hours = np.asarray(hours, dtype=np.float64)
+    costs = np.asarray(costs, dtype=np.float64)
+    spreads = np.asarray(spreads, dtype=np.float64).reshape(-1, 2)
+    rng = np.random.default_rng(seed)
+
+    shapes, shape_index = np.unique(spreads, axis=0, return_inverse=True)
+    shape_index = shape_index.reshape(-1)
+    low = 1.0 - spreads[:, 0]
+    width = spreads[:, 0] + spreads[:, 1]
+    weights = np.stack([hours * width, costs * width], axis=1).astype(np.float32)
+    groups = [
+        (_quantile_table(distribution, float(down), float(up)), weights[shape_index == position])
+        for position, (down, up) in enumerate(shapes)
+    ]
+    base_hours = float(hours @ low)
+    base_cost = float(costs @ low) + fixed_cost
+
+    hours_totals = np.full(iterations, base_hours, dtype=np.float64)
+    cost_totals = np.full(iterations, base_cost, dtype=np.float64)
+    chunk = max(1, SAMPLES_PER_CHUNK // max(len(hours), 1))
+    for start in range(0, iterations, chunk):
+        stop = min(start + chunk, iterations)
+        for table, group_weights in groups:
+            # Table positions are drawn directly as integers; the table fits in cache.
+            positions = rng.integers(0, QUANTILE_TABLE_SIZE, (stop - start, len(group_weights)), dtype=np.uint16)
+            sampled = table[positions] @ group_weights
+            hours_totals[start:stop] += sampled[:, 0]
+            cost_totals[start:stop] += sampled[:, 1]
+
+    return SimulationResult(
+        iterations=iterations,
+        hours_percentiles=_percentiles(hours_totals, percentiles),
+        cost_percentiles=_percentiles(cost_totals, percentiles),
+        hours_histogram=_histogram(hours_totals),
+        cost_histogram=_histogram(cost_totals),
+    )
+
+
+@lru_cache(maxsize=64)
+def _quantile_table(distribution: str, down: float, up: float) -> np.ndarray:
+    """Return standardized inverse CDF on [0, 1] for the given spread."""
+
+    probabilities = np.linspace(0.0, 1.0, QUANTILE_TABLE_SIZE)
+    width = down + up
+    if width <= 0:
+        return np.zeros(QUANTILE_TABLE_SIZE, dtype=np.float32)
+    mode = down / width
+    if distribution == "triangular":
+        table = np.where(
+            probabilities < mode,
+            np.sqrt(probabilities * mode),
+            1.0 - np.sqrt((1.0 - probabilities) * (1.0 - mode)),
+        )
+        return table.astype(np.float32)
+    alpha = 1.0 + 4.0 * mode
+    beta = 1.0 + 4.0 * (1.0 - mode)
+    grid = np.linspace(0.0, 1.0, QUANTILE_TABLE_SIZE * 4)
+    density = grid ** (alpha - 1.0) * (1.0 - grid) ** (beta - 1.0)
+    cumulative = np.concatenate([[0.0], np.cumsum((density[1:] + density[:-1]) / 2.0)])
+    cumulative /= cumulative[-1]
+    return np.interp(probabilities, cumulative, grid).astype(np.float32)
+
+
+def _percentiles(values: np.ndarray, percentiles: tuple[int, ...]) -> dict[int, float]:
+    if not len(values):
+        return {percentile: 0.0 for percentile in percentiles}
+    computed = np.percentile(values, percentiles)
+    return {percentile: float(value) for percentile, value in zip(percentiles, computed)}
+
+
+def _histogram(values: np.ndarray) -> tuple[list[float], list[int]]:
+    if not len(values):
+        return [], []
+    counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+    return edges.tolist(), counts.tolist()
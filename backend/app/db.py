@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
@@ -16,6 +16,14 @@ engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record) -> None:
+        # In WAL mode a snapshot reader does not block writers for the length of a stream.
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
 def get_db_session() -> Generator[Session, None, None]:
     """Provide a transactional database session."""
 
@@ -24,3 +32,20 @@ def get_db_session() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
+
+def open_snapshot_session() -> Session:
+    """Open a session whose reads all see one consistent database snapshot.
+
+    Postgres runs the transaction at REPEATABLE READ. pysqlite would run each
+    SELECT in its own implicit transaction, so SQLite gets an explicit BEGIN.
+    The caller closes the session.
+    """
+
+    session = SessionLocal()
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    elif dialect == "sqlite":
+        session.connection().exec_driver_sql("BEGIN")
+    return session
@@ -3,68 +3,36 @@ from __future__ import annotations
 from sqlalchemy import inspect
 from sqlalchemy.engine import Engine
 
-from app.db import Base, engine
-from app.models import (
-    Assignment,
-    InfrastructureItem,
-    Module,
-    ModuleRoleHours,
-    Project,
-    ProjectCoefficient,
-    ProjectConnection,
-    ProjectInfrastructure,
-    ProjectMindmapVersion,
-    ProjectModule,
-    ProjectNode,
-    ProjectNodeConnection,
-    ProjectNodeRoleHours,
-    ProjectNote,
-    Rate,
-    User,
-)
+from app.db import engine
+from app.migrations.runner import check_revision
+from app.models import Base
 
 
 def init_and_verify_db() -> None:
-    """Create tables and verify expected schema."""
+    """Check that the database is migrated to the revision the code expects.
 
-    Base.metadata.create_all(bind=engine)
-    _verify_schema(engine)
+    Schema changes are applied by ``python -m app.migrations upgrade`` as a
+    release step, so startup costs a single query.
+    """
 
+    check_revision(engine)
 
-def _verify_schema(db_engine: Engine) -> None:
-    inspector = inspect(db_engine)
-    expected = {
-        "modules": _columns(Module),
-        "module_role_hours": _columns(ModuleRoleHours),
-        "projects": _columns(Project),
-        "project_modules": _columns(ProjectModule),
-        "project_nodes": _columns(ProjectNode),
-        "project_node_role_hours": _columns(ProjectNodeRoleHours),
-        "project_node_connections": _columns(ProjectNodeConnection),
-        "project_notes": _columns(ProjectNote),
-        "project_mindmap_versions": _columns(ProjectMindmapVersion),
-        "rates": _columns(Rate),
-        "assignments": _columns(Assignment),
-        "project_coefficients": _columns(ProjectCoefficient),
-        "infrastructure_items": _columns(InfrastructureItem),
-        "project_infrastructure": _columns(ProjectInfrastructure),
-        "project_connections": _columns(ProjectConnection),
-        "users": _columns(User),
-    }
-
-    missing_tables = [table for table in expected if not inspector.has_table(table)]
-    if missing_tables:
-        raise RuntimeError(f"Missing tables: {', '.join(missing_tables)}")
 
-    for table_name, expected_columns in expected.items():
-        columns = inspector.get_columns(table_name)
-        present = {column["name"] for column in columns}
-        missing = expected_columns - present
-        if missing:
-            raise RuntimeError(
-                f"Missing columns in {table_name}: {', '.join(sorted(missing))}"
-            )
+def verify_schema(db_engine: Engine) -> list[str]:
+    """Return tables, columns and indexes declared on the models but missing in the database."""
 
-
-def _columns(model: type[Base]) -> set[str]:
-    return {column.name for column in model.__table__.columns}
+    inspector = inspect(db_engine)
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"Missing table: {table.name}")
+            continue
+        present_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing_columns = {column.name for column in table.columns} - present_columns
+        if missing_columns:
+            problems.append(f"Missing columns in {table.name}: {', '.join(sorted(missing_columns))}")
+        present_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing_indexes = {index.name for index in table.indexes} - present_indexes
+        if missing_indexes:
+            problems.append(f"Missing indexes on {table.name}: {', '.join(sorted(missing_indexes))}")
+    return problems
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -7,11 +8,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.metrics import router as metrics_router
+from app.api.middleware import RequestTimingMiddleware
 from app.api.routes import get_api_router
 from app.core.config import settings
+from app.core.log_config import configure_request_logging
 from app.db_init import init_and_verify_db
+from app.services.export_jobs import cleanup_expired_jobs, export_job_runner, recover_interrupted_jobs
+from app.services.metrics import register_pool_metrics, register_summary_cache_metrics
+from app.services.query_stats import install_query_hooks
+from app.services.render_pool import render_pool
 from app.services.seed_service import seed_defaults
-from app.db import SessionLocal
+from app.services.summary_cache import summary_cache
+from app.db import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
@@ -19,7 +30,9 @@ def create_app() -> FastAPI:
 
     app = FastAPI(title=settings.app_name)
     _configure_cors(app)
+    _configure_request_timing(app)
     app.include_router(get_api_router(), prefix=settings.api_prefix)
+    _configure_metrics(app)
     _mount_frontend(app)
     _register_startup(app)
     return app
@@ -38,6 +51,23 @@ def _configure_cors(app: FastAPI) -> None:
     )
 
 
+def _configure_request_timing(app: FastAPI) -> None:
+    configure_request_logging(settings.request_log_level)
+    install_query_hooks(engine)
+    app.add_middleware(RequestTimingMiddleware)
+
+
+def _configure_metrics(app: FastAPI) -> None:
+    if not settings.metrics_enabled:
+        return
+    if not settings.metrics_token:
+        logger.warning("METRICS_TOKEN is not set; /metrics is not served")
+        return
+    register_pool_metrics(engine)
+    register_summary_cache_metrics(summary_cache)
+    app.include_router(metrics_router)
+
+
 def _mount_frontend(app: FastAPI) -> None:
     dist_path = _resolve_frontend_dist()
     if dist_path:
@@ -55,9 +85,16 @@ def _register_startup(app: FastAPI) -> None:
         session = SessionLocal()
         try:
             seed_defaults(session)
+            recover_interrupted_jobs(session)
+            cleanup_expired_jobs(session)
         finally:
             session.close()
 
+    @app.on_event("shutdown")
+    def _shutdown() -> None:
+        export_job_runner.shutdown()
+        render_pool.shutdown()
+
 
 def _resolve_frontend_dist() -> Path | None:
     """Resolve frontend dist directory location."""
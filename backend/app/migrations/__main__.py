@@ -0,0 +1,44 @@
+"""Manage the database schema.
+
+Run from the backend directory:
+
+    python -m app.migrations upgrade   # apply pending revisions (release step)
+    python -m app.migrations current   # print applied and expected revisions
+    python -m app.migrations check     # compare the database with the models
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from app.db import engine
+from app.db_init import verify_schema
+from app.migrations.runner import current_revision, head_revision, upgrade
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="apply pending revisions")
+    upgrade_parser.add_argument("--to", type=int, dest="target", help="stop at this revision")
+    commands.add_parser("current", help="print applied and expected revisions")
+    commands.add_parser("check", help="compare the database with the models")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    if args.command == "upgrade":
+        revision = upgrade(engine, args.target)
+        print(f"Database is at revision {revision}")
+        return 0
+    if args.command == "current":
+        print(f"applied: {current_revision(engine) or 0}, head: {head_revision()}")
+        return 0
+    problems = verify_schema(engine)
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+sys.exit(main())
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import pkgutil
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_PACKAGE = "app.migrations.versions"
+# Serializes concurrent release steps on Postgres; any constant shared by all deploys works.
+_ADVISORY_LOCK_ID = 7_240_315
+
+_version_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _version_metadata,
+    Column("revision", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(128), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised when the database is behind the migrations shipped with the code."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One revision script from the versions package."""
+
+    revision: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool = True
+
+
+def load_migrations() -> list[Migration]:
+    """Return revision scripts ordered by revision, checking the sequence has no gaps."""
+
+    package = importlib.import_module(VERSIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module = importlib.import_module(f"{VERSIONS_PACKAGE}.{module_info.name}")
+        migrations.append(
+            Migration(module.revision, module.description, module.upgrade, getattr(module, "transactional", True))
+        )
+    migrations.sort(key=lambda migration: migration.revision)
+    expected = list(range(1, len(migrations) + 1))
+    if [migration.revision for migration in migrations] != expected:
+        raise RuntimeError(
+            f"Migration revisions must be 1..{len(migrations)} without gaps, "
+            f"found {[migration.revision for migration in migrations]}"
+        )
+    return migrations
+
+
+def head_revision() -> int:
+    """Return the revision the code expects."""
+
+    return len(load_migrations())
+
+
+def current_revision(db_engine: Engine) -> int | None:
+    """Return the applied revision, or None when the database was never migrated."""
+
+    try:
+        with db_engine.connect() as connection:
+            return connection.execute(select(func.max(schema_migrations.c.revision))).scalar() or 0
+    except DBAPIError:
+        return None
+
+
+def check_revision(db_engine: Engine) -> int:
+    """Raise SchemaOutOfDate unless the database is at or past the code's head revision.
+
+    A database ahead of the code is accepted, so instances of the previous
+    release keep starting while a newer release has already migrated.
+    """
+
+    head = head_revision()
+    current = current_revision(db_engine)
+    if current is None or current < head:
+        raise SchemaOutOfDate(
+            f"Database schema is at revision {current or 0}, the code expects {head}; "
+            "run `python -m app.migrations upgrade`"
+        )
+    if current > head:
+        logger.warning("Database schema revision %s is newer than the code's %s", current, head)
+    return current
+
+
+def upgrade(db_engine: Engine, target: int | None = None) -> int:
+    """Apply pending revisions up to target (default: head) and return the resulting revision.
+
+    Each revision runs in its own transaction together with its
+    ``schema_migrations`` row, so a failed step leaves earlier ones applied.
+    A revision declaring ``transactional = False`` runs on an autocommit
+    connection instead, for statements such as ``CREATE INDEX CONCURRENTLY``
+    that Postgres refuses inside a transaction; it must be safe to re-run
+    after a partial failure.
+    """
+
+    migrations = load_migrations()
+    target = len(migrations) if target is None else target
+    _version_metadata.create_all(db_engine)
+    applied = 0
+    for migration in migrations[:target]:
+        if migration.transactional:
+            with db_engine.begin() as connection:
+                _lock(connection)
+                applied = _apply(connection, migration)
+        else:
+            with db_engine.connect() as connection:
+                connection.execution_options(isolation_level="AUTOCOMMIT")
+                with _session_lock(connection):
+                    applied = _apply(connection, migration)
+    return max(applied, current_revision(db_engine) or 0)
+
+
+def _apply(connection: Connection, migration: Migration) -> int:
+    applied = connection.execute(select(func.max(schema_migrations.c.revision))).scalar() or 0
+    if migration.revision <= applied:
+        return applied
+    logger.info("Applying migration %04d: %s", migration.revision, migration.description)
+    migration.upgrade(connection)
+    connection.execute(
+        insert(schema_migrations).values(
+            revision=migration.revision,
+            description=migration.description,
+            applied_at=datetime.utcnow(),
+        )
+    )
+    return migration.revision
+
+
+def _lock(connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": _ADVISORY_LOCK_ID})
+
+
+@contextmanager
+def _session_lock(connection: Connection) -> Iterator[None]:
+    """Hold the migration lock on an autocommit connection, where a transaction lock would not last."""
+
+    if connection.dialect.name != "postgresql":
+        yield
+        return
+    connection.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": _ADVISORY_LOCK_ID})
+    try:
+        yield
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": _ADVISORY_LOCK_ID})
@@ -0,0 +1,239 @@
+"""Baseline schema.
+
+Databases created by the former ``create_all`` bootstrap already hold these
+tables, so they are created only when missing and the ``projects.revision``
+column that used to be patched in at startup is added when absent.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+revision = 1
+description = "initial schema"
+
+metadata = MetaData()
+
+Table(
+    "modules",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("code", String(64), nullable=False, unique=True, index=True),
+    Column("name", String(128), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("hours_frontend", Float, nullable=False),
+    Column("hours_backend", Float, nullable=False),
+    Column("hours_qa", Float, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "module_role_hours",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("module_id", Integer, ForeignKey("modules.id"), nullable=False),
+    Column("role", String(64), nullable=False),
+    Column("hours", Float, nullable=False),
+    UniqueConstraint("module_id", "role"),
+)
+
+Table(
+    "projects",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(128), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("uncertainty_level", String(32), nullable=False),
+    Column("uiux_level", String(32), nullable=False),
+    Column("legacy_code", Boolean, nullable=False),
+    Column("revision", Integer, nullable=False, server_default="0"),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "project_modules",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("module_id", Integer, ForeignKey("modules.id"), nullable=False),
+    Column("custom_name", String(128), nullable=False),
+    Column("override_frontend", Float),
+    Column("override_backend", Float),
+    Column("override_qa", Float),
+    Column("uncertainty_level", String(32)),
+    Column("uiux_level", String(32)),
+    Column("legacy_code", Boolean),
+    UniqueConstraint("project_id", "module_id"),
+)
+
+Table(
+    "project_nodes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("module_id", Integer, ForeignKey("modules.id")),
+    Column("title", String(128), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("is_ai", Boolean, nullable=False),
+    Column("hours_frontend", Float, nullable=False),
+    Column("hours_backend", Float, nullable=False),
+    Column("hours_qa", Float, nullable=False),
+    Column("uncertainty_level", String(32)),
+    Column("uiux_level", String(32)),
+    Column("legacy_code", Boolean),
+    Column("position_x", Float, nullable=False),
+    Column("position_y", Float, nullable=False),
+)
+
+Table(
+    "project_node_role_hours",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("node_id", Integer, ForeignKey("project_nodes.id"), nullable=False),
+    Column("role", String(64), nullable=False),
+    Column("hours", Float, nullable=False),
+)
+
+Table(
+    "project_node_connections",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("from_node_id", Integer, ForeignKey("project_nodes.id"), nullable=False),
+    Column("to_node_id", Integer, ForeignKey("project_nodes.id"), nullable=False),
+)
+
+Table(
+    "project_notes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("position_x", Float, nullable=False),
+    Column("position_y", Float, nullable=False),
+)
+
+Table(
+    "project_mindmap_versions",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("title", String(128), nullable=False),
+    Column("payload", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "project_connections",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("from_project_module_id", Integer, ForeignKey("project_modules.id"), nullable=False),
+    Column("to_project_module_id", Integer, ForeignKey("project_modules.id"), nullable=False),
+    UniqueConstraint("project_id", "from_project_module_id", "to_project_module_id"),
+)
+
+Table(
+    "rates",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("role", String(32), nullable=False),
+    Column("level", String(32), nullable=False),
+    Column("hourly_rate", Float, nullable=False),
+    UniqueConstraint("role", "level"),
+)
+
+Table(
+    "assignments",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("project_module_id", Integer, ForeignKey("project_modules.id"), nullable=False),
+    Column("role", String(32), nullable=False),
+    Column("level", String(32), nullable=False),
+    UniqueConstraint("project_id", "project_module_id", "role"),
+)
+
+Table(
+    "project_coefficients",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("name", String(64), nullable=False),
+    Column("multiplier", Float, nullable=False),
+    UniqueConstraint("project_id", "name"),
+)
+
+Table(
+    "infrastructure_items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("code", String(64), nullable=False, unique=True, index=True),
+    Column("name", String(128), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("unit_cost", Float, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "project_infrastructure",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("infrastructure_item_id", Integer, ForeignKey("infrastructure_items.id"), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    UniqueConstraint("project_id", "infrastructure_item_id"),
+)
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String(64), nullable=False, unique=True, index=True),
+    Column("password_hash", String(128), nullable=False),
+    Column("role", String(32), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "export_jobs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False, index=True),
+    Column("format", String(16), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("progress", Float, nullable=False),
+    Column("error", Text, nullable=False),
+    Column("file_path", String(512)),
+    Column("file_size", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("started_at", DateTime),
+    Column("finished_at", DateTime),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+    project_columns = {column["name"] for column in inspect(connection).get_columns("projects")}
+    if "revision" not in project_columns:
+        connection.execute(text("ALTER TABLE projects ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"))
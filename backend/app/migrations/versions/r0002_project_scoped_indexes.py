@@ -0,0 +1,54 @@
+"""Indexes for project-scoped queries and reverse foreign keys.
+
+``IF NOT EXISTS`` keeps this safe on databases where the indexes were
+already created by the startup index check that preceded migrations.
+
+On Postgres the indexes are built with ``CREATE INDEX CONCURRENTLY`` so
+writes to these tables go on during the build. That statement cannot run
+in a transaction, hence ``transactional = False``. An interrupted build
+leaves an invalid index behind, which is dropped and rebuilt on re-run.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = 2
+description = "project-scoped indexes"
+transactional = False
+
+INDEXES = {
+    "ix_project_nodes_project_id_id": ("project_nodes", "project_id, id"),
+    "ix_project_nodes_module_id": ("project_nodes", "module_id"),
+    "ix_project_node_role_hours_node_id_id": ("project_node_role_hours", "node_id, id"),
+    "ix_project_node_connections_project_id": ("project_node_connections", "project_id"),
+    "ix_project_node_connections_from_node_id": ("project_node_connections", "from_node_id"),
+    "ix_project_node_connections_to_node_id": ("project_node_connections", "to_node_id"),
+    "ix_project_notes_project_id": ("project_notes", "project_id"),
+    "ix_project_mindmap_versions_project_id_created_at": ("project_mindmap_versions", "project_id, created_at"),
+    "ix_project_modules_module_id": ("project_modules", "module_id"),
+    "ix_assignments_project_module_id": ("assignments", "project_module_id"),
+    "ix_project_connections_from_project_module_id": ("project_connections", "from_project_module_id"),
+    "ix_project_connections_to_project_module_id": ("project_connections", "to_project_module_id"),
+    "ix_project_infrastructure_infrastructure_item_id": ("project_infrastructure", "infrastructure_item_id"),
+}
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        for name, (table, columns) in INDEXES.items():
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+        return
+    for name, (table, columns) in INDEXES.items():
+        _drop_invalid_index(connection, name)
+        connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def _drop_invalid_index(connection: Connection, name: str) -> None:
+    invalid = connection.execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
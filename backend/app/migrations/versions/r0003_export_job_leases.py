@@ -0,0 +1,26 @@
+"""Owner and heartbeat of export jobs.
+
+A job is leased by the instance that queued it; another instance reclaims
+it only after the heartbeat has gone stale. Rows queued before this
+revision have neither column and fall back to their start or creation time.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+revision = 3
+description = "export job leases"
+
+COLUMNS = {
+    "owner": "VARCHAR(128)",
+    "heartbeat_at": "TIMESTAMP",
+}
+
+
+def upgrade(connection: Connection) -> None:
+    present = {column["name"] for column in inspect(connection).get_columns("export_jobs")}
+    for name, column_type in COLUMNS.items():
+        if name not in present:
+            connection.execute(text(f"ALTER TABLE export_jobs ADD COLUMN {name} {column_type}"))
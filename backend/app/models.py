@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -79,6 +79,7 @@ class Project(Base):
     uncertainty_level: Mapped[str] = mapped_column(String(32), default="known")
     uiux_level: Mapped[str] = mapped_column(String(32), default="mvp")
     legacy_code: Mapped[bool] = mapped_column(default=False)
+    revision: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -125,7 +126,7 @@ class ProjectModule(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    module_id: Mapped[int] = mapped_column(ForeignKey("modules.id"))
+    module_id: Mapped[int] = mapped_column(ForeignKey("modules.id"), index=True)
 
     custom_name: Mapped[str] = mapped_column(String(128), default="")
     override_frontend: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -144,10 +145,11 @@ class ProjectNode(Base):
     """Mindmap node inside a project."""
 
     __tablename__ = "project_nodes"
+    __table_args__ = (Index("ix_project_nodes_project_id_id", "project_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    module_id: Mapped[int | None] = mapped_column(ForeignKey("modules.id"), nullable=True)
+    module_id: Mapped[int | None] = mapped_column(ForeignKey("modules.id"), nullable=True, index=True)
 
     title: Mapped[str] = mapped_column(String(128))
     description: Mapped[str] = mapped_column(Text, default="")
@@ -176,6 +178,7 @@ class ProjectNodeRoleHours(Base):
     """Extra role hours for mindmap node."""
 
     __tablename__ = "project_node_role_hours"
+    __table_args__ = (Index("ix_project_node_role_hours_node_id_id", "node_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     node_id: Mapped[int] = mapped_column(ForeignKey("project_nodes.id"))
@@ -191,9 +194,9 @@ class ProjectNodeConnection(Base):
     __tablename__ = "project_node_connections"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    from_node_id: Mapped[int] = mapped_column(ForeignKey("project_nodes.id"))
-    to_node_id: Mapped[int] = mapped_column(ForeignKey("project_nodes.id"))
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), index=True)
+    from_node_id: Mapped[int] = mapped_column(ForeignKey("project_nodes.id"), index=True)
+    to_node_id: Mapped[int] = mapped_column(ForeignKey("project_nodes.id"), index=True)
 
     project: Mapped[Project] = relationship(back_populates="mindmap_connections")
 
@@ -204,7 +207,7 @@ class ProjectNote(Base):
     __tablename__ = "project_notes"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), index=True)
     content: Mapped[str] = mapped_column(Text, default="")
     position_x: Mapped[float] = mapped_column(Float, default=0)
     position_y: Mapped[float] = mapped_column(Float, default=0)
@@ -216,6 +219,7 @@ class ProjectMindmapVersion(Base):
     """Stored mindmap snapshot version."""
 
     __tablename__ = "project_mindmap_versions"
+    __table_args__ = (Index("ix_project_mindmap_versions_project_id_created_at", "project_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
@@ -234,8 +238,8 @@ class ProjectConnection(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    from_project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"))
-    to_project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"))
+    from_project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"), index=True)
+    to_project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"), index=True)
 
 
 class Rate(Base):
@@ -258,7 +262,7 @@ class Assignment(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"))
+    project_module_id: Mapped[int] = mapped_column(ForeignKey("project_modules.id"), index=True)
     role: Mapped[str] = mapped_column(String(32))
     level: Mapped[str] = mapped_column(String(32))
 
@@ -306,7 +310,7 @@ class ProjectInfrastructure(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
-    infrastructure_item_id: Mapped[int] = mapped_column(ForeignKey("infrastructure_items.id"))
+    infrastructure_item_id: Mapped[int] = mapped_column(ForeignKey("infrastructure_items.id"), index=True)
     quantity: Mapped[int] = mapped_column(Integer, default=1)
 
     project: Mapped[Project] = relationship(back_populates="infrastructure")
@@ -327,3 +331,25 @@ class User(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ExportJob(Base):
+    """Background export render with its status and result file."""
+
+    __tablename__ = "export_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), index=True)
+    format: Mapped[str] = mapped_column(String(16))
+    status: Mapped[str] = mapped_column(String(16), default="queued")
+    progress: Mapped[float] = mapped_column(Float, default=0)
+    error: Mapped[str] = mapped_column(Text, default="")
+    file_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    file_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
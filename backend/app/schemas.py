@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -312,6 +314,21 @@ class UserOut(BaseModel):
     role: str
 
 
+class LoginRequest(BaseModel):
+    """Login payload."""
+
+    username: str
+    password: str
+
+
+class TokenOut(BaseModel):
+    """Issued session token."""
+
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
 class RateUpsert(BaseModel):
     """Upsert hourly rate."""
 
@@ -359,11 +376,121 @@ class SummaryTotals(BaseModel):
     cost_total: float
 
 
+class SummaryHistogram(BaseModel):
+    """Histogram of simulated totals."""
+
+    edges: list[float]
+    counts: list[int]
+
+
+class SummaryDistribution(BaseModel):
+    """Monte Carlo distribution of project totals."""
+
+    method: str
+    iterations: int
+    seed: int | None
+    hours_p10: float
+    hours_p50: float
+    hours_p90: float
+    cost_p10: float
+    cost_p50: float
+    cost_p90: float
+    hours_histogram: SummaryHistogram
+    cost_histogram: SummaryHistogram
+
+
 class SummaryOut(BaseModel):
     """Project summary."""
 
     totals: SummaryTotals
     scenarios: list[SummaryScenario]
+    distribution: SummaryDistribution | None = None
+
+
+class ProjectSummaryOut(SummaryOut):
+    """Project summary inside a portfolio response."""
+
+    project_id: int
+
+
+class SummarySweepRequest(BaseModel):
+    """What-if grid over project settings; empty lists keep current values."""
+
+    uncertainty_levels: list[str] = Field(default_factory=list)
+    uiux_levels: list[str] = Field(default_factory=list)
+    legacy_code: list[bool] = Field(default_factory=list)
+    coefficients: dict[str, list[float]] = Field(default_factory=dict)
+    rate_sets: list[list[RateUpsert]] = Field(default_factory=list)
+
+
+class SummarySweepPoint(BaseModel):
+    """Project settings evaluated at one grid point."""
+
+    uncertainty_level: str
+    uiux_level: str
+    legacy_code: bool
+    coefficients: dict[str, float]
+    rate_set: int | None
+
+
+class SummarySweepItemOut(SummaryOut):
+    """Summary for one what-if grid point."""
+
+    point: SummarySweepPoint
+
+
+class SensitivityEffect(BaseModel):
+    """Change of project totals caused by one perturbation of an item."""
+
+    change: str
+    delta_hours: float
+    delta_cost: float
+
+
+class SensitivityItemOut(BaseModel):
+    """Project module or node ranked by its cost impact."""
+
+    item_type: str
+    item_id: int
+    name: str
+    hours: float
+    cost: float
+    impact: float
+    effects: list[SensitivityEffect]
+
+
+class ExportJobCreate(BaseModel):
+    """Export job request."""
+
+    format: Literal["csv", "pdf", "xlsx"]
+
+
+class ExportJobOut(BaseModel):
+    """Export job status."""
+
+    id: int
+    project_id: int
+    format: str
+    status: str
+    progress: float
+    error: str
+    file_size: int | None
+    created_at: str
+    finished_at: str | None
+    expires_at: str
+    download_url: str | None
+
+
+class SummaryCacheStatsOut(BaseModel):
+    """Summary cache counters."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    deltas: int
+    hit_ratio: float
 
 
 class AiParseRequest(BaseModel):
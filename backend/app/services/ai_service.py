@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import json
 import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 from openai import OpenAI
@@ -18,6 +21,7 @@ from app.schemas import (
     AiParseResponse,
     AiWbsTask,
 )
+from app.services.metrics import OPENAI_FALLBACKS, OPENAI_REQUEST_SECONDS
 
 
 @dataclass(frozen=True)
@@ -115,6 +119,7 @@ def _parse_with_openai(
     except Exception as exc:
         if _is_non_chat_model_error(exc):
             logger.warning("OpenAI model is not chat-capable. Retrying with completions API.")
+            OPENAI_FALLBACKS.inc(target="completions")
             try:
                 content = _request_openai_completion(client, system_prompt, prompt)
             except Exception as completion_exc:
@@ -124,9 +129,11 @@ def _parse_with_openai(
                     )
                 else:
                     logger.exception("OpenAI completion request failed. Falling back to heuristics.")
+                OPENAI_FALLBACKS.inc(target="heuristics")
                 return _parse_with_heuristics(prompt, catalog, catalog_index)
         else:
             logger.exception("OpenAI request failed. Falling back to heuristics.")
+            OPENAI_FALLBACKS.inc(target="heuristics")
             return _parse_with_heuristics(prompt, catalog, catalog_index)
     if not content:
         logger.warning("OpenAI returned empty response content.")
@@ -163,14 +170,15 @@ def _build_system_prompt(catalog: list[ModuleCatalogItem]) -> str:
 
 def _request_openai_chat(client: OpenAI, system_prompt: str, prompt: str) -> str:
     """Call chat-completions API and return response content."""
-    response = client.chat.completions.create(
-        model=settings.openai_model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt},
-        ],
-        timeout=settings.openai_timeout_seconds,
-    )
+    with _observe_openai("chat"):
+        response = client.chat.completions.create(
+            model=settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            timeout=settings.openai_timeout_seconds,
+        )
     return response.choices[0].message.content or ""
 
 
@@ -182,14 +190,27 @@ def _request_openai_completion(client: OpenAI, system_prompt: str, prompt: str)
         f"{prompt}\n\n"
         "Ответь строго в JSON как в инструкции выше."
     )
-    response = client.completions.create(
-        model=settings.openai_model,
-        prompt=combined_prompt,
-        timeout=settings.openai_timeout_seconds,
-    )
+    with _observe_openai("completion"):
+        response = client.completions.create(
+            model=settings.openai_model,
+            prompt=combined_prompt,
+            timeout=settings.openai_timeout_seconds,
+        )
     return response.choices[0].text or ""
 
 
+@contextmanager
+def _observe_openai(api: str) -> Iterator[None]:
+    """Record OpenAI call latency, labelled by API and outcome."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, api=api, outcome=outcome)
+
+
 def _is_non_chat_model_error(error: Exception) -> bool:
     """Detect when a non-chat model is used with chat-completions."""
     message = str(error).lower()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import verify_password
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Identity of the user making a request."""
+
+    id: int
+    username: str
+    role: str
+
+
+class CredentialCache:
+    """Bounded TTL cache of verified credentials.
+
+    Keys are keyed digests of username and password, so plain passwords are
+    never kept in memory and a cached entry only matches the exact pair that
+    was verified against the database.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._key = secrets.token_bytes(32)
+        self._entries: OrderedDict[tuple[str, bytes], tuple[float, AuthenticatedUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str, password: str) -> AuthenticatedUser | None:
+        """Return the cached user for a credential pair that has not expired."""
+
+        cache_key = (username, self._digest(username, password))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return user
+
+    def put(self, username: str, password: str, user: AuthenticatedUser) -> None:
+        """Remember a credential pair verified against the database."""
+
+        if self._max_size <= 0 or self._ttl_seconds <= 0:
+            return
+        cache_key = (username, self._digest(username, password))
+        with self._lock:
+            self._entries[cache_key] = (self._clock() + self._ttl_seconds, user)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Drop every cached credential of a user."""
+
+        with self._lock:
+            for cache_key in [key for key in self._entries if key[0] == username]:
+                del self._entries[cache_key]
+
+    def clear(self) -> None:
+        """Drop all cached credentials."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def _digest(self, username: str, password: str) -> bytes:
+        message = username.encode("utf-8") + b"\0" + password.encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+
+credential_cache = CredentialCache(settings.auth_cache_size, settings.auth_cache_ttl_seconds)
+
+
+def authenticate(session: Session, username: str, password: str) -> AuthenticatedUser | None:
+    """Return the user for valid credentials, consulting the cache first."""
+
+    cached = credential_cache.get(username, password)
+    if cached is not None:
+        return cached
+    user = session.execute(select(User).where(User.username == username)).scalar_one_or_none()
+    if not user or not verify_password(password, user.password_hash):
+        return None
+    identity = AuthenticatedUser(id=user.id, username=user.username, role=user.role)
+    credential_cache.put(username, password, identity)
+    return identity
+
+
+@dataclass(frozen=True)
+class SessionToken:
+    """Signed token issued at login."""
+
+    value: str
+    expires_in: int
+
+
+class TokenSigningUnavailable(RuntimeError):
+    """Raised when session tokens cannot be issued because no shared secret is configured."""
+
+
+def _token_key() -> bytes | None:
+    if settings.session_token_secret:
+        return settings.session_token_secret.encode("utf-8")
+    if settings.environment != "development":
+        logger.error(
+            "SESSION_TOKEN_SECRET is not set; token login is disabled outside development, "
+            "HTTP Basic keeps working"
+        )
+        return None
+    logger.warning(
+        "SESSION_TOKEN_SECRET is not set; session tokens are signed with a random key "
+        "and are valid only in this process until restart"
+    )
+    return secrets.token_bytes(32)
+
+
+_TOKEN_KEY = _token_key()
+
+
+def issue_token(user: AuthenticatedUser) -> SessionToken:
+    """Return a signed token carrying the user identity and expiry.
+
+    Raises TokenSigningUnavailable when no signing key is configured.
+    """
+
+    if _TOKEN_KEY is None:
+        raise TokenSigningUnavailable("SESSION_TOKEN_SECRET is not set")
+    ttl = settings.session_token_ttl_seconds
+    claims = {"sub": user.id, "name": user.username, "role": user.role, "exp": int(time.time()) + ttl}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return SessionToken(value=f"{payload}.{_b64encode(_sign(payload))}", expires_in=ttl)
+
+
+def verify_token(token: str) -> AuthenticatedUser | None:
+    """Return the identity of a valid, unexpired token without touching the database."""
+
+    if _TOKEN_KEY is None:
+        return None
+    payload, _, signature = token.partition(".")
+    try:
+        if not hmac.compare_digest(_b64decode(signature), _sign(payload)):
+            return None
+        claims = json.loads(_b64decode(payload))
+        if claims["exp"] <= time.time():
+            return None
+        return AuthenticatedUser(id=int(claims["sub"]), username=str(claims["name"]), role=str(claims["role"]))
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+
+
+def _sign(payload: str) -> bytes:
+    return hmac.new(_TOKEN_KEY, payload.encode("ascii"), hashlib.sha256).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import time
+import zipfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import open_snapshot_session
+from app.models import Project
+from app.services.export_service import iter_project_export
+
+
+def resolve_bulk_project_ids(session: Session, project_ids: list[int] | None) -> list[int]:
+    """Return de-duplicated project ids in request order, or all ids when None.
+
+    Raises NoResultFound listing unknown ids.
+    """
+
+    existing = set(session.execute(select(Project.id)).scalars())
+    if project_ids is None:
+        return sorted(existing)
+    ordered_ids = list(dict.fromkeys(project_ids))
+    missing = [project_id for project_id in ordered_ids if project_id not in existing]
+    if missing:
+        raise NoResultFound(f"Projects not found: {', '.join(map(str, missing))}")
+    return ordered_ids
+
+
+def iter_projects_zip(project_ids: list[int], formats: list[str]) -> Iterator[bytes]:
+    """Yield a ZIP archive of per-project exports as it is written.
+
+    CSV and XLSX entries are written from their render iterators chunk by
+    chunk, so no whole file is held in memory. A PDF only exists as a whole
+    once the render process pool returns it, so a bounded window of PDFs is
+    rendered ahead in a thread pool while entries are written strictly in
+    request order.
+    """
+
+    tasks = [(project_id, export_format) for project_id in project_ids for export_format in formats]
+    pdf_tasks = iter([task for task in tasks if task[1] == "pdf"])
+    window = max(1, settings.bulk_export_workers) * 2
+    sink = _ZipSink()
+    pending: deque[Future] = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=settings.bulk_export_workers,
+        thread_name_prefix="bulk-export",
+    )
+    try:
+        with zipfile.ZipFile(sink, mode="w") as archive:
+            _fill(executor, pdf_tasks, pending, window)
+            for project_id, export_format in tasks:
+                if export_format == "pdf":
+                    chunks = iter([pending.popleft().result()])
+                    _fill(executor, pdf_tasks, pending, window)
+                else:
+                    chunks = _stream_export(project_id, export_format)
+                info = zipfile.ZipInfo(
+                    f"project-{project_id}-export.{export_format}",
+                    date_time=time.localtime()[:6],
+                )
+                # PDF and XLSX files are compressed already.
+                info.compress_type = zipfile.ZIP_DEFLATED if export_format == "csv" else zipfile.ZIP_STORED
+                with archive.open(info, mode="w", force_zip64=True) as entry:
+                    for chunk in chunks:
+                        entry.write(chunk)
+                        if sink.pending:
+                            yield sink.drain()
+                if sink.pending:
+                    yield sink.drain()
+        yield sink.drain()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fill(
+    executor: ThreadPoolExecutor,
+    pdf_tasks: Iterator[tuple[int, str]],
+    pending: deque[Future],
+    window: int,
+) -> None:
+    while len(pending) < window:
+        task = next(pdf_tasks, None)
+        if task is None:
+            return
+        pending.append(executor.submit(_render_pdf, task[0]))
+
+
+def _render_pdf(project_id: int) -> bytes:
+    return b"".join(_stream_export(project_id, "pdf"))
+
+
+def _stream_export(project_id: int, export_format: str) -> Iterator[bytes]:
+    with open_snapshot_session() as session:
+        yield from iter_project_export(session, project_id, export_format)
+
+
+class _ZipSink:
+    """Write-only stream collecting archive bytes until the response drains them.
+
+    It has no ``tell``/``seek``, so zipfile writes data descriptors instead of
+    rewinding to patch local headers.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._chunks)
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
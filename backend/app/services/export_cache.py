@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import InfrastructureItem, Project, Rate
+
+
+EXPORT_FORMAT_VERSION = 1
+EXPORT_READ_CHUNK_BYTES = 256 * 1024
+
+
+def export_cache_key(session: Session, project_id: int, export_format: str) -> str:
+    """Return a content address for a project export.
+
+    The digest covers everything an export is rendered from: the project
+    revision, the rate table and the infrastructure catalog. Raises
+    NoResultFound for unknown projects.
+    """
+
+    project = session.execute(
+        select(Project.id, Project.revision, Project.created_at).where(Project.id == project_id)
+    ).one()
+    rates = session.execute(
+        select(Rate.role, Rate.level, Rate.hourly_rate).order_by(Rate.role, Rate.level)
+    ).all()
+    infrastructure = session.execute(
+        select(InfrastructureItem.id, InfrastructureItem.name, InfrastructureItem.unit_cost)
+        .order_by(InfrastructureItem.id)
+    ).all()
+    descriptor = {
+        "version": EXPORT_FORMAT_VERSION,
+        "format": export_format,
+        "project": [project.id, project.revision, project.created_at.isoformat() if project.created_at else None],
+        "rates": [list(row) for row in rates],
+        "infrastructure": [list(row) for row in infrastructure],
+    }
+    payload = json.dumps(descriptor, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def etag_for(key: str) -> str:
+    """Return the ETag header value for a cache key."""
+
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: str | None, key: str) -> bool:
+    """Return True when an If-None-Match header matches the cache key."""
+
+    if not if_none_match:
+        return False
+    etag = etag_for(key)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def iter_file_chunks(file: BinaryIO) -> Iterator[bytes]:
+    """Yield the contents of an open file in chunks, closing it at the end."""
+
+    with file:
+        while chunk := file.read(EXPORT_READ_CHUNK_BYTES):
+            yield chunk
+
+
+class ExportCache:
+    """Size-bounded on-disk store of rendered exports with LRU eviction."""
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def open(self, key: str) -> BinaryIO | None:
+        """Open the cached file for a key and mark it recently used.
+
+        The returned handle stays readable if the entry is evicted afterwards,
+        so callers stream from it instead of reopening the path later.
+        """
+
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                return None
+            try:
+                file = self._path(key).open("rb")
+            except FileNotFoundError:
+                self._total_bytes -= self._entries.pop(key)
+                return None
+            os.utime(file.fileno())
+            self._entries.move_to_end(key)
+            return file
+
+    def put(self, key: str, content: bytes) -> Path | None:
+        """Store rendered bytes and return the cached file, if it was kept."""
+
+        return self._commit(key, self._write_temp([content]))
+
+    def tee(self, key: str, chunks: Iterable[str | bytes]) -> Iterator[bytes]:
+        """Yield chunks unchanged while storing them; commit once fully consumed."""
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        completed = False
+        try:
+            with os.fdopen(handle, "wb") as file:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                    file.write(data)
+                    yield data
+            completed = True
+        finally:
+            if completed:
+                self._commit(key, Path(temp_name))
+            else:
+                Path(temp_name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cached files."""
+
+        with self._lock:
+            self._load()
+            for key in list(self._entries):
+                self._path(key).unlink(missing_ok=True)
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _write_temp(self, chunks: Iterable[bytes]) -> Path:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        return Path(temp_name)
+
+    def _commit(self, key: str, temp_path: Path) -> Path | None:
+        size = temp_path.stat().st_size
+        path = self._path(key)
+        if size > self._max_bytes:
+            temp_path.unlink(missing_ok=True)
+            return None
+        with self._lock:
+            self._load()
+            os.replace(temp_path, path)
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+                evicted, evicted_size = self._entries.popitem(last=False)
+                self._path(evicted).unlink(missing_ok=True)
+                self._total_bytes -= evicted_size
+        return path
+
+    def _load(self) -> None:
+        """Index files left by previous runs, oldest access first."""
+
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self._directory.exists():
+            return
+        files = []
+        for path in self._directory.iterdir():
+            if path.suffix != ".tmp" and path.is_file():
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key
+
+
+export_cache = ExportCache(settings.export_cache_dir, settings.export_cache_max_bytes)
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import SessionLocal, open_snapshot_session
+from app.models import ExportJob, Project
+from app.services.export_service import iter_project_export
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+# Progress is written at most once per step; 1.0 is left for the finished job.
+JOB_PROGRESS_STEP = 0.05
+JOB_PROGRESS_MAX = 0.99
+
+
+def create_export_job(session: Session, project_id: int, export_format: str) -> ExportJob:
+    """Persist a queued export job and hand it to the worker pool.
+
+    Raises NoResultFound for unknown projects. Expired jobs are purged first.
+    """
+
+    session.execute(select(Project.id).where(Project.id == project_id)).scalar_one()
+    cleanup_expired_jobs(session)
+    job = ExportJob(
+        project_id=project_id,
+        format=export_format,
+        status=JOB_QUEUED,
+        progress=0.0,
+        error="",
+        owner=export_job_runner.owner,
+        heartbeat_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(seconds=settings.export_job_ttl_seconds),
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    export_job_runner.submit(job.id)
+    return job
+
+
+def get_export_job(session: Session, job_id: int) -> ExportJob | None:
+    """Return an export job that has not expired yet."""
+
+    job = session.get(ExportJob, job_id)
+    if job is None or job.expires_at <= datetime.utcnow():
+        return None
+    return job
+
+
+def requeue_missing_result(session: Session, job: ExportJob) -> bool:
+    """Queue a finished job again when its file is gone from this instance.
+
+    Result files live on local disk, so a restart, a redeploy or another
+    replica answering the request leaves a ``done`` job without its file.
+    The job is re-rendered by this instance; when several instances race,
+    only the one that moves it out of ``done`` submits it.
+    """
+
+    if job.status != JOB_DONE or (job.file_path and Path(job.file_path).exists()):
+        return False
+    now = datetime.utcnow()
+    requeued = session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job.id, ExportJob.status == JOB_DONE, ExportJob.file_path == job.file_path)
+        .values(
+            status=JOB_QUEUED,
+            progress=0.0,
+            file_path=None,
+            file_size=None,
+            owner=export_job_runner.owner,
+            heartbeat_at=now,
+            started_at=None,
+            finished_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    session.commit()
+    session.refresh(job)
+    if requeued:
+        logger.info("Export job %s lost its file and was queued again", job.id)
+        export_job_runner.submit(job.id)
+    return bool(requeued)
+
+
+def cleanup_expired_jobs(session: Session) -> int:
+    """Delete expired jobs and their result files."""
+
+    jobs = session.execute(
+        select(ExportJob).where(ExportJob.expires_at <= datetime.utcnow())
+    ).scalars().all()
+    for job in jobs:
+        if job.file_path:
+            Path(job.file_path).unlink(missing_ok=True)
+        session.delete(job)
+    session.commit()
+    return len(jobs)
+
+
+def recover_interrupted_jobs(session: Session) -> int:
+    """Fail queued or running jobs whose owner stopped renewing their lease.
+
+    Live instances keep the heartbeat of their jobs fresh, so their work is
+    left alone; rows without a heartbeat are judged by their start or
+    creation time.
+    """
+
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.export_job_lease_seconds)
+    last_seen = func.coalesce(ExportJob.heartbeat_at, ExportJob.started_at, ExportJob.created_at)
+    result = session.execute(
+        update(ExportJob)
+        .where(ExportJob.status.in_([JOB_QUEUED, JOB_RUNNING]), last_seen < cutoff)
+        .values(status=JOB_FAILED, error="Interrupted: the worker stopped", finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
+
+
+class ExportJobRunner:
+    """Local thread pool executing export jobs by id.
+
+    Jobs are leased to this instance through their ``owner`` column. While
+    the pool is running, a heartbeat thread renews the lease of its jobs and
+    fails jobs of instances whose lease ran out.
+    """
+
+    def __init__(self, workers: int, lease_seconds: int) -> None:
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._workers = workers
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._stopped = threading.Event()
+
+    def submit(self, job_id: int) -> None:
+        """Schedule a persisted job owned by this runner."""
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers,
+                    thread_name_prefix="export-job",
+                )
+                self._stopped = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat,
+                    args=(self._stopped,),
+                    name="export-job-heartbeat",
+                    daemon=True,
+                ).start()
+            self._executor.submit(self._run, job_id)
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and fail the queued ones that will never run."""
+
+        with self._lock:
+            if self._executor is None:
+                return
+            self._stopped.set()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        with SessionLocal() as session:
+            session.execute(
+                update(ExportJob)
+                .where(ExportJob.owner == self.owner, ExportJob.status == JOB_QUEUED)
+                .values(status=JOB_FAILED, error="Interrupted by shutdown", finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+
+    def _heartbeat(self, stopped: threading.Event) -> None:
+        interval = max(1.0, self._lease_seconds / 3)
+        while not stopped.wait(interval):
+            try:
+                with SessionLocal() as session:
+                    session.execute(
+                        update(ExportJob)
+                        .where(ExportJob.owner == self.owner, ExportJob.status.in_([JOB_QUEUED, JOB_RUNNING]))
+                        .values(heartbeat_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    session.commit()
+                    recover_interrupted_jobs(session)
+            except Exception:
+                logger.exception("Renewing export job leases failed")
+
+    def _run(self, job_id: int) -> None:
+        with SessionLocal() as session:
+            now = datetime.utcnow()
+            claimed = session.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id, ExportJob.owner == self.owner, ExportJob.status == JOB_QUEUED)
+                .values(status=JOB_RUNNING, started_at=now, heartbeat_at=now, progress=0.0)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            if not claimed:
+                return
+            job = session.get(ExportJob, job_id)
+            try:
+                path = _render_job(session, job)
+            except Exception as exc:
+                logger.exception("Export job %s failed", job_id)
+                session.rollback()
+                path = None
+                outcome = {"status": JOB_FAILED, "error": str(exc) or exc.__class__.__name__}
+            else:
+                outcome = {
+                    "status": JOB_DONE,
+                    "file_path": str(path),
+                    "file_size": path.stat().st_size,
+                    "progress": 1.0,
+                }
+            finished = session.execute(
+                update(ExportJob)
+                .where(ExportJob.id == job_id, ExportJob.owner == self.owner, ExportJob.status == JOB_RUNNING)
+                .values(**outcome, finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+            if not finished and path is not None:
+                # The lease expired and another instance failed the job meanwhile.
+                path.unlink(missing_ok=True)
+
+
+def _render_job(session: Session, job: ExportJob) -> Path:
+    directory = Path(settings.export_jobs_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{job.id}.{job.format}"
+
+    report = _progress_reporter(session, job.id)
+    try:
+        with open_snapshot_session() as snapshot, path.open("wb") as file:
+            for chunk in iter_project_export(snapshot, job.project_id, job.format, progress=report):
+                file.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _progress_reporter(session: Session, job_id: int) -> Callable[[float], None]:
+    """Return a callback persisting progress in steps of JOB_PROGRESS_STEP."""
+
+    reported = 0.0
+
+    def report(fraction: float) -> None:
+        nonlocal reported
+        if fraction - reported < JOB_PROGRESS_STEP and fraction < 1.0:
+            return
+        reported = fraction
+        session.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id)
+            .values(progress=min(fraction, JOB_PROGRESS_MAX), heartbeat_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+
+    return report
+
+
+export_job_runner = ExportJobRunner(settings.export_job_workers, settings.export_job_lease_seconds)
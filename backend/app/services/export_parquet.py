@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.line_items import LineItem
+
+PARQUET_ROW_GROUP_ROWS = 50_000
+PARQUET_COMPRESSION = "zstd"
+
+LINE_ITEM_SCHEMA = pa.schema(
+    [
+        pa.field("project_id", pa.int64(), nullable=False),
+        pa.field("item_type", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("item_id", pa.int64(), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("role", pa.dictionary(pa.int16(), pa.string()), nullable=False),
+        pa.field("level", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("extra_role", pa.bool_(), nullable=False),
+        pa.field("base_hours", pa.float64(), nullable=False),
+        pa.field("hours", pa.float64(), nullable=False),
+        pa.field("rate", pa.float64(), nullable=False),
+        pa.field("cost", pa.float64(), nullable=False),
+        pa.field("uncertainty_level", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("uiux_level", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field("legacy_code", pa.bool_(), nullable=False),
+        pa.field("uncertainty_multiplier", pa.float64(), nullable=False),
+        pa.field("uiux_multiplier", pa.float64(), nullable=False),
+        pa.field("legacy_multiplier", pa.float64(), nullable=False),
+        pa.field("extra_multiplier", pa.float64(), nullable=False),
+    ]
+)
+
+_ITEM_FIELDS = [field.name for field in LINE_ITEM_SCHEMA][1:]
+
+
+def iter_line_items_parquet(projects: Iterable[tuple[int, Iterable[LineItem]]]) -> Iterator[bytes]:
+    """Yield a Parquet file of line items, one row group per batch of rows.
+
+    ``projects`` pairs each project id with its line items; only one row
+    group of items is held in memory at a time.
+    """
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, LINE_ITEM_SCHEMA, compression=PARQUET_COMPRESSION)
+    try:
+        for batch in _batches(projects):
+            writer.write_table(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _batches(projects: Iterable[tuple[int, Iterable[LineItem]]]) -> Iterator[pa.Table]:
+    columns: dict[str, list] = {name: [] for name in LINE_ITEM_SCHEMA.names}
+    rows = 0
+    for project_id, line_items in projects:
+        for item in line_items:
+            columns["project_id"].append(project_id)
+            for name in _ITEM_FIELDS:
+                columns[name].append(getattr(item, name))
+            rows += 1
+            if rows == PARQUET_ROW_GROUP_ROWS:
+                yield pa.Table.from_pydict(columns, schema=LINE_ITEM_SCHEMA)
+                columns = {name: [] for name in LINE_ITEM_SCHEMA.names}
+                rows = 0
+    if rows:
+        yield pa.Table.from_pydict(columns, schema=LINE_ITEM_SCHEMA)
+
+
+class _ChunkSink:
+    """Write-only stream handing written bytes over to the response.
+
+    ``tell`` reports the total written so the footer offsets stay correct
+    after chunks have been drained.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
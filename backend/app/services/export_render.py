@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from xlsxwriter import Workbook
+
+if TYPE_CHECKING:
+    from app.core.inputs import InfrastructureInput
+    from app.core.line_items import LineItem
+
+
+CSV_CHUNK_ROWS = 500
+XLSX_READ_CHUNK_BYTES = 256 * 1024
+
+
+@dataclass(frozen=True)
+class WorkRow:
+    """Work row for export."""
+
+    module_name: str
+    role: str
+    level: str
+    hours: float
+    rate: float
+    cost: float
+
+
+@dataclass(frozen=True)
+class InfraRow:
+    """Infrastructure row for export."""
+
+    name: str
+    quantity: int
+    unit_cost: float
+    total_cost: float
+
+
+def render_pdf(work_rows: list[WorkRow], infra_rows: list[InfraRow]) -> bytes:
+    """Render the project export PDF; runs inside render pool workers."""
+
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=24, leftMargin=24, topMargin=24, bottomMargin=24)
+    elements = []
+
+    elements.append(Paragraph("Экспорт оценки проекта", styles["Title"]))
+    elements.append(Spacer(1, 12))
+
+    work_table = _build_work_table(work_rows)
+    elements.append(Paragraph("Работы", styles["Heading2"]))
+    elements.append(work_table)
+    elements.append(Spacer(1, 16))
+
+    infra_table = _build_infra_table(infra_rows)
+    elements.append(Paragraph("Инфраструктура", styles["Heading2"]))
+    elements.append(infra_table)
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def format_number(value: float) -> str:
+    """Format a money or hours value for reports."""
+
+    return f"{value:.2f}"
+
+
+def iter_csv(work_rows: Iterable[WorkRow], infra_rows: Iterable[InfraRow]) -> Iterator[str]:
+    """Yield the project export CSV in chunks of CSV_CHUNK_ROWS rows."""
+
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=";")
+
+    writer.writerow(["Работы"])
+    writer.writerow(["Модуль", "Роль", "Уровень", "Часы", "Ставка", "Стоимость"])
+    yield _drain(output)
+    for index, row in enumerate(work_rows, start=1):
+        writer.writerow(
+            [
+                row.module_name,
+                row.role,
+                row.level,
+                format_number(row.hours),
+                format_number(row.rate),
+                format_number(row.cost),
+            ]
+        )
+        if index % CSV_CHUNK_ROWS == 0:
+            yield _drain(output)
+
+    writer.writerow([])
+    writer.writerow(["Инфраструктура"])
+    writer.writerow(["Элемент", "Количество", "Стоимость/ед.", "Итого"])
+    for index, row in enumerate(infra_rows, start=1):
+        writer.writerow(
+            [
+                row.name,
+                row.quantity,
+                format_number(row.unit_cost),
+                format_number(row.total_cost),
+            ]
+        )
+        if index % CSV_CHUNK_ROWS == 0:
+            yield _drain(output)
+
+    yield _drain(output)
+
+
+def iter_xlsx(work_rows: Iterable[WorkRow], infra_rows: Iterable[InfraRow]) -> Iterator[bytes]:
+    """Write the project export workbook row by row and yield the file in chunks.
+
+    The workbook runs in xlsxwriter's constant memory mode, flushing each row
+    to a temporary file, so memory does not grow with the number of rows.
+    """
+
+    handle, temp_name = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    try:
+        workbook = Workbook(temp_name, {"constant_memory": True, "tmpdir": tempfile.gettempdir()})
+        header = workbook.add_format({"bold": True, "bg_color": "#D3D3D3", "border": 1})
+        number = workbook.add_format({"num_format": "#,##0.00"})
+
+        work_sheet = workbook.add_worksheet("Работы")
+        work_sheet.set_column(0, 0, 40)
+        work_sheet.set_column(1, 2, 12)
+        work_sheet.set_column(3, 5, 14, number)
+        work_sheet.write_row(0, 0, ["Модуль", "Роль", "Уровень", "Часы", "Ставка", "Стоимость"], header)
+        for index, row in enumerate(work_rows, start=1):
+            work_sheet.write_string(index, 0, row.module_name)
+            work_sheet.write_string(index, 1, row.role)
+            work_sheet.write_string(index, 2, row.level)
+            work_sheet.write_number(index, 3, row.hours, number)
+            work_sheet.write_number(index, 4, row.rate, number)
+            work_sheet.write_number(index, 5, row.cost, number)
+
+        infra_sheet = workbook.add_worksheet("Инфраструктура")
+        infra_sheet.set_column(0, 0, 40)
+        infra_sheet.set_column(1, 1, 12)
+        infra_sheet.set_column(2, 3, 16, number)
+        infra_sheet.write_row(0, 0, ["Элемент", "Количество", "Стоимость/ед.", "Итого"], header)
+        for index, row in enumerate(infra_rows, start=1):
+            infra_sheet.write_string(index, 0, row.name)
+            infra_sheet.write_number(index, 1, row.quantity)
+            infra_sheet.write_number(index, 2, row.unit_cost, number)
+            infra_sheet.write_number(index, 3, row.total_cost, number)
+
+        workbook.close()
+        with open(temp_name, "rb") as file:
+            while chunk := file.read(XLSX_READ_CHUNK_BYTES):
+                yield chunk
+    finally:
+        os.unlink(temp_name)
+
+
+def build_work_rows(line_items: Iterable[LineItem]) -> Iterator[WorkRow]:
+    """Convert estimation line items into export work rows."""
+
+    for item in line_items:
+        yield WorkRow(
+            module_name=item.name,
+            role=item.role,
+            level=item.level,
+            hours=item.hours,
+            rate=item.rate,
+            cost=item.cost,
+        )
+
+
+def build_infra_rows(items: Iterable[InfrastructureInput]) -> Iterator[InfraRow]:
+    """Convert project infrastructure into export rows."""
+
+    for item in items:
+        yield InfraRow(
+            name=item.name,
+            quantity=item.quantity,
+            unit_cost=item.unit_cost,
+            total_cost=item.unit_cost * item.quantity,
+        )
+
+
+def _build_work_table(rows: list[WorkRow]) -> Table:
+    table_data = [["Модуль", "Роль", "Уровень", "Часы", "Ставка", "Стоимость"]]
+    for row in rows:
+        table_data.append(
+            [
+                row.module_name,
+                row.role,
+                row.level,
+                format_number(row.hours),
+                format_number(row.rate),
+                format_number(row.cost),
+            ]
+        )
+    table = Table(table_data, colWidths=[160, 60, 70, 55, 65, 70])
+    _apply_table_style(table)
+    return table
+
+
+def _build_infra_table(rows: list[InfraRow]) -> Table:
+    table_data = [["Элемент", "Количество", "Стоимость/ед.", "Итого"]]
+    for row in rows:
+        table_data.append(
+            [
+                row.name,
+                str(row.quantity),
+                format_number(row.unit_cost),
+                format_number(row.total_cost),
+            ]
+        )
+    table = Table(table_data, colWidths=[210, 80, 100, 80])
+    _apply_table_style(table)
+    return table
+
+
+def _apply_table_style(table: Table) -> None:
+    table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+    )
+
+
+def _drain(output: io.StringIO) -> str:
+    chunk = output.getvalue()
+    output.seek(0)
+    output.truncate()
+    return chunk
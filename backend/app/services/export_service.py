@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.services.export_cache import export_cache, export_cache_key, iter_file_chunks
+from app.services.export_render import (
+    InfraRow,
+    WorkRow,
+    build_infra_rows,
+    build_work_rows,
+    iter_csv,
+    iter_xlsx,
+    render_pdf,
+)
+from app.services.export_parquet import iter_line_items_parquet
+from app.services.metrics import EXPORT_RENDER_SECONDS
+from app.services.render_pool import render_pool
+from app.services.summary_service import build_project_estimate, stream_project_estimate
+
+
+@dataclass(frozen=True)
+class ExportRows:
+    """Materialized rows of a project export."""
+
+    work: list[WorkRow]
+    infra: list[InfraRow]
+
+
+def collect_export_rows(session: Session, project_id: int) -> ExportRows:
+    """Return export rows of a project from its cached line items."""
+
+    estimate = build_project_estimate(session, project_id)
+    return ExportRows(
+        work=list(build_work_rows(estimate.line_items)),
+        infra=list(build_infra_rows(estimate.infrastructure)),
+    )
+
+
+def iter_project_csv(session: Session, project_id: int) -> Iterator[str]:
+    """Yield project export CSV chunks without materializing all rows."""
+
+    estimate = stream_project_estimate(session, project_id)
+    yield from _timed_chunks(
+        "csv",
+        iter_csv(build_work_rows(estimate.line_items), build_infra_rows(estimate.infrastructure)),
+    )
+
+
+def iter_project_xlsx(session: Session, project_id: int) -> Iterator[bytes]:
+    """Yield the project export workbook, written row by row."""
+
+    estimate = stream_project_estimate(session, project_id)
+    yield from _timed_chunks(
+        "xlsx",
+        iter_xlsx(build_work_rows(estimate.line_items), build_infra_rows(estimate.infrastructure)),
+    )
+
+
+def iter_project_parquet(session: Session, project_id: int) -> Iterator[bytes]:
+    """Yield a Parquet file of the project's line items."""
+
+    estimate = stream_project_estimate(session, project_id)
+    yield from _timed_chunks("parquet", iter_line_items_parquet([(project_id, estimate.line_items)]))
+
+
+def iter_portfolio_parquet(session: Session, project_ids: list[int]) -> Iterator[bytes]:
+    """Yield one Parquet file with line items of several projects, in order."""
+
+    yield from _timed_chunks(
+        "parquet",
+        iter_line_items_parquet(
+            (project_id, stream_project_estimate(session, project_id).line_items)
+            for project_id in project_ids
+        ),
+    )
+
+
+def iter_project_export(
+    session: Session,
+    project_id: int,
+    export_format: str,
+    progress: Callable[[float], None] | None = None,
+) -> Iterator[bytes]:
+    """Yield a cached export, or render it chunk by chunk into the export cache.
+
+    Meant for background threads with a snapshot session. With a progress
+    callback the work rows are loaded up front and the fraction written so
+    far is reported as rows are rendered; a PDF reports nothing until it is
+    complete. Raises NoResultFound for unknown projects.
+    """
+
+    key = export_cache_key(session, project_id, export_format)
+    cached = export_cache.open(key)
+    if cached is not None:
+        yield from iter_file_chunks(cached)
+        return
+    if export_format == "pdf":
+        rows = collect_export_rows(session, project_id)
+        with EXPORT_RENDER_SECONDS.time(format="pdf"):
+            content = render_pool.call(render_pdf, rows.work, rows.infra)
+        export_cache.put(key, content)
+        yield content
+        return
+    render = iter_csv if export_format == "csv" else iter_xlsx
+    if progress is None:
+        estimate = stream_project_estimate(session, project_id)
+        work_rows = build_work_rows(estimate.line_items)
+        infra_rows = build_infra_rows(estimate.infrastructure)
+    else:
+        rows = collect_export_rows(session, project_id)
+        work_rows = _reporting_rows(rows.work, progress)
+        infra_rows = iter(rows.infra)
+    yield from export_cache.tee(key, _timed_chunks(export_format, render(work_rows, infra_rows)))
+
+
+def _reporting_rows(rows: list[WorkRow], progress: Callable[[float], None]) -> Iterator[WorkRow]:
+    total = len(rows)
+    for index, row in enumerate(rows, start=1):
+        yield row
+        progress(index / total)
+
+
+def _timed_chunks(export_format: str, chunks: Iterable[str | bytes]) -> Iterator[str | bytes]:
+    """Pass chunks through, observing only the time spent producing them."""
+
+    elapsed = 0.0
+    iterator = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            break
+        finally:
+            elapsed += time.perf_counter() - started
+        yield chunk
+    EXPORT_RENDER_SECONDS.observe(elapsed, format=export_format)
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+    from app.services.summary_cache import SummaryCache
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _render_labels(self, key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+        pairs = [*zip(self.label_names, key), *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._render_samples()
+
+    def _render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._render_labels(key)} {_format(value)}"
+
+
+class Gauge(_Metric):
+    """Value that goes up and down per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the gauge."""
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the gauge."""
+
+        self.inc(-amount, **labels)
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._render_labels(key)} {_format(value)}"
+
+
+class CallbackMetric(_Metric):
+    """Unlabelled gauge or counter read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, read: Callable[[], float | None]) -> None:
+        super().__init__(name, documentation, ())
+        self.kind = kind
+        self._read = read
+
+    def _render_samples(self) -> Iterator[str]:
+        value = self._read()
+        if value is not None:
+            yield f"{self.name} {_format(value)}"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._buckets = tuple(sorted(buckets))
+        self._series: dict[LabelKey, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+
+        key = self._key(labels)
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self._buckets) + 1)
+            series.counts[index] += 1
+            series.total += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = sorted((key, list(series.counts), series.total) for key, series in self._series.items())
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self._buckets, float("inf")), counts):
+                cumulative += count
+                labels = self._render_labels(key, (("le", _format(bound)),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._render_labels(key)} {_format(total)}"
+            yield f"{self.name}_count{self._render_labels(key)} {cumulative}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class MetricsRegistry:
+    """In-process collection of metrics rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        """Register a counter."""
+
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        """Register a gauge."""
+
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register a histogram."""
+
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], float | None],
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        """Register a metric whose value is read at scrape time; None skips the sample."""
+
+        return self._register(CallbackMetric(name, documentation, kind, read))
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+
+def register_pool_metrics(engine: Engine) -> None:
+    """Expose connection pool usage of the engine, when its pool is a QueuePool."""
+
+    pool = engine.pool
+    if not all(hasattr(pool, name) for name in ("size", "checkedout", "overflow")):
+        return
+    metrics_registry.callback("db_pool_size", "Configured number of pooled connections.", pool.size)
+    metrics_registry.callback("db_pool_checked_out", "Connections currently checked out of the pool.", pool.checkedout)
+    # QueuePool counts overflow up from -pool_size.
+    metrics_registry.callback(
+        "db_pool_overflow", "Connections open beyond pool_size.", lambda: max(pool.overflow(), 0)
+    )
+
+
+def register_summary_cache_metrics(cache: SummaryCache) -> None:
+    """Expose summary cache counters and hit ratio."""
+
+    metrics_registry.callback("summary_cache_hits_total", "Summary cache hits.", lambda: cache.stats().hits, "counter")
+    metrics_registry.callback(
+        "summary_cache_misses_total", "Summary cache misses.", lambda: cache.stats().misses, "counter"
+    )
+    metrics_registry.callback("summary_cache_size", "Cached project summaries.", lambda: cache.stats().size)
+    metrics_registry.callback(
+        "summary_cache_hit_ratio", "Share of summary lookups served from cache.", lambda: cache.stats().hit_ratio
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, until the body is sent.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+OPENAI_REQUEST_SECONDS = metrics_registry.histogram(
+    "openai_request_duration_seconds",
+    "OpenAI API call latency.",
+    ("api", "outcome"),
+)
+OPENAI_FALLBACKS = metrics_registry.counter(
+    "openai_fallbacks_total",
+    "Prompt parses that fell back from the OpenAI chat API.",
+    ("target",),
+)
+EXPORT_RENDER_SECONDS = metrics_registry.histogram(
+    "export_render_duration_seconds",
+    "Time spent rendering project exports, excluding cache hits.",
+    ("format",),
+)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+FrameKey = tuple[str, int, str]
+
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("selectors.py", "poll"),
+}
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already being recorded."""
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    """Stacks sampled during one profiling session, root frame first."""
+
+    stacks: Counter[tuple[FrameKey, ...]]
+    interval: float
+    duration: float
+    requests: int
+
+
+class ProfileSession:
+    """Sampling profiler over all threads of the process.
+
+    A background thread snapshots ``sys._current_frames()`` every
+    ``interval`` seconds, so request handlers running in the threadpool and
+    on the event loop are covered alike. Idle threads are skipped.
+    """
+
+    def __init__(self, interval: float, request_limit: int | None = None) -> None:
+        self.interval = interval
+        self.request_limit = request_limit
+        self.requests = 0
+        self.completed = threading.Event()
+        self._stacks: Counter[tuple[FrameKey, ...]] = Counter()
+        self._stop = threading.Event()
+        self._started = 0.0
+        self._duration = 0.0
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        """Stop sampling and return the collected stacks."""
+
+        self._stop.set()
+        self._thread.join()
+        self._duration = time.perf_counter() - self._started
+        return ProfileResult(
+            stacks=self._stacks,
+            interval=self.interval,
+            duration=self._duration,
+            requests=self.requests,
+        )
+
+    def request_finished(self) -> None:
+        """Count a finished request; completes the session at the request limit."""
+
+        self.requests += 1
+        if self.request_limit is not None and self.requests >= self.request_limit:
+            self.completed.set()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _stack(frame)
+                if stack:
+                    self._stacks[stack] += 1
+
+
+_lock = threading.Lock()
+_active: ProfileSession | None = None
+
+
+def start_profile(interval: float, request_limit: int | None = None) -> ProfileSession:
+    """Start the process-wide profiling session, or raise ProfilerBusy."""
+
+    global _active
+    with _lock:
+        if _active is not None:
+            raise ProfilerBusy()
+        session = ProfileSession(interval, request_limit)
+        session.start()
+        _active = session
+    return session
+
+
+def finish_profile(session: ProfileSession) -> ProfileResult:
+    """Stop a session started with start_profile and return its result."""
+
+    global _active
+    result = session.stop()
+    with _lock:
+        if _active is session:
+            _active = None
+    return result
+
+
+def note_request_finished() -> None:
+    """Tell the active session, if any, that a request has finished."""
+
+    session = _active
+    if session is not None:
+        session.request_finished()
+
+
+def to_collapsed(result: ProfileResult) -> str:
+    """Render stacks in the collapsed format read by flamegraph.pl and speedscope."""
+
+    lines = [
+        ";".join(_frame_label(frame) for frame in stack) + f" {count}"
+        for stack, count in sorted(result.stacks.items())
+    ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def to_pstats(result: ProfileResult) -> bytes:
+    """Render samples as a marshalled pstats dump.
+
+    Times are sample counts multiplied by the interval and call counts are
+    sample counts, so the dump loads in pstats, snakeviz and similar tools
+    but shows estimates rather than exact timings.
+    """
+
+    self_samples: Counter[FrameKey] = Counter()
+    total_samples: Counter[FrameKey] = Counter()
+    callers: dict[FrameKey, Counter[FrameKey]] = {}
+    for stack, count in result.stacks.items():
+        self_samples[stack[-1]] += count
+        for frame in set(stack):
+            total_samples[frame] += count
+        for caller, callee in set(zip(stack, stack[1:])):
+            callers.setdefault(callee, Counter())[caller] += count
+
+    interval = result.interval
+    stats = {}
+    for frame, total in total_samples.items():
+        own = self_samples.get(frame, 0)
+        stats[frame] = (
+            total,
+            total,
+            own * interval,
+            total * interval,
+            {
+                caller: (count, count, 0.0, count * interval)
+                for caller, count in callers.get(frame, {}).items()
+            },
+        )
+    return marshal.dumps(stats)
+
+
+def _stack(frame) -> tuple[FrameKey, ...]:
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+        return ()
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def _frame_label(frame: FrameKey) -> str:
+    filename, line, name = frame
+    return f"{name} ({filename}:{line})"
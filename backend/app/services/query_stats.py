@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STATEMENT_PREVIEW_CHARS = 200
+_START_TIMES_KEY = "query_stats_started"
+
+
+@dataclass
+class QueryStats:
+    """Database statements executed while handling one request."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str = ""
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Account one executed statement."""
+
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = " ".join(statement.split())[:_STATEMENT_PREVIEW_CHARS]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context, including threadpool calls made from it."""
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Time every cursor execution on the engine into the active QueryStats."""
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def server_timing_header(stats: QueryStats, total_seconds: float) -> str:
+    """Return a Server-Timing header value for a request."""
+
+    return (
+        f'db;desc="{stats.count} queries";dur={stats.total_seconds * 1000:.1f}, '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}, "
+        f"app;dur={total_seconds * 1000:.1f}"
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get(_START_TIMES_KEY)
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from app.core.config import settings
+
+
+class RenderPoolBusy(Exception):
+    """Raised when the render queue is full."""
+
+
+class RenderPool:
+    """Bounded process pool for CPU-heavy export rendering.
+
+    At most ``queue_depth`` jobs may be running or waiting at a time; further
+    submissions are rejected instead of piling up behind slow renders.
+    Workers are spawned lazily on first use.
+    """
+
+    def __init__(self, workers: int, queue_depth: int) -> None:
+        self._workers = workers
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Queue a picklable call, or raise RenderPoolBusy when saturated."""
+
+        if not self._slots.acquire(blocking=False):
+            raise RenderPoolBusy()
+        return self._submit_with_slot(func, args)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a call in the pool and await its result."""
+
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a call from a background thread, waiting for a free slot instead of failing."""
+
+        self._slots.acquire()
+        return self._submit_with_slot(func, args).result()
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _submit_with_slot(self, func: Callable[..., Any], args: tuple[Any, ...]) -> Future:
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+render_pool = RenderPool(settings.render_pool_workers, settings.render_queue_depth)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models import Project, ProjectModule
+
+
+def bump_project_revision(session: Session, project_id: int) -> int:
+    """Increment project revision and return the new value."""
+
+    result = session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(revision=Project.revision + 1)
+        .returning(Project.revision)
+    )
+    return result.scalar_one()
+
+
+def bump_projects_using_module(session: Session, module_id: int) -> None:
+    """Increment revisions of projects that include a catalog module."""
+
+    session.execute(
+        update(Project)
+        .where(
+            Project.id.in_(
+                select(ProjectModule.project_id).where(ProjectModule.module_id == module_id)
+            )
+        )
+        .values(revision=Project.revision + 1)
+    )
+
+
+def bump_all_project_revisions(session: Session) -> None:
+    """Increment revisions of every project (global invalidation)."""
+
+    session.execute(update(Project).values(revision=Project.revision + 1))
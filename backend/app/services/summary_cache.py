@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.summary_service import SummaryState
+
+
+@dataclass(frozen=True)
+class SummaryCacheStats:
+    """Snapshot of summary cache counters."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    deltas: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return share of lookups served from cache."""
+
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
+
+
+class SummaryCache:
+    """Bounded LRU cache of project summary states keyed by project revision."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[int, tuple[int, SummaryState]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._deltas = 0
+
+    def get(self, project_id: int, revision: int) -> SummaryState | None:
+        """Return cached state if it matches the current revision."""
+
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[0] != revision:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(project_id)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, project_id: int, revision: int, state: SummaryState) -> None:
+        """Store state for a project revision."""
+
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[project_id] = (revision, state)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def update(
+        self,
+        project_id: int,
+        revision: int,
+        updater: Callable[[SummaryState], SummaryState],
+    ) -> bool:
+        """Advance a cached state from the previous revision to the given one.
+
+        The updater runs only when the cached entry is exactly one revision
+        behind, otherwise the entry is dropped and the next read recomputes.
+        It must return a new state: readers may still hold the cached one.
+        """
+
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                return False
+            cached_revision, state = entry
+            if cached_revision != revision - 1:
+                del self._entries[project_id]
+                return False
+            self._entries[project_id] = (revision, updater(state))
+            self._deltas += 1
+            return True
+
+    def invalidate(self, project_id: int) -> None:
+        """Drop cached summary for a project."""
+
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached summaries."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> SummaryCacheStats:
+        """Return current cache counters."""
+
+        with self._lock:
+            return SummaryCacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                deltas=self._deltas,
+            )
+
+
+summary_cache = SummaryCache(settings.summary_cache_size)
@@ -0,0 +1,499 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+
+from sqlalchemy import Boolean, Float, Integer, String, cast, literal_column, null, select, true, union_all
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, CompoundSelect, Select
+
+from app.core.inputs import (
+    CoefficientInput,
+    EstimationInputs,
+    InfrastructureInput,
+    ModuleInput,
+    ProjectInput,
+    ProjectModuleInput,
+    ProjectNodeInput,
+    RoleHoursInput,
+)
+from app.models import (
+    Assignment,
+    InfrastructureItem,
+    Module,
+    ModuleRoleHours,
+    Project,
+    ProjectCoefficient,
+    ProjectInfrastructure,
+    ProjectModule,
+    ProjectNode,
+    ProjectNodeRoleHours,
+    Rate,
+)
+
+
+KIND_RATE = 0
+KIND_PROJECT = 1
+KIND_COEFFICIENT = 2
+KIND_ASSIGNMENT = 3
+KIND_MODULE = 4
+KIND_MODULE_ROLE = 5
+KIND_NODE = 6
+KIND_NODE_ROLE = 7
+KIND_INFRA = 8
+
+_COLUMN_TYPES = {
+    "project_id": Integer,
+    "kind": Integer,
+    "item_id": Integer,
+    "owner_id": Integer,
+    "text_a": String,
+    "text_b": String,
+    "text_c": String,
+    "num_a": Float,
+    "num_b": Float,
+    "num_c": Float,
+    "num_d": Float,
+    "num_e": Float,
+    "num_f": Float,
+    "flag": Boolean,
+}
+
+
+def load_estimation_inputs(session: Session, project_id: int) -> EstimationInputs:
+    """Load everything a project summary needs in a single round trip."""
+
+    inputs = load_inputs_for_projects(session, [project_id])
+    if project_id not in inputs:
+        raise NoResultFound(f"Project {project_id} not found")
+    return inputs[project_id]
+
+
+def load_inputs_for_projects(
+    session: Session,
+    project_ids: list[int] | None,
+) -> dict[int, EstimationInputs]:
+    """Load summary inputs for many projects, or all projects when ids are None."""
+
+    rows = session.execute(_build_inputs_query(project_ids))
+    return _assemble_inputs(rows)
+
+
+def load_project_context(session: Session, project_id: int) -> EstimationInputs:
+    """Load project settings, rates, coefficients and assignments without items."""
+
+    rows = session.execute(
+        union_all(
+            _rate_rows(),
+            _project_rows([project_id]),
+            _coefficient_rows([project_id]),
+            _assignment_rows([project_id]),
+        )
+    )
+    inputs = _assemble_inputs(rows)
+    if project_id not in inputs:
+        raise NoResultFound(f"Project {project_id} not found")
+    return inputs[project_id]
+
+
+def iter_project_module_inputs(
+    session: Session,
+    project_id: int,
+    batch_size: int,
+) -> Iterator[ProjectModuleInput]:
+    """Stream project modules ordered by id through server-side cursors."""
+
+    module_rows = _stream_rows(
+        session,
+        _module_rows([project_id]).order_by(ProjectModule.id),
+        batch_size,
+    )
+    role_rows = _stream_rows(
+        session,
+        _module_role_rows([project_id]).order_by(ProjectModule.id, ModuleRoleHours.id),
+        batch_size,
+    )
+    return _merge_role_hours(module_rows, role_rows, _project_module_input)
+
+
+def iter_project_node_inputs(
+    session: Session,
+    project_id: int,
+    batch_size: int,
+) -> Iterator[ProjectNodeInput]:
+    """Stream mindmap nodes ordered by id through server-side cursors."""
+
+    node_rows = _stream_rows(
+        session,
+        _node_rows([project_id]).order_by(ProjectNode.id),
+        batch_size,
+    )
+    role_rows = _stream_rows(
+        session,
+        _node_role_rows([project_id]).order_by(ProjectNodeRoleHours.node_id, ProjectNodeRoleHours.id),
+        batch_size,
+    )
+    return _merge_role_hours(node_rows, role_rows, _project_node_input)
+
+
+def iter_project_infrastructure(
+    session: Session,
+    project_id: int,
+    batch_size: int,
+) -> Iterator[InfrastructureInput]:
+    """Stream project infrastructure ordered by id through a server-side cursor."""
+
+    rows = _stream_rows(
+        session,
+        _infrastructure_rows([project_id]).order_by(ProjectInfrastructure.id),
+        batch_size,
+    )
+    for row in rows:
+        yield _infrastructure_input(row)
+
+
+def load_project_module_input(
+    session: Session,
+    project_module_id: int,
+) -> ProjectModuleInput | None:
+    """Load a single project module with catalog role hours in one round trip."""
+
+    rows = list(
+        session.execute(
+            union_all(
+                _module_rows(None).where(ProjectModule.id == project_module_id),
+                _module_role_rows(None).where(ProjectModule.id == project_module_id),
+            )
+        )
+    )
+    role_hours = _role_hours([row for row in rows if row.kind == KIND_MODULE_ROLE])
+    for row in rows:
+        if row.kind == KIND_MODULE:
+            return _project_module_input(row, role_hours)
+    return None
+
+
+def load_project_node_input(session: Session, node_id: int) -> ProjectNodeInput | None:
+    """Load a single mindmap node with role hours in one round trip."""
+
+    rows = list(
+        session.execute(
+            union_all(
+                _node_rows(None).where(ProjectNode.id == node_id),
+                _node_role_rows(None).where(ProjectNode.id == node_id),
+            )
+        )
+    )
+    role_hours = _role_hours([row for row in rows if row.kind == KIND_NODE_ROLE])
+    for row in rows:
+        if row.kind == KIND_NODE:
+            return _project_node_input(row, role_hours)
+    return None
+
+
+def _build_inputs_query(project_ids: list[int] | None) -> CompoundSelect:
+    """Build a UNION ALL query returning every summary input row."""
+
+    return union_all(
+        _rate_rows(),
+        _project_rows(project_ids),
+        _coefficient_rows(project_ids),
+        _assignment_rows(project_ids),
+        _module_rows(project_ids),
+        _module_role_rows(project_ids),
+        _node_rows(project_ids),
+        _node_role_rows(project_ids),
+        _infrastructure_rows(project_ids),
+    )
+
+
+def _assemble_inputs(rows: Iterable) -> dict[int, EstimationInputs]:
+    """Group raw union rows into per-project estimation inputs."""
+
+    rates: dict[tuple[str, str], float] = {}
+    projects: dict[int, ProjectInput] = {}
+    coefficients: dict[int, list[CoefficientInput]] = defaultdict(list)
+    assignments: dict[int, dict[tuple[int, str], str]] = defaultdict(dict)
+    modules: dict[int, list] = defaultdict(list)
+    nodes: dict[int, list] = defaultdict(list)
+    module_roles: dict[int, list] = defaultdict(list)
+    node_roles: dict[int, list] = defaultdict(list)
+    infrastructure: dict[int, list] = defaultdict(list)
+
+    for row in rows:
+        kind = row.kind
+        if kind == KIND_RATE:
+            rates[(row.text_a, row.text_b)] = row.num_a
+        elif kind == KIND_PROJECT:
+            projects[row.project_id] = ProjectInput(
+                id=row.project_id,
+                revision=row.owner_id,
+                uncertainty_level=row.text_a,
+                uiux_level=row.text_b,
+                legacy_code=bool(row.flag),
+            )
+        elif kind == KIND_COEFFICIENT:
+            coefficients[row.project_id].append(
+                CoefficientInput(name=row.text_c, multiplier=row.num_a)
+            )
+        elif kind == KIND_ASSIGNMENT:
+            assignments[row.project_id][(row.owner_id, row.text_a)] = row.text_b
+        elif kind == KIND_MODULE:
+            modules[row.project_id].append(row)
+        elif kind == KIND_MODULE_ROLE:
+            module_roles[row.owner_id].append(row)
+        elif kind == KIND_NODE:
+            nodes[row.project_id].append(row)
+        elif kind == KIND_NODE_ROLE:
+            node_roles[row.owner_id].append(row)
+        elif kind == KIND_INFRA:
+            infrastructure[row.project_id].append(row)
+
+    inputs: dict[int, EstimationInputs] = {}
+    for project_id, project in projects.items():
+        inputs[project_id] = EstimationInputs(
+            project=project,
+            project_modules=[
+                _project_module_input(row, _role_hours(module_roles.get(row.item_id, [])))
+                for row in sorted(modules.get(project_id, []), key=lambda item: item.item_id)
+            ],
+            project_nodes=[
+                _project_node_input(row, _role_hours(node_roles.get(row.item_id, [])))
+                for row in sorted(nodes.get(project_id, []), key=lambda item: item.item_id)
+            ],
+            assignments=assignments.get(project_id, {}),
+            rates=rates,
+            coefficients=coefficients.get(project_id, []),
+            infrastructure=[
+                _infrastructure_input(row)
+                for row in sorted(infrastructure.get(project_id, []), key=lambda item: item.item_id)
+            ],
+        )
+    return inputs
+
+
+def _stream_rows(session: Session, statement: Select, batch_size: int) -> Iterator:
+    return iter(session.execute(statement, execution_options={"yield_per": batch_size}))
+
+
+def _merge_role_hours(
+    item_rows: Iterator,
+    role_rows: Iterator,
+    build: Callable,
+) -> Iterator:
+    """Attach role rows to item rows; both streams are sorted by item id."""
+
+    pending = next(role_rows, None)
+    for row in item_rows:
+        while pending is not None and pending.owner_id < row.item_id:
+            pending = next(role_rows, None)
+        role_hours = []
+        while pending is not None and pending.owner_id == row.item_id:
+            role_hours.append(RoleHoursInput(role=pending.text_a, hours=pending.num_a))
+            pending = next(role_rows, None)
+        yield build(row, role_hours)
+
+
+def _infrastructure_input(row) -> InfrastructureInput:
+    return InfrastructureInput(
+        name=row.text_c,
+        quantity=int(row.num_a),
+        unit_cost=row.num_b,
+    )
+
+
+def _role_hours(rows: list) -> list[RoleHoursInput]:
+    return [
+        RoleHoursInput(role=row.text_a, hours=row.num_a)
+        for row in sorted(rows, key=lambda item: item.item_id)
+    ]
+
+
+def _project_module_input(row, role_hours: list[RoleHoursInput]) -> ProjectModuleInput:
+    return ProjectModuleInput(
+        id=row.item_id,
+        override_frontend=row.num_d,
+        override_backend=row.num_e,
+        override_qa=row.num_f,
+        uncertainty_level=row.text_a,
+        uiux_level=row.text_b,
+        legacy_code=row.flag,
+        module=ModuleInput(
+            id=row.owner_id,
+            name=row.text_c,
+            hours_frontend=row.num_a,
+            hours_backend=row.num_b,
+            hours_qa=row.num_c,
+            role_hours=role_hours,
+        ),
+    )
+
+
+def _project_node_input(row, role_hours: list[RoleHoursInput]) -> ProjectNodeInput:
+    return ProjectNodeInput(
+        id=row.item_id,
+        title=row.text_c,
+        hours_frontend=row.num_a,
+        hours_backend=row.num_b,
+        hours_qa=row.num_c,
+        uncertainty_level=row.text_a,
+        uiux_level=row.text_b,
+        legacy_code=row.flag,
+        role_hours=role_hours,
+    )
+
+
+def _select_row(kind: int, **values: ColumnElement | None) -> Select:
+    """Build one union branch with every column present and typed."""
+
+    columns = []
+    for name, column_type in _COLUMN_TYPES.items():
+        if name == "kind":
+            value = literal_column(str(kind), Integer)
+        else:
+            value = values.get(name)
+            if value is None:
+                value = cast(null(), column_type)
+        columns.append(value.label(name))
+    return select(*columns)
+
+
+def _project_filter(column: ColumnElement, project_ids: list[int] | None) -> ColumnElement:
+    if project_ids is None:
+        return true()
+    return column.in_(project_ids)
+
+
+def _rate_rows() -> Select:
+    return _select_row(
+        KIND_RATE,
+        item_id=Rate.id,
+        text_a=Rate.role,
+        text_b=Rate.level,
+        num_a=Rate.hourly_rate,
+    )
+
+
+def _project_rows(project_ids: list[int] | None) -> Select:
+    return _select_row(
+        KIND_PROJECT,
+        project_id=Project.id,
+        item_id=Project.id,
+        owner_id=Project.revision,
+        text_a=Project.uncertainty_level,
+        text_b=Project.uiux_level,
+        flag=Project.legacy_code,
+    ).where(_project_filter(Project.id, project_ids))
+
+
+def _coefficient_rows(project_ids: list[int] | None) -> Select:
+    return _select_row(
+        KIND_COEFFICIENT,
+        project_id=ProjectCoefficient.project_id,
+        item_id=ProjectCoefficient.id,
+        text_c=ProjectCoefficient.name,
+        num_a=ProjectCoefficient.multiplier,
+    ).where(_project_filter(ProjectCoefficient.project_id, project_ids))
+
+
+def _assignment_rows(project_ids: list[int] | None) -> Select:
+    return _select_row(
+        KIND_ASSIGNMENT,
+        project_id=Assignment.project_id,
+        item_id=Assignment.id,
+        owner_id=Assignment.project_module_id,
+        text_a=Assignment.role,
+        text_b=Assignment.level,
+    ).where(_project_filter(Assignment.project_id, project_ids))
+
+
+def _module_rows(project_ids: list[int] | None) -> Select:
+    return (
+        _select_row(
+            KIND_MODULE,
+            project_id=ProjectModule.project_id,
+            item_id=ProjectModule.id,
+            owner_id=Module.id,
+            text_a=ProjectModule.uncertainty_level,
+            text_b=ProjectModule.uiux_level,
+            text_c=Module.name,
+            num_a=Module.hours_frontend,
+            num_b=Module.hours_backend,
+            num_c=Module.hours_qa,
+            num_d=ProjectModule.override_frontend,
+            num_e=ProjectModule.override_backend,
+            num_f=ProjectModule.override_qa,
+            flag=ProjectModule.legacy_code,
+        )
+        .select_from(ProjectModule)
+        .join(Module, Module.id == ProjectModule.module_id)
+        .where(_project_filter(ProjectModule.project_id, project_ids))
+    )
+
+
+def _module_role_rows(project_ids: list[int] | None) -> Select:
+    return (
+        _select_row(
+            KIND_MODULE_ROLE,
+            project_id=ProjectModule.project_id,
+            item_id=ModuleRoleHours.id,
+            owner_id=ProjectModule.id,
+            text_a=ModuleRoleHours.role,
+            num_a=ModuleRoleHours.hours,
+        )
+        .select_from(ProjectModule)
+        .join(ModuleRoleHours, ModuleRoleHours.module_id == ProjectModule.module_id)
+        .where(_project_filter(ProjectModule.project_id, project_ids))
+    )
+
+
+def _node_rows(project_ids: list[int] | None) -> Select:
+    return _select_row(
+        KIND_NODE,
+        project_id=ProjectNode.project_id,
+        item_id=ProjectNode.id,
+        text_a=ProjectNode.uncertainty_level,
+        text_b=ProjectNode.uiux_level,
+        text_c=ProjectNode.title,
+        num_a=ProjectNode.hours_frontend,
+        num_b=ProjectNode.hours_backend,
+        num_c=ProjectNode.hours_qa,
+        flag=ProjectNode.legacy_code,
+    ).where(_project_filter(ProjectNode.project_id, project_ids))
+
+
+def _node_role_rows(project_ids: list[int] | None) -> Select:
+    return (
+        _select_row(
+            KIND_NODE_ROLE,
+            project_id=ProjectNode.project_id,
+            item_id=ProjectNodeRoleHours.id,
+            owner_id=ProjectNode.id,
+            text_a=ProjectNodeRoleHours.role,
+            num_a=ProjectNodeRoleHours.hours,
+        )
+        .select_from(ProjectNodeRoleHours)
+        .join(ProjectNode, ProjectNode.id == ProjectNodeRoleHours.node_id)
+        .where(_project_filter(ProjectNode.project_id, project_ids))
+    )
+
+
+def _infrastructure_rows(project_ids: list[int] | None) -> Select:
+    return (
+        _select_row(
+            KIND_INFRA,
+            project_id=ProjectInfrastructure.project_id,
+            item_id=ProjectInfrastructure.id,
+            owner_id=InfrastructureItem.id,
+            text_c=InfrastructureItem.name,
+            num_a=cast(ProjectInfrastructure.quantity, Float),
+            num_b=InfrastructureItem.unit_cost,
+        )
+        .select_from(ProjectInfrastructure)
+        .join(
+            InfrastructureItem,
+            InfrastructureItem.id == ProjectInfrastructure.infrastructure_item_id,
+        )
+        .where(_project_filter(ProjectInfrastructure.project_id, project_ids))
+    )
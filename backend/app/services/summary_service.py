@@ -1,261 +1,583 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from itertools import product
 
+import numpy as np
 from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
-
-from app.core.calculator import (
-    ModuleHours,
-    apply_extra_multiplier,
-    apply_project_coefficients,
-    merge_module_overrides,
-    resolve_effective_levels,
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+from app.core.columnar import (
+    ITEM_MODULE,
+    ProjectVariant,
+    build_columns,
+    estimate_batch,
+    estimate_columns,
+    estimate_sensitivity,
+    tile_columns,
 )
 from app.core.config import settings
-from app.core.scenarios import optimistic_value, pessimistic_value
-from app.models import (
-    Assignment,
-    Module,
-    Project,
-    ProjectCoefficient,
-    ProjectInfrastructure,
-    ProjectModule,
-    ProjectNode,
-    Rate,
+from app.core.inputs import (
+    CoefficientInput,
+    EstimationInputs,
+    InfrastructureInput,
+    ProjectInput,
+    ProjectModuleInput,
+    ProjectNodeInput,
+)
+from app.core.line_items import (
+    LineItem,
+    combine_coefficients,
+    module_line_items,
+    node_line_items,
+)
+from app.core.scenarios import (
+    affordable_iterations,
+    optimistic_value,
+    pessimistic_value,
+    simulate_totals,
+    uncertainty_spread,
+)
+from app.models import Project
+from app.schemas import (
+    ProjectSummaryOut,
+    SensitivityEffect,
+    SensitivityItemOut,
+    SummaryDistribution,
+    SummaryHistogram,
+    SummaryOut,
+    SummaryScenario,
+    SummarySweepItemOut,
+    SummarySweepPoint,
+    SummarySweepRequest,
+    SummaryTotals,
+)
+from app.services.summary_cache import summary_cache
+from app.services.summary_loader import (
+    iter_project_infrastructure,
+    iter_project_module_inputs,
+    iter_project_node_inputs,
+    load_estimation_inputs,
+    load_inputs_for_projects,
+    load_project_context,
+    load_project_module_input,
+    load_project_node_input,
 )
-from app.schemas import SummaryOut, SummaryScenario, SummaryTotals
 
 
-ROLE_DEFAULT_LEVEL = {
-    "frontend": "middle",
-    "backend": "senior",
-    "qa": "middle",
-}
+@dataclass(frozen=True)
+class Contribution:
+    """Hours and cost contributed by a single module or node."""
 
+    hours_frontend: float
+    hours_backend: float
+    hours_qa: float
+    hours_extra: float
+    cost: float
+    uncertainty_level: str
+    line_items: tuple[LineItem, ...]
 
-def build_project_summary(session: Session, project_id: int) -> SummaryOut:
-    """Build a summary for project estimation."""
 
-    project = _get_project(session, project_id)
-    project_modules = _load_project_modules(session, project_id)
-    project_nodes = _load_project_nodes(session, project_id)
-    assignments = _load_assignments(session, project_id)
-    rates = _load_rates(session)
-    coefficients = _load_project_coefficients(session, project_id)
-    infra_items = _load_project_infrastructure(session, project_id)
-
-    totals = _calculate_totals(
-        project=project,
-        project_modules=project_modules,
-        project_nodes=project_nodes,
-        assignments=assignments,
-        rates=rates,
-        infra_items=infra_items,
-        coefficients=coefficients,
-    )
-    scenarios = _calculate_scenarios(totals)
+@dataclass
+class SummaryState:
+    """Per-item contributions and running totals for one project revision."""
 
-    return SummaryOut(totals=totals, scenarios=scenarios)
+    project: ProjectInput
+    assignments: dict[tuple[int, str], str]
+    rates: dict[tuple[str, str], float]
+    extra_multiplier: float
+    infrastructure: list[InfrastructureInput]
+    infra_cost: float
+    contributions: dict[tuple[str, int], Contribution] = field(default_factory=dict)
+    hours_frontend: float = 0.0
+    hours_backend: float = 0.0
+    hours_qa: float = 0.0
+    hours_extra: float = 0.0
+    work_cost: float = 0.0
+    summary: SummaryOut | None = None
 
 
-def _get_project(session: Session, project_id: int) -> Project:
-    result = session.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one()
-    return project
+@dataclass(frozen=True)
+class ProjectEstimate:
+    """Line items and totals of a project, ordered for reports."""
 
+    project: ProjectInput
+    line_items: list[LineItem]
+    infrastructure: list[InfrastructureInput]
+    totals: SummaryTotals
 
-def _load_project_modules(session: Session, project_id: int) -> list[ProjectModule]:
-    result = session.execute(
-        select(ProjectModule)
-        .where(ProjectModule.project_id == project_id)
-        .options(joinedload(ProjectModule.module).joinedload(Module.role_hours))
-        .join(ProjectModule.module)
-    )
-    return list(result.unique().scalars())
+
+@dataclass(frozen=True)
+class ProjectEstimateStream:
+    """Lazily produced line items and infrastructure of a project."""
+
+    project: ProjectInput
+    line_items: Iterator[LineItem]
+    infrastructure: Iterator[InfrastructureInput]
+
+
+def build_project_estimate(session: Session, project_id: int) -> ProjectEstimate:
+    """Return cached line items of a project, modules first, then nodes."""
+
+    return _state_estimate(_get_summary_state(session, project_id))
 
 
-def _load_project_nodes(session: Session, project_id: int) -> list[ProjectNode]:
-    result = session.execute(
-        select(ProjectNode)
-        .where(ProjectNode.project_id == project_id)
-        .options(joinedload(ProjectNode.role_hours))
+def stream_project_estimate(session: Session, project_id: int) -> ProjectEstimateStream:
+    """Return project line items from the summary cache or streamed from the database."""
+
+    revision = _get_project_revision(session, project_id)
+    cached = summary_cache.get(project_id, revision)
+    if cached is not None:
+        estimate = _state_estimate(cached)
+        return ProjectEstimateStream(
+            project=estimate.project,
+            line_items=iter(estimate.line_items),
+            infrastructure=iter(estimate.infrastructure),
+        )
+
+    context = load_project_context(session, project_id)
+    batch_size = settings.export_stream_batch_size
+    return ProjectEstimateStream(
+        project=context.project,
+        line_items=_stream_line_items(session, context, batch_size),
+        infrastructure=iter_project_infrastructure(session, project_id, batch_size),
     )
-    return list(result.unique().scalars())
 
 
-def _load_project_infrastructure(
+def build_project_summary(session: Session, project_id: int) -> SummaryOut:
+    """Build a summary for project estimation."""
+
+    return _get_summary_state(session, project_id).summary
+
+
+def build_project_simulation(
     session: Session,
     project_id: int,
-) -> list[ProjectInfrastructure]:
-    result = session.execute(
-        select(ProjectInfrastructure)
-        .where(ProjectInfrastructure.project_id == project_id)
-        .join(ProjectInfrastructure.infrastructure_item)
+    iterations: int,
+    seed: int | None = None,
+    distribution: str = "pert",
+) -> SummaryOut:
+    """Build a summary with Monte Carlo P10/P50/P90 scenarios.
+
+    Iterations are clamped to the sample budget of the project's size; the
+    distribution reports the count used. Raises NoResultFound for unknown
+    projects.
+    """
+
+    state = _get_summary_state(session, project_id)
+    contributions = list(state.contributions.values())
+    iterations = affordable_iterations(iterations, len(contributions))
+    result = simulate_totals(
+        hours=np.asarray(
+            [
+                item.hours_frontend + item.hours_backend + item.hours_qa + item.hours_extra
+                for item in contributions
+            ]
+        ),
+        costs=np.asarray([item.cost for item in contributions]),
+        spreads=np.asarray([uncertainty_spread(item.uncertainty_level) for item in contributions]),
+        iterations=iterations,
+        seed=seed,
+        distribution=distribution,
+        fixed_cost=state.infra_cost,
+    )
+    scenarios = [
+        SummaryScenario(
+            label=f"{label} (P{percentile})",
+            total_hours=result.hours_percentiles[percentile],
+            total_cost=result.cost_percentiles[percentile],
+        )
+        for label, percentile in (
+            ("Оптимистичный", 10),
+            ("Реалистичный", 50),
+            ("Пессимистичный", 90),
+        )
+    ]
+    distribution_out = SummaryDistribution(
+        method=distribution,
+        iterations=result.iterations,
+        seed=seed,
+        hours_p10=result.hours_percentiles[10],
+        hours_p50=result.hours_percentiles[50],
+        hours_p90=result.hours_percentiles[90],
+        cost_p10=result.cost_percentiles[10],
+        cost_p50=result.cost_percentiles[50],
+        cost_p90=result.cost_percentiles[90],
+        hours_histogram=SummaryHistogram(
+            edges=result.hours_histogram[0],
+            counts=result.hours_histogram[1],
+        ),
+        cost_histogram=SummaryHistogram(
+            edges=result.cost_histogram[0],
+            counts=result.cost_histogram[1],
+        ),
+    )
+    return SummaryOut(
+        totals=state.summary.totals,
+        scenarios=scenarios,
+        distribution=distribution_out,
     )
-    return list(result.scalars())
 
 
-def _load_assignments(session: Session, project_id: int) -> dict[tuple[int, str], str]:
-    result = session.execute(
-        select(Assignment).where(Assignment.project_id == project_id)
+def build_portfolio_summary(
+    session: Session,
+    project_ids: list[int] | None,
+) -> list[ProjectSummaryOut]:
+    """Build summaries for many projects (all when ids are None) in one pass."""
+
+    inputs = load_inputs_for_projects(session, project_ids)
+    if project_ids is None:
+        ordered_ids = sorted(inputs)
+    else:
+        ordered_ids = list(dict.fromkeys(project_ids))
+        missing = [project_id for project_id in ordered_ids if project_id not in inputs]
+        if missing:
+            raise NoResultFound(f"Projects not found: {', '.join(map(str, missing))}")
+    batch = [inputs[project_id] for project_id in ordered_ids]
+    return [
+        ProjectSummaryOut(
+            project_id=project_id,
+            totals=totals,
+            scenarios=_calculate_scenarios(totals),
+        )
+        for project_id, totals in zip(ordered_ids, estimate_batch(batch))
+    ]
+
+
+def build_project_sweep(
+    session: Session,
+    project_id: int,
+    request: SummarySweepRequest,
+) -> list[SummarySweepItemOut]:
+    """Evaluate a project summary over every combination of a settings grid.
+
+    Project data is loaded and packed once; grid points are evaluated as
+    virtual projects in a single columnar pass.
+    """
+
+    inputs = load_estimation_inputs(session, project_id)
+    project = inputs.project
+    base_coefficients = {item.name: item.multiplier for item in inputs.coefficients}
+    coefficient_names = list(request.coefficients)
+    rate_sets: list[int | None] = list(range(len(request.rate_sets))) or [None]
+    axes = (
+        request.uncertainty_levels or [project.uncertainty_level],
+        request.uiux_levels or [project.uiux_level],
+        request.legacy_code or [project.legacy_code],
+        *(request.coefficients[name] or [base_coefficients.get(name, 1.0)] for name in coefficient_names),
+        rate_sets,
     )
-    assignments: dict[tuple[int, str], str] = {}
-    for assignment in result.scalars():
-        assignments[(assignment.project_module_id, assignment.role)] = assignment.level
-    return assignments
-
-
-def _load_rates(session: Session) -> dict[tuple[str, str], float]:
-    result = session.execute(select(Rate))
-    rates: dict[tuple[str, str], float] = {}
-    for rate in result.scalars():
-        rates[(rate.role, rate.level)] = rate.hourly_rate
-    return rates
-
-
-def _calculate_totals(
-    project: Project,
-    project_modules: list[ProjectModule],
-    project_nodes: list[ProjectNode],
-    assignments: dict[tuple[int, str], str],
-    rates: dict[tuple[str, str], float],
-    infra_items: list[ProjectInfrastructure],
-    coefficients: list[ProjectCoefficient],
-) -> SummaryTotals:
-    totals = defaultdict(float)
-    work_cost_total = 0.0
-    extra_multiplier = _combine_coefficients(coefficients)
-    extra_roles_total = 0.0
-
-    for project_module in project_modules:
-        base_hours = ModuleHours(
-            frontend=project_module.module.hours_frontend,
-            backend=project_module.module.hours_backend,
-            qa=project_module.module.hours_qa,
+    point_count = 1
+    for axis in axes:
+        point_count *= len(axis)
+    if point_count > settings.sweep_max_points:
+        raise ValueError(f"Sweep grid has {point_count} points, limit is {settings.sweep_max_points}")
+
+    points: list[SummarySweepPoint] = []
+    variants: list[ProjectVariant] = []
+    for uncertainty_level, uiux_level, legacy_code, *rest in product(*axes):
+        *coefficient_values, rate_set = rest
+        coefficients = {**base_coefficients, **dict(zip(coefficient_names, coefficient_values))}
+        rates = {}
+        if rate_set is not None:
+            rates = {(rate.role, rate.level): rate.hourly_rate for rate in request.rate_sets[rate_set]}
+        points.append(
+            SummarySweepPoint(
+                uncertainty_level=uncertainty_level,
+                uiux_level=uiux_level,
+                legacy_code=legacy_code,
+                coefficients=coefficients,
+                rate_set=rate_set,
+            )
         )
-        merged = merge_module_overrides(
-            base_hours=base_hours,
-            override_frontend=project_module.override_frontend,
-            override_backend=project_module.override_backend,
-            override_qa=project_module.override_qa,
+        variants.append(
+            ProjectVariant(
+                uncertainty_level=uncertainty_level,
+                uiux_level=uiux_level,
+                legacy_code=legacy_code,
+                extra_multiplier=combine_coefficients(
+                    [CoefficientInput(name=name, multiplier=value) for name, value in coefficients.items()]
+                ),
+                rates=rates,
+            )
         )
 
-        uncertainty_level = resolve_effective_levels(
-            project.uncertainty_level,
-            project_module.uncertainty_level,
-        )
-        uiux_level = resolve_effective_levels(
-            project.uiux_level,
-            project_module.uiux_level,
+    estimate = estimate_columns(tile_columns(build_columns([inputs]), variants))
+    results = []
+    for index, point in enumerate(points):
+        totals = estimate.totals(index)
+        results.append(
+            SummarySweepItemOut(
+                point=point,
+                totals=totals,
+                scenarios=_calculate_scenarios(totals),
+            )
         )
-        legacy_code = project_module.legacy_code if project_module.legacy_code is not None else project.legacy_code
+    return results
+
 
-        adjusted = apply_project_coefficients(
-            hours=merged,
-            uncertainty_level=uncertainty_level,
-            uiux_level=uiux_level,
-            legacy_code=legacy_code,
+def build_project_sensitivity(
+    session: Session,
+    project_id: int,
+    hours_change: float,
+    limit: int | None = None,
+) -> list[SensitivityItemOut]:
+    """Rank project modules and nodes by the cost impact of changing them."""
+
+    columns = build_columns([load_estimation_inputs(session, project_id)])
+    sensitivity = estimate_sensitivity(columns, hours_change)
+    impact = np.nanmax(np.abs(sensitivity.delta_cost), axis=0, initial=0.0)
+    order = np.argsort(-impact, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+
+    results = []
+    for index in order.tolist():
+        effects = [
+            SensitivityEffect(
+                change=change,
+                delta_hours=float(sensitivity.delta_hours[row, index]),
+                delta_cost=float(sensitivity.delta_cost[row, index]),
+            )
+            for row, change in enumerate(sensitivity.changes)
+            if not np.isnan(sensitivity.delta_cost[row, index])
+        ]
+        results.append(
+            SensitivityItemOut(
+                item_type="module" if columns.item_kind[index] == ITEM_MODULE else "node",
+                item_id=int(columns.item_ids[index]),
+                name=columns.item_names[index],
+                hours=float(sensitivity.item_hours[index]),
+                cost=float(sensitivity.item_cost[index]),
+                impact=float(impact[index]),
+                effects=effects,
+            )
         )
-        adjusted = apply_extra_multiplier(adjusted, extra_multiplier)
+    return results
+
+
+def apply_project_module_change(
+    session: Session,
+    project_id: int,
+    project_module_id: int,
+    revision: int,
+) -> None:
+    """Update cached summary after one project module was added or changed."""
+
+    project_module = load_project_module_input(session, project_module_id)
+    if project_module is None:
+        return
+    key = ("module", project_module_id)
+    summary_cache.update(
+        project_id,
+        revision,
+        lambda state: _replace_contribution(
+            state, key, _module_contribution(state, project_module)
+        ),
+    )
 
-        extra_role_multiplier = _extra_role_multiplier(uncertainty_level, legacy_code)
 
-        totals["frontend"] += adjusted.frontend
-        totals["backend"] += adjusted.backend
-        totals["qa"] += adjusted.qa
+def apply_project_node_change(
+    session: Session,
+    project_id: int,
+    node_id: int,
+    revision: int,
+) -> None:
+    """Update cached summary after one mindmap node was added or changed."""
+
+    node = load_project_node_input(session, node_id)
+    if node is None:
+        return
+    key = ("node", node_id)
+    summary_cache.update(
+        project_id,
+        revision,
+        lambda state: _replace_contribution(state, key, _node_contribution(state, node)),
+    )
 
-        work_cost_total += _calculate_module_cost(
-            project_module_id=project_module.id,
-            adjusted=adjusted,
-            assignments=assignments,
-            rates=rates,
-            role_hours=project_module.module.role_hours,
-            extra_multiplier=extra_role_multiplier * extra_multiplier,
-        )
-        extra_roles_total += _calculate_extra_hours(
-            project_module.module.role_hours,
-            extra_role_multiplier * extra_multiplier,
-        )
 
-    for node in project_nodes:
-        adjusted = _calculate_node_hours(project, node, extra_multiplier)
-        node_extra_multiplier = _node_extra_multiplier(project, node, extra_multiplier)
-        totals["frontend"] += adjusted.frontend
-        totals["backend"] += adjusted.backend
-        totals["qa"] += adjusted.qa
-        work_cost_total += _calculate_node_cost(
-            adjusted=adjusted,
-            rates=rates,
-            role_hours=node.role_hours,
-            extra_multiplier=node_extra_multiplier,
+def apply_project_module_removal(project_id: int, project_module_id: int, revision: int) -> None:
+    """Update cached summary after a project module was removed."""
+
+    key = ("module", project_module_id)
+    summary_cache.update(
+        project_id,
+        revision,
+        lambda state: _replace_contribution(state, key, None),
+    )
+
+
+def apply_project_node_removal(project_id: int, node_id: int, revision: int) -> None:
+    """Update cached summary after a mindmap node was removed."""
+
+    key = ("node", node_id)
+    summary_cache.update(
+        project_id,
+        revision,
+        lambda state: _replace_contribution(state, key, None),
+    )
+
+
+def _get_summary_state(session: Session, project_id: int) -> SummaryState:
+    revision = _get_project_revision(session, project_id)
+    cached = summary_cache.get(project_id, revision)
+    if cached is not None:
+        return cached
+
+    inputs = load_estimation_inputs(session, project_id)
+    state = _build_state(inputs)
+    summary_cache.put(project_id, inputs.project.revision, state)
+    return state
+
+
+def _state_estimate(state: SummaryState) -> ProjectEstimate:
+    contributions = sorted(state.contributions.items())
+    return ProjectEstimate(
+        project=state.project,
+        line_items=[item for _, contribution in contributions for item in contribution.line_items],
+        infrastructure=state.infrastructure,
+        totals=state.summary.totals,
+    )
+
+
+def _stream_line_items(
+    session: Session,
+    context: EstimationInputs,
+    batch_size: int,
+) -> Iterator[LineItem]:
+    project = context.project
+    extra_multiplier = combine_coefficients(context.coefficients)
+    for project_module in iter_project_module_inputs(session, project.id, batch_size):
+        yield from module_line_items(
+            project,
+            project_module,
+            context.assignments,
+            context.rates,
+            extra_multiplier,
         )
-        extra_roles_total += _calculate_extra_hours(
-            node.role_hours,
-            node_extra_multiplier,
+    for node in iter_project_node_inputs(session, project.id, batch_size):
+        yield from node_line_items(project, node, context.rates, extra_multiplier)
+
+
+def _get_project_revision(session: Session, project_id: int) -> int:
+    result = session.execute(select(Project.revision).where(Project.id == project_id))
+    return result.scalar_one()
+
+
+def _build_state(inputs: EstimationInputs) -> SummaryState:
+    state = SummaryState(
+        project=inputs.project,
+        assignments=inputs.assignments,
+        rates=inputs.rates,
+        extra_multiplier=combine_coefficients(inputs.coefficients),
+        infrastructure=inputs.infrastructure,
+        infra_cost=_calculate_infra_cost(inputs.infrastructure),
+    )
+    for project_module in inputs.project_modules:
+        _add_contribution(
+            state,
+            ("module", project_module.id),
+            _module_contribution(state, project_module),
         )
+    for node in inputs.project_nodes:
+        _add_contribution(state, ("node", node.id), _node_contribution(state, node))
+    state.summary = _summarize(state)
+    return state
+
+
+def _replace_contribution(
+    state: SummaryState,
+    key: tuple[str, int],
+    contribution: Contribution | None,
+) -> SummaryState:
+    """Return a copy of the state with the item's old contribution swapped for the new one."""
+
+    updated = replace(state, contributions=dict(state.contributions))
+    previous = updated.contributions.pop(key, None)
+    if previous is not None:
+        _accumulate(updated, previous, -1.0)
+    if contribution is not None:
+        _add_contribution(updated, key, contribution)
+    updated.summary = _summarize(updated)
+    return updated
+
+
+def _add_contribution(
+    state: SummaryState,
+    key: tuple[str, int],
+    contribution: Contribution,
+) -> None:
+    state.contributions[key] = contribution
+    _accumulate(state, contribution, 1.0)
+
 
-    infra_cost = _calculate_infra_cost(infra_items)
-    hours_total = totals["frontend"] + totals["backend"] + totals["qa"] + extra_roles_total
-    cost_total = work_cost_total + infra_cost
+def _accumulate(state: SummaryState, contribution: Contribution, sign: float) -> None:
+    state.hours_frontend += sign * contribution.hours_frontend
+    state.hours_backend += sign * contribution.hours_backend
+    state.hours_qa += sign * contribution.hours_qa
+    state.hours_extra += sign * contribution.hours_extra
+    state.work_cost += sign * contribution.cost
 
+
+def _summarize(state: SummaryState) -> SummaryOut:
+    totals = _state_totals(state)
+    return SummaryOut(totals=totals, scenarios=_calculate_scenarios(totals))
+
+
+def _state_totals(state: SummaryState) -> SummaryTotals:
+    hours_total = state.hours_frontend + state.hours_backend + state.hours_qa + state.hours_extra
     return SummaryTotals(
-        hours_frontend=totals["frontend"],
-        hours_backend=totals["backend"],
-        hours_qa=totals["qa"],
+        hours_frontend=state.hours_frontend,
+        hours_backend=state.hours_backend,
+        hours_qa=state.hours_qa,
         hours_total=hours_total,
-        infra_cost=infra_cost,
-        cost_total=cost_total,
+        infra_cost=state.infra_cost,
+        cost_total=state.work_cost + state.infra_cost,
     )
 
 
-def _calculate_module_cost(
-    project_module_id: int,
-    adjusted: ModuleHours,
-    assignments: dict[tuple[int, str], str],
-    rates: dict[tuple[str, str], float],
-    role_hours: list,
-    extra_multiplier: float,
-) -> float:
-    cost = 0.0
-    base_role_hours = {
-        "frontend": adjusted.frontend,
-        "backend": adjusted.backend,
-        "qa": adjusted.qa,
-    }
-    for role, hours in base_role_hours.items():
-        level = assignments.get((project_module_id, role), ROLE_DEFAULT_LEVEL.get(role, "middle"))
-        rate = rates.get((role, level), 0.0)
-        cost += hours * rate
-    for item in role_hours:
-        level = assignments.get((project_module_id, item.role), "middle")
-        rate = rates.get((item.role, level), 0.0)
-        cost += item.hours * extra_multiplier * rate
-    return cost
+def _module_contribution(
+    state: SummaryState,
+    project_module: ProjectModuleInput,
+) -> Contribution:
+    return _contribution(
+        module_line_items(
+            state.project,
+            project_module,
+            state.assignments,
+            state.rates,
+            state.extra_multiplier,
+        )
+    )
+
+
+def _node_contribution(state: SummaryState, node: ProjectNodeInput) -> Contribution:
+    return _contribution(node_line_items(state.project, node, state.rates, state.extra_multiplier))
 
 
-def _calculate_node_cost(
-    adjusted: ModuleHours,
-    rates: dict[tuple[str, str], float],
-    role_hours: list,
-    extra_multiplier: float,
-) -> float:
-    """Calculate cost for a mindmap node."""
+def _contribution(line_items: list[LineItem]) -> Contribution:
+    """Aggregate line items of one module or node."""
+
+    hours = {"frontend": 0.0, "backend": 0.0, "qa": 0.0}
+    hours_extra = 0.0
     cost = 0.0
-    base_role_hours = {
-        "frontend": adjusted.frontend,
-        "backend": adjusted.backend,
-        "qa": adjusted.qa,
-    }
-    for role, hours in base_role_hours.items():
-        level = ROLE_DEFAULT_LEVEL.get(role, "middle")
-        rate = rates.get((role, level), 0.0)
-        cost += hours * rate
-    for item in role_hours:
-        level = "middle"
-        rate = rates.get((item.role, level), 0.0)
-        cost += item.hours * extra_multiplier * rate
-    return cost
+    for item in line_items:
+        if item.extra_role:
+            hours_extra += item.hours
+        else:
+            hours[item.role] += item.hours
+        cost += item.cost
+    return Contribution(
+        hours_frontend=hours["frontend"],
+        hours_backend=hours["backend"],
+        hours_qa=hours["qa"],
+        hours_extra=hours_extra,
+        cost=cost,
+        uncertainty_level=line_items[0].uncertainty_level,
+        line_items=tuple(line_items),
+    )
 
 
 def _calculate_scenarios(totals: SummaryTotals) -> list[SummaryScenario]:
@@ -277,87 +599,8 @@ def _calculate_scenarios(totals: SummaryTotals) -> list[SummaryScenario]:
     return [optimistic, realistic, pessimistic]
 
 
-def _load_project_coefficients(
-    session: Session,
-    project_id: int,
-) -> list[ProjectCoefficient]:
-    result = session.execute(
-        select(ProjectCoefficient).where(ProjectCoefficient.project_id == project_id)
-    )
-    return list(result.scalars())
-
-
-def _combine_coefficients(coefficients: list[ProjectCoefficient]) -> float:
-    multiplier = 1.0
-    for coefficient in coefficients:
-        multiplier *= max(coefficient.multiplier, 0)
-    return multiplier
-
-
-def _extra_role_multiplier(uncertainty_level: str, legacy_code: bool) -> float:
-    """Return multiplier for extra roles (no UI/UX)."""
-
-    uncertainty = settings.uncertainty_coefficients.get(uncertainty_level, 1.0)
-    legacy = settings.legacy_multiplier if legacy_code else 1.0
-    return uncertainty * legacy
-
-
-def _node_extra_multiplier(
-    project: Project,
-    node: ProjectNode,
-    extra_multiplier: float,
-) -> float:
-    """Return combined multiplier for node extra roles."""
-    uncertainty_level = resolve_effective_levels(
-        project.uncertainty_level,
-        node.uncertainty_level,
-    )
-    legacy_code = node.legacy_code if node.legacy_code is not None else project.legacy_code
-    return _extra_role_multiplier(uncertainty_level, legacy_code) * extra_multiplier
-
-
-def _calculate_node_hours(
-    project: Project,
-    node: ProjectNode,
-    extra_multiplier: float,
-) -> ModuleHours:
-    """Return adjusted node hours with multipliers."""
-    base_hours = ModuleHours(
-        frontend=node.hours_frontend,
-        backend=node.hours_backend,
-        qa=node.hours_qa,
-    )
-    uncertainty_level = resolve_effective_levels(
-        project.uncertainty_level,
-        node.uncertainty_level,
-    )
-    uiux_level = resolve_effective_levels(
-        project.uiux_level,
-        node.uiux_level,
-    )
-    legacy_code = node.legacy_code if node.legacy_code is not None else project.legacy_code
-    adjusted = apply_project_coefficients(
-        hours=base_hours,
-        uncertainty_level=uncertainty_level,
-        uiux_level=uiux_level,
-        legacy_code=legacy_code,
-    )
-    return apply_extra_multiplier(adjusted, extra_multiplier)
-
-
-def _calculate_extra_hours(
-    role_hours: list,
-    multiplier: float,
-) -> float:
-    total = 0.0
-    for item in role_hours:
-        total += item.hours * multiplier
-    return total
-
-
-def _calculate_infra_cost(infra_items: list[ProjectInfrastructure]) -> float:
+def _calculate_infra_cost(infra_items: list[InfrastructureInput]) -> float:
     cost = 0.0
     for item in infra_items:
-        unit_cost = item.infrastructure_item.unit_cost if item.infrastructure_item else 0.0
-        cost += unit_cost * item.quantity
+        cost += item.unit_cost * item.quantity
     return cost
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from sqlalchemy import and_, insert, inspect, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+# Stay well below the bind parameter limits of SQLite (32766) and Postgres (65535).
+UPSERT_MAX_PARAMETERS = 30_000
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def bulk_upsert(
+    session: Session,
+    model: type[ModelT],
+    rows: Sequence[dict[str, Any]],
+    key_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> list[ModelT]:
+    """Insert or update rows by a unique key and return one record per row, in input order.
+
+    Postgres and SQLite get one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+    statement per batch. Other dialects issue a lookup, one executemany update,
+    one multi-row insert and a reload. Rows repeating a key collapse into the
+    last one, as sequential upserts would, and share its record; see
+    rows_as_applied for per-row responses.
+    """
+
+    latest = {_row_key(row, key_columns): row for row in rows}
+    if not latest:
+        return []
+    dialect_insert = _DIALECT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is None:
+        records = _upsert_generic(session, model, latest, key_columns, update_columns)
+    else:
+        records = {}
+        unique_rows = list(latest.values())
+        batch_size = max(1, UPSERT_MAX_PARAMETERS // len(unique_rows[0]))
+        for start in range(0, len(unique_rows), batch_size):
+            statement = dialect_insert(model).values(unique_rows[start:start + batch_size])
+            statement = statement.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={column: statement.excluded[column] for column in update_columns},
+            ).returning(model)
+            for record in session.scalars(statement, execution_options={"populate_existing": True}):
+                records[_record_key(record, key_columns)] = record
+    return [records[_row_key(row, key_columns)] for row in rows]
+
+
+def rows_as_applied(records: Sequence[Any], rows: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return each input row as it was applied: its record's columns overlaid with the row.
+
+    For a key repeated in one call, earlier rows report the values they
+    wrote rather than the final ones, as sequential upserts did.
+    """
+
+    return [{**_record_columns(record), **row} for record, row in zip(records, rows)]
+
+
+def _upsert_generic(
+    session: Session,
+    model: type[ModelT],
+    latest: dict[tuple, dict[str, Any]],
+    key_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> dict[tuple, ModelT]:
+    key_attributes = [getattr(model, column) for column in key_columns]
+    matches = or_(
+        *(and_(*(attribute == value for attribute, value in zip(key_attributes, key))) for key in latest)
+    )
+    existing = {_record_key(record, key_columns): record for record in session.scalars(select(model).where(matches))}
+    changes = [
+        {"id": existing[key].id, **{column: row[column] for column in update_columns}}
+        for key, row in latest.items()
+        if key in existing
+    ]
+    if changes:
+        session.execute(update(model), changes)
+    new_rows = [row for key, row in latest.items() if key not in existing]
+    if new_rows:
+        session.execute(insert(model), new_rows)
+    return {
+        _record_key(record, key_columns): record
+        for record in session.scalars(select(model).where(matches), execution_options={"populate_existing": True})
+    }
+
+
+def _record_columns(record: Any) -> dict[str, Any]:
+    return {attribute.key: getattr(record, attribute.key) for attribute in inspect(record).mapper.column_attrs}
+
+
+def _row_key(row: dict[str, Any], key_columns: Sequence[str]) -> tuple:
+    return tuple(row[column] for column in key_columns)
+
+
+def _record_key(record: Any, key_columns: Sequence[str]) -> tuple:
+    return tuple(getattr(record, column) for column in key_columns)
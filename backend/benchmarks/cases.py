@@ -0,0 +1,138 @@
+"""Benchmark cases over a generated dataset."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.infrastructure import upsert_project_infrastructure
+from app.api.mindmap import apply_version
+from app.api.modules import list_modules
+from app.api.projects import upsert_assignments, upsert_coefficients
+from app.api.rates import upsert_rates
+from app.schemas import AssignmentUpsert, ProjectCoefficientCreate, ProjectInfrastructureUpsert, RateUpsert
+from app.services.ai_service import parse_prompt_with_ai
+from app.services.export_render import render_pdf
+from app.services.export_service import collect_export_rows, iter_project_csv
+from app.services.query_stats import track_queries
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import build_project_summary
+from benchmarks.generator import BASE_ROLES, EXTRA_ROLES, LEVELS, Dataset
+
+AI_PROMPT = (
+    "Нужен интернет-магазин: каталог товаров, корзина, оплата картой, личный кабинет, "
+    "интеграция с CRM и доставкой, админка для контента и аналитика продаж."
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One measured operation; ``run`` gets a fresh session per iteration."""
+
+    name: str
+    run: Callable[[Session], object]
+
+
+@dataclass(frozen=True)
+class CaseRun:
+    """Measured iterations of one case."""
+
+    timings: list[float]
+    queries: int
+
+
+def build_cases(dataset: Dataset) -> list[BenchmarkCase]:
+    """Return all benchmark cases for a dataset."""
+
+    project_id = dataset.project_id
+
+    def summary_cold(session: Session) -> object:
+        summary_cache.clear()
+        return build_project_summary(session, project_id)
+
+    def summary_warm(session: Session) -> object:
+        return build_project_summary(session, project_id)
+
+    def export_csv(session: Session) -> object:
+        return sum(len(chunk) for chunk in iter_project_csv(session, project_id))
+
+    def export_pdf(session: Session) -> object:
+        rows = collect_export_rows(session, project_id)
+        return render_pdf(rows.work, rows.infra)
+
+    def mindmap_apply_version(session: Session) -> object:
+        return apply_version(project_id, dataset.version_id, session)
+
+    def ai_heuristics(session: Session) -> object:
+        return parse_prompt_with_ai(session, AI_PROMPT)
+
+    # Every iteration writes new values so the upserts really update rows.
+    upsert_round = itertools.count(1)
+
+    def upsert_rates_case(session: Session) -> object:
+        step = next(upsert_round)
+        payload = [
+            RateUpsert(role=role, level=level, hourly_rate=1000.0 + step)
+            for role in (*BASE_ROLES, *EXTRA_ROLES)
+            for level in LEVELS
+        ]
+        return upsert_rates(payload, session)
+
+    def upsert_assignments_case(session: Session) -> object:
+        step = next(upsert_round)
+        payload = [
+            AssignmentUpsert(project_module_id=project_module_id, role=role, level=LEVELS[(index + step) % len(LEVELS)])
+            for index, project_module_id in enumerate(dataset.project_module_ids)
+            for role in BASE_ROLES
+        ]
+        return upsert_assignments(project_id, payload, session)
+
+    def upsert_coefficients_case(session: Session) -> object:
+        step = next(upsert_round)
+        payload = [
+            ProjectCoefficientCreate(name=f"Coefficient {index}", multiplier=1.0 + step % 10 / 100)
+            for index in range(dataset.sizes.coefficients)
+        ]
+        return upsert_coefficients(project_id, payload, session)
+
+    def upsert_infrastructure_case(session: Session) -> object:
+        step = next(upsert_round)
+        payload = [
+            ProjectInfrastructureUpsert(infrastructure_item_id=item_id, quantity=1 + step % 5)
+            for item_id in dataset.infrastructure_item_ids
+        ]
+        return upsert_project_infrastructure(project_id, payload, session)
+
+    return [
+        BenchmarkCase("summary_cold", summary_cold),
+        BenchmarkCase("summary_warm", summary_warm),
+        BenchmarkCase("export_csv", export_csv),
+        BenchmarkCase("export_pdf", export_pdf),
+        BenchmarkCase("mindmap_apply_version", mindmap_apply_version),
+        BenchmarkCase("list_modules", list_modules),
+        BenchmarkCase("ai_heuristics", ai_heuristics),
+        BenchmarkCase("upsert_rates", upsert_rates_case),
+        BenchmarkCase("upsert_assignments", upsert_assignments_case),
+        BenchmarkCase("upsert_coefficients", upsert_coefficients_case),
+        BenchmarkCase("upsert_infrastructure", upsert_infrastructure_case),
+    ]
+
+
+def run_case(case: BenchmarkCase, session_factory: sessionmaker, repeat: int, warmup: int) -> CaseRun:
+    """Return wall-clock seconds of each measured iteration and the most statements one issued."""
+
+    timings = []
+    queries = 0
+    for iteration in range(warmup + repeat):
+        with session_factory() as session, track_queries() as stats:
+            started = time.perf_counter()
+            case.run(session)
+            elapsed = time.perf_counter() - started
+        if iteration >= warmup:
+            timings.append(elapsed)
+            queries = max(queries, stats.count)
+    return CaseRun(timings=timings, queries=queries)
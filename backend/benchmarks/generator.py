@@ -0,0 +1,292 @@
+"""Synthetic project data for benchmarks."""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Assignment,
+    InfrastructureItem,
+    Module,
+    ModuleRoleHours,
+    Project,
+    ProjectCoefficient,
+    ProjectInfrastructure,
+    ProjectMindmapVersion,
+    ProjectModule,
+    ProjectNode,
+    ProjectNodeConnection,
+    ProjectNodeRoleHours,
+    Rate,
+)
+from app.schemas import (
+    MindmapSnapshot,
+    MindmapSnapshotConnection,
+    MindmapSnapshotNode,
+    ProjectNodeRoleHours as ProjectNodeRoleHoursPayload,
+)
+
+BASE_ROLES = ("frontend", "backend", "qa")
+EXTRA_ROLES = ("pm", "devops", "analyst", "designer")
+LEVELS = ("junior", "middle", "senior")
+UNCERTAINTY_LEVELS = ("known", "new_tech", None)
+UIUX_LEVELS = ("mvp", "award", None)
+
+
+@dataclass(frozen=True)
+class DatasetSizes:
+    """How much data to generate for one benchmark project."""
+
+    modules: int
+    nodes: int
+    coefficients: int = 5
+    infrastructure: int = 20
+    extra_roles_per_item: int = 2
+
+
+PRESETS = {
+    "small": DatasetSizes(modules=10, nodes=0),
+    "medium": DatasetSizes(modules=100, nodes=500),
+    "large": DatasetSizes(modules=1000, nodes=2000),
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Identifiers of generated benchmark data."""
+
+    project_id: int
+    version_id: int
+    sizes: DatasetSizes
+    project_module_ids: tuple[int, ...] = ()
+    infrastructure_item_ids: tuple[int, ...] = ()
+
+
+def generate_dataset(session: Session, sizes: DatasetSizes, seed: int = 0) -> Dataset:
+    """Insert a project with catalog modules, assignments, mindmap and a saved version.
+
+    Values are drawn from ``seed``; codes carry a random suffix so repeated
+    runs against one database do not collide.
+    """
+
+    rng = random.Random(seed)
+    suffix = uuid.uuid4().hex[:8]
+    _ensure_rates(session)
+
+    module_ids = _insert_modules(session, rng, sizes, suffix)
+    project_id = session.execute(
+        insert(Project)
+        .values(name=f"Benchmark {suffix}", description="", uncertainty_level="known", uiux_level="mvp")
+        .returning(Project.id)
+    ).scalar_one()
+    project_module_ids = _insert_project_modules(session, rng, project_id, module_ids)
+    _insert_assignments(session, rng, project_id, project_module_ids)
+    session.execute(
+        insert(ProjectCoefficient),
+        [
+            {"project_id": project_id, "name": f"Coefficient {index}", "multiplier": round(rng.uniform(0.9, 1.2), 2)}
+            for index in range(sizes.coefficients)
+        ],
+    )
+    infrastructure_item_ids = _insert_infrastructure(session, rng, project_id, sizes, suffix)
+    snapshot = _insert_mindmap(session, rng, project_id, module_ids, sizes)
+    version_id = session.execute(
+        insert(ProjectMindmapVersion)
+        .values(project_id=project_id, title="Benchmark snapshot", payload=snapshot.model_dump_json())
+        .returning(ProjectMindmapVersion.id)
+    ).scalar_one()
+    session.commit()
+    return Dataset(
+        project_id=project_id,
+        version_id=version_id,
+        sizes=sizes,
+        project_module_ids=tuple(project_module_ids),
+        infrastructure_item_ids=tuple(infrastructure_item_ids),
+    )
+
+
+def _ensure_rates(session: Session) -> None:
+    existing = set(session.execute(select(Rate.role, Rate.level)).tuples())
+    missing = [
+        {"role": role, "level": level, "hourly_rate": 1000.0 + 400 * LEVELS.index(level)}
+        for role in (*BASE_ROLES, *EXTRA_ROLES)
+        for level in LEVELS
+        if (role, level) not in existing
+    ]
+    if missing:
+        session.execute(insert(Rate), missing)
+
+
+def _insert_modules(session: Session, rng: random.Random, sizes: DatasetSizes, suffix: str) -> list[int]:
+    rows = [
+        {
+            "code": f"bench-{suffix}-{index}",
+            "name": f"Модуль {index}",
+            "description": f"Каталог корзина оплата интеграция {index}",
+            "hours_frontend": float(rng.randint(0, 80)),
+            "hours_backend": float(rng.randint(0, 80)),
+            "hours_qa": float(rng.randint(0, 30)),
+        }
+        for index in range(sizes.modules)
+    ]
+    if not rows:
+        return []
+    session.execute(insert(Module), rows)
+    module_ids = list(
+        session.execute(select(Module.id).where(Module.code.like(f"bench-{suffix}-%")).order_by(Module.id)).scalars()
+    )
+    session.execute(
+        insert(ModuleRoleHours),
+        [
+            {"module_id": module_id, "role": role, "hours": float(rng.randint(1, 16))}
+            for module_id in module_ids
+            for role in rng.sample(EXTRA_ROLES, sizes.extra_roles_per_item)
+        ],
+    )
+    return module_ids
+
+
+def _insert_project_modules(
+    session: Session,
+    rng: random.Random,
+    project_id: int,
+    module_ids: list[int],
+) -> list[int]:
+    if not module_ids:
+        return []
+    session.execute(
+        insert(ProjectModule),
+        [
+            {
+                "project_id": project_id,
+                "module_id": module_id,
+                "custom_name": "",
+                "override_frontend": float(rng.randint(0, 40)) if rng.random() < 0.2 else None,
+                "uncertainty_level": rng.choice(UNCERTAINTY_LEVELS),
+                "uiux_level": rng.choice(UIUX_LEVELS),
+                "legacy_code": rng.choice((True, False, None)),
+            }
+            for module_id in module_ids
+        ],
+    )
+    return list(
+        session.execute(
+            select(ProjectModule.id).where(ProjectModule.project_id == project_id).order_by(ProjectModule.id)
+        ).scalars()
+    )
+
+
+def _insert_assignments(
+    session: Session,
+    rng: random.Random,
+    project_id: int,
+    project_module_ids: list[int],
+) -> None:
+    rows = [
+        {"project_id": project_id, "project_module_id": project_module_id, "role": role, "level": rng.choice(LEVELS)}
+        for project_module_id in project_module_ids
+        for role in BASE_ROLES
+    ]
+    if rows:
+        session.execute(insert(Assignment), rows)
+
+
+def _insert_infrastructure(
+    session: Session,
+    rng: random.Random,
+    project_id: int,
+    sizes: DatasetSizes,
+    suffix: str,
+) -> list[int]:
+    if not sizes.infrastructure:
+        return []
+    session.execute(
+        insert(InfrastructureItem),
+        [
+            {"code": f"bench-{suffix}-infra-{index}", "name": f"Server {index}", "unit_cost": float(rng.randint(100, 5000))}
+            for index in range(sizes.infrastructure)
+        ],
+    )
+    item_ids = list(
+        session.execute(
+            select(InfrastructureItem.id)
+            .where(InfrastructureItem.code.like(f"bench-{suffix}-infra-%"))
+            .order_by(InfrastructureItem.id)
+        ).scalars()
+    )
+    session.execute(
+        insert(ProjectInfrastructure),
+        [{"project_id": project_id, "infrastructure_item_id": item_id, "quantity": rng.randint(1, 5)} for item_id in item_ids],
+    )
+    return item_ids
+
+
+def _insert_mindmap(
+    session: Session,
+    rng: random.Random,
+    project_id: int,
+    module_ids: list[int],
+    sizes: DatasetSizes,
+) -> MindmapSnapshot:
+    nodes = [
+        MindmapSnapshotNode(
+            key=f"n{index}",
+            title=f"Задача {index}",
+            module_id=rng.choice(module_ids) if module_ids and rng.random() < 0.5 else None,
+            hours_frontend=float(rng.randint(0, 24)),
+            hours_backend=float(rng.randint(0, 24)),
+            hours_qa=float(rng.randint(0, 8)),
+            uncertainty_level=rng.choice(UNCERTAINTY_LEVELS),
+            legacy_code=rng.choice((True, False, None)),
+            position_x=float(index % 40) * 220,
+            position_y=float(index // 40) * 140,
+            role_hours=[
+                ProjectNodeRoleHoursPayload(role=role, hours=float(rng.randint(1, 8)))
+                for role in rng.sample(EXTRA_ROLES, sizes.extra_roles_per_item)
+            ],
+        )
+        for index in range(sizes.nodes)
+    ]
+    connections = [
+        MindmapSnapshotConnection(from_key=f"n{rng.randrange(index)}", to_key=f"n{index}")
+        for index in range(1, sizes.nodes)
+    ]
+    snapshot = MindmapSnapshot(nodes=nodes, connections=connections, notes=[])
+    if not nodes:
+        return snapshot
+
+    session.execute(
+        insert(ProjectNode),
+        [
+            {"project_id": project_id, **node.model_dump(exclude={"key", "role_hours"})}
+            for node in nodes
+        ],
+    )
+    node_ids = list(
+        session.execute(
+            select(ProjectNode.id).where(ProjectNode.project_id == project_id).order_by(ProjectNode.id)
+        ).scalars()
+    )
+    session.execute(
+        insert(ProjectNodeRoleHours),
+        [
+            {"node_id": node_id, "role": item.role, "hours": item.hours}
+            for node_id, node in zip(node_ids, nodes)
+            for item in node.role_hours
+        ],
+    )
+    if connections:
+        id_by_key = {node.key: node_id for node_id, node in zip(node_ids, nodes)}
+        session.execute(
+            insert(ProjectNodeConnection),
+            [
+                {"project_id": project_id, "from_node_id": id_by_key[item.from_key], "to_node_id": id_by_key[item.to_key]}
+                for item in connections
+            ],
+        )
+    return snapshot
@@ -0,0 +1,107 @@
+"""Compare PDF export throughput: inline rendering vs the render process pool.
+
+Run from the backend directory:
+
+    PYTHONPATH=. python -m benchmarks.pdf_export --rows 2000 --concurrency 8 --requests 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.export_render import InfraRow, WorkRow, render_pdf  # noqa: E402
+from app.services.render_pool import RenderPool, RenderPoolBusy  # noqa: E402
+
+
+def build_rows(count: int) -> tuple[list[WorkRow], list[InfraRow]]:
+    """Return synthetic export rows."""
+
+    roles = (("frontend", "middle"), ("backend", "senior"), ("qa", "middle"))
+    work = []
+    for index in range(count):
+        role, level = roles[index % len(roles)]
+        hours = 4.0 + index % 17
+        work.append(WorkRow(f"Модуль {index // 3}", role, level, hours, 1100.0, hours * 1100.0))
+    infra = [InfraRow(f"Server {index}", index + 1, 500.0, 500.0 * (index + 1)) for index in range(20)]
+    return work, infra
+
+
+def run_inline(work: list[WorkRow], infra: list[InfraRow]) -> bytes:
+    return render_pdf(work, infra)
+
+
+def measure(label: str, render, concurrency: int, requests: int) -> None:
+    latencies: list[float] = []
+    rejected = 0
+    lock = threading.Lock()
+    probe_delays: list[float] = []
+    stop = threading.Event()
+
+    def probe() -> None:
+        # Stands in for other requests served by the same process: how late it
+        # wakes up shows how much rendering starves them of the GIL.
+        while not stop.is_set():
+            started = time.perf_counter()
+            time.sleep(0.01)
+            probe_delays.append(time.perf_counter() - started - 0.01)
+
+    def one_request() -> None:
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            render()
+        except RenderPoolBusy:
+            with lock:
+                rejected += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    probe_thread = threading.Thread(target=probe)
+    probe_thread.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(requests):
+            executor.submit(one_request)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe_thread.join()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(
+        f"{label:<8} done={len(latencies):<4} rejected={rejected:<4} "
+        f"throughput={len(latencies) / elapsed:6.2f}/s "
+        f"p50={statistics.median(latencies) if latencies else 0.0:6.3f}s p95={p95:6.3f}s "
+        f"probe_p95={sorted(probe_delays)[int(len(probe_delays) * 0.95) - 1] * 1000:7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--queue-depth", type=int, default=0, help="0 means unbounded (requests)")
+    args = parser.parse_args()
+
+    work, infra = build_rows(args.rows)
+    pool = RenderPool(args.workers, args.queue_depth or args.requests)
+    pool.submit(render_pdf, work[:1], infra[:1]).result()
+
+    print(f"rows={args.rows} concurrency={args.concurrency} requests={args.requests} workers={args.workers}")
+    measure("inline", lambda: run_inline(work, infra), args.concurrency, args.requests)
+    measure("pool", lambda: pool.submit(render_pdf, work, infra).result(), args.concurrency, args.requests)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Run the benchmark suite and compare it with a stored baseline.
+
+Run from the backend directory:
+
+    PYTHONPATH=. python -m benchmarks --preset medium --output results.json
+    PYTHONPATH=. python -m benchmarks --preset medium --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    database_path = None
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        database_path = Path(tempfile.gettempdir()) / "calculateta-benchmarks.db"
+        database_path.unlink(missing_ok=True)
+        database_url = f"sqlite:///{database_path}"
+    # Settings are read on import, so configure the environment first.
+    os.environ["DATABASE_URL"] = database_url
+    # Measure the heuristic parser, never a network call.
+    os.environ["OPENAI_API_KEY"] = ""
+
+    from app.db import SessionLocal, engine
+    from app.migrations.runner import upgrade
+    from app.services.query_stats import install_query_hooks
+    from app.services.seed_service import seed_defaults
+    from benchmarks.cases import build_cases, run_case
+    from benchmarks.generator import PRESETS, DatasetSizes, generate_dataset
+
+    sizes = PRESETS[args.preset]
+    if args.modules is not None or args.nodes is not None:
+        sizes = DatasetSizes(
+            modules=sizes.modules if args.modules is None else args.modules,
+            nodes=sizes.nodes if args.nodes is None else args.nodes,
+            coefficients=sizes.coefficients,
+            infrastructure=sizes.infrastructure,
+            extra_roles_per_item=sizes.extra_roles_per_item,
+        )
+
+    upgrade(engine)
+    install_query_hooks(engine)
+    with SessionLocal() as session:
+        seed_defaults(session)
+        dataset = generate_dataset(session, sizes, seed=args.seed)
+
+    selected = set(args.cases or [])
+    results = {}
+    for case in build_cases(dataset):
+        if selected and case.name not in selected:
+            continue
+        run = run_case(case, SessionLocal, repeat=args.repeat, warmup=args.warmup)
+        results[case.name] = _summarize(run.timings) | {"queries": run.queries}
+        print(f"{case.name:<24} median={results[case.name]['median'] * 1000:9.2f}ms "
+              f"p95={results[case.name]['p95'] * 1000:9.2f}ms queries={run.queries}", flush=True)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "preset": args.preset,
+            "sizes": {
+                "modules": sizes.modules,
+                "nodes": sizes.nodes,
+                "coefficients": sizes.coefficients,
+                "infrastructure": sizes.infrastructure,
+                "extra_roles_per_item": sizes.extra_roles_per_item,
+            },
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    engine.dispose()
+    if database_path is not None:
+        database_path.unlink(missing_ok=True)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(baseline, report, args.tolerance)
+        return 1 if regressions else 0
+    return 0
+
+
+def compare(baseline: dict, report: dict, tolerance: float) -> list[str]:
+    """Print median changes against a baseline and return the regressed case names.
+
+    A case also regresses when it issues more statements than in the baseline.
+    """
+
+    if baseline.get("meta", {}).get("sizes") != report["meta"]["sizes"]:
+        print("Warning: baseline was recorded with different dataset sizes", file=sys.stderr)
+    regressions = []
+    print(f"\n{'case':<24} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print(f"{name:<24} {'-':>11} {current['median'] * 1000:9.2f}ms {'new':>8}")
+            continue
+        change = current["median"] / previous["median"] - 1 if previous["median"] else 0.0
+        marker = ""
+        if change > tolerance:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        elif current.get("queries", 0) > previous.get("queries", current.get("queries", 0)):
+            regressions.append(name)
+            marker = f"  QUERIES {previous['queries']} -> {current['queries']}"
+        print(
+            f"{name:<24} {previous['median'] * 1000:9.2f}ms {current['median'] * 1000:9.2f}ms "
+            f"{change * 100:+7.1f}%{marker}"
+        )
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {tolerance:.0%}")
+    return regressions
+
+
+def _summarize(timings: list[float]) -> dict[str, float]:
+    ordered = sorted(timings)
+    return {
+        "median": statistics.median(ordered),
+        "min": ordered[0],
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[max(0, round(len(ordered) * 0.95) - 1)],
+        "runs": len(ordered),
+    }
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=("small", "medium", "large"), default="medium")
+    parser.add_argument("--modules", type=int, help="override the preset module count")
+    parser.add_argument("--nodes", type=int, help="override the preset mindmap node count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--case", dest="cases", action="append", help="run only this case; repeatable")
+    parser.add_argument(
+        "--database-url",
+        help="SQLite or Postgres URL; data is added next to existing rows. "
+        "Defaults to a fresh temporary SQLite file.",
+    )
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown, 0.2 = 20%%")
+    return parser.parse_args(argv)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Settings are read on import, so point the app at scratch storage first.
+_SCRATCH = Path(tempfile.mkdtemp(prefix="calculateta-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH / 'test.db'}"
+os.environ["EXPORT_CACHE_DIR"] = str(_SCRATCH / "exports")
+os.environ["EXPORT_JOBS_DIR"] = str(_SCRATCH / "export-jobs")
+os.environ["OPENAI_API_KEY"] = ""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, engine
+from app.migrations.runner import upgrade
+from app.services.seed_service import seed_defaults
+from benchmarks.generator import Dataset, DatasetSizes, generate_dataset
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> Iterator[None]:
+    upgrade(engine)
+    with SessionLocal() as session:
+        seed_defaults(session)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    with SessionLocal() as db_session:
+        yield db_session
+
+
+@pytest.fixture(scope="session")
+def dataset(database: None) -> Dataset:
+    with SessionLocal() as db_session:
+        return generate_dataset(db_session, DatasetSizes(modules=40, nodes=60), seed=1)
+
+
+@pytest.fixture
+def count_statements():
+    """Return a context manager collecting SQL statements sent through the engine."""
+
+    return _count_statements
+
+
+@contextmanager
+def _count_statements() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from app.services import auth_service
+from app.services.auth_service import AuthenticatedUser, TokenSigningUnavailable, issue_token, verify_token
+
+ADMIN = AuthenticatedUser(id=1, username="admin", role="admin")
+VIEWER = AuthenticatedUser(id=2, username="viewer", role="user")
+
+
+@pytest.fixture(scope="module")
+def client() -> TestClient:
+    return TestClient(create_app())
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def test_valid_token_round_trips_the_identity():
+    assert verify_token(issue_token(ADMIN).value) == ADMIN
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "session_token_ttl_seconds", -1)
+
+    assert verify_token(issue_token(ADMIN).value) is None
+
+
+def test_tampered_signature_is_rejected():
+    payload, _, signature = issue_token(ADMIN).value.partition(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+
+    assert verify_token(f"{payload}.{flipped}") is None
+
+
+def test_tampered_payload_is_rejected():
+    payload, _, signature = issue_token(VIEWER).value.partition(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    forged = _b64(json.dumps({**claims, "role": "admin"}, separators=(",", ":")).encode())
+
+    assert verify_token(f"{forged}.{signature}") is None
+
+
+@pytest.mark.parametrize("token", ["", ".", "abc", "abc.", ".abc", "a.b.c", "!!!.???", "é.é"])
+def test_malformed_tokens_are_rejected(token):
+    assert verify_token(token) is None
+
+
+def test_signed_token_with_incomplete_claims_is_rejected():
+    payload = _b64(b'{"sub": 1}')
+
+    assert verify_token(f"{payload}.{_b64(auth_service._sign(payload))}") is None
+
+
+def test_tokens_are_refused_without_a_shared_secret(monkeypatch):
+    monkeypatch.setattr(auth_service, "_TOKEN_KEY", None)
+
+    with pytest.raises(TokenSigningUnavailable):
+        issue_token(ADMIN)
+
+
+def test_production_requires_a_token_secret(monkeypatch):
+    monkeypatch.setattr(settings, "session_token_secret", None)
+    monkeypatch.setattr(settings, "environment", "production")
+    assert auth_service._token_key() is None
+
+    monkeypatch.setattr(settings, "session_token_secret", "shared")
+    assert auth_service._token_key() == b"shared"
+
+
+def test_login_without_a_signing_key_points_to_basic(client, monkeypatch):
+    monkeypatch.setattr(auth_service, "_TOKEN_KEY", None)
+
+    response = client.post(
+        "/api/auth/login", json={"username": settings.admin_username, "password": settings.admin_password}
+    )
+
+    assert response.status_code == 503
+
+
+def test_require_user_accepts_a_login_token(client):
+    login = client.post(
+        "/api/auth/login", json={"username": settings.admin_username, "password": settings.admin_password}
+    )
+    token = login.json()["access_token"]
+
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json()["username"] == settings.admin_username
+
+
+def test_require_user_falls_back_to_basic(client):
+    assert client.get("/api/auth/me", auth=(settings.admin_username, settings.admin_password)).status_code == 200
+    assert client.get("/api/auth/me", auth=(settings.admin_username, "wrong")).status_code == 401
+
+
+def test_require_user_rejects_missing_or_invalid_credentials(client):
+    assert client.get("/api/auth/me").status_code == 401
+    assert client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+
+
+def test_require_admin_rejects_a_non_admin_token(client):
+    headers = {"Authorization": f"Bearer {issue_token(VIEWER).value}"}
+
+    assert client.get("/api/users", headers=headers).status_code == 403
+    admin_headers = {"Authorization": f"Bearer {issue_token(ADMIN).value}"}
+    assert client.get("/api/users", headers=admin_headers).status_code == 200
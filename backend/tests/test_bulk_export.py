@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import io
+import zipfile
+
+from app.db import open_snapshot_session
+from app.services.bulk_export import iter_projects_zip
+from app.services.export_cache import export_cache
+from app.services.export_service import iter_project_export
+
+
+def test_zip_entries_stream_the_rendered_exports(dataset):
+    export_cache.clear()
+
+    chunks = list(iter_projects_zip([dataset.project_id], ["csv", "xlsx"]))
+
+    # Entries are flushed while they are written, not once per finished file.
+    assert len(chunks) > 3
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.namelist() == [
+        f"project-{dataset.project_id}-export.csv",
+        f"project-{dataset.project_id}-export.xlsx",
+    ]
+    with open_snapshot_session() as session:
+        csv_content = b"".join(iter_project_export(session, dataset.project_id, "csv"))
+    assert archive.read(f"project-{dataset.project_id}-export.csv") == csv_content
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.calculator import (
+    ModuleHours,
+    apply_extra_multiplier,
+    apply_project_coefficients,
+    merge_module_overrides,
+    resolve_effective_levels,
+)
+from app.core.columnar import BASE_ROLES, build_columns, estimate_batch, estimate_columns
+from app.core.inputs import EstimationInputs
+from app.core.line_items import combine_coefficients, iter_line_items
+from app.services.summary_loader import load_estimation_inputs
+
+
+def _calculator_base_hours(inputs: EstimationInputs) -> ModuleHours:
+    project = inputs.project
+    extra = combine_coefficients(inputs.coefficients)
+    total = ModuleHours(0.0, 0.0, 0.0)
+    items = [
+        (
+            merge_module_overrides(
+                ModuleHours(pm.module.hours_frontend, pm.module.hours_backend, pm.module.hours_qa),
+                pm.override_frontend,
+                pm.override_backend,
+                pm.override_qa,
+            ),
+            pm,
+        )
+        for pm in inputs.project_modules
+    ] + [(ModuleHours(node.hours_frontend, node.hours_backend, node.hours_qa), node) for node in inputs.project_nodes]
+    for hours, item in items:
+        adjusted = apply_extra_multiplier(
+            apply_project_coefficients(
+                hours,
+                resolve_effective_levels(project.uncertainty_level, item.uncertainty_level),
+                resolve_effective_levels(project.uiux_level, item.uiux_level),
+                project.legacy_code if item.legacy_code is None else item.legacy_code,
+            ),
+            extra,
+        )
+        total = ModuleHours(
+            total.frontend + adjusted.frontend,
+            total.backend + adjusted.backend,
+            total.qa + adjusted.qa,
+        )
+    return total
+
+
+def test_columnar_engine_matches_line_items_and_calculator(session, dataset):
+    inputs = load_estimation_inputs(session, dataset.project_id)
+    assert inputs.project_modules and inputs.project_nodes
+
+    totals = estimate_batch([inputs])[0]
+    line_items = list(iter_line_items(inputs))
+
+    for role in BASE_ROLES:
+        expected = sum(item.hours for item in line_items if item.role == role and not item.extra_role)
+        assert getattr(totals, f"hours_{role}") == pytest.approx(expected, rel=1e-12)
+    assert totals.hours_total == pytest.approx(sum(item.hours for item in line_items), rel=1e-12)
+    work_cost = sum(item.cost for item in line_items)
+    assert totals.cost_total - totals.infra_cost == pytest.approx(work_cost, rel=1e-12)
+
+    reference = _calculator_base_hours(inputs)
+    assert totals.hours_frontend == pytest.approx(reference.frontend, rel=1e-12)
+    assert totals.hours_backend == pytest.approx(reference.backend, rel=1e-12)
+    assert totals.hours_qa == pytest.approx(reference.qa, rel=1e-12)
+
+
+def test_columnar_item_costs_match_line_items(session, dataset):
+    inputs = load_estimation_inputs(session, dataset.project_id)
+    estimate = estimate_columns(build_columns([inputs]))
+
+    item_costs: dict[tuple[str, int], float] = {}
+    for item in iter_line_items(inputs):
+        key = (item.item_type, item.item_id)
+        item_costs[key] = item_costs.get(key, 0.0) + item.cost
+
+    assert len(estimate.item_cost) == len(item_costs)
+    assert list(estimate.item_cost) == pytest.approx(list(item_costs.values()), rel=1e-12)
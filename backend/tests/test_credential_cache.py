@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+from app.services.auth_service import AuthenticatedUser, CredentialCache, credential_cache
+
+ALICE = AuthenticatedUser(id=1, username="alice", role="user")
+BOB = AuthenticatedUser(id=2, username="bob", role="user")
+CAROL = AuthenticatedUser(id=3, username="carol", role="user")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = CredentialCache(max_size=10, ttl_seconds=60, clock=clock)
+    cache.put("alice", "secret", ALICE)
+
+    clock.now += 59.9
+    assert cache.get("alice", "secret") == ALICE
+    clock.now += 0.1
+    assert cache.get("alice", "secret") is None
+
+
+def test_least_recently_used_entry_is_evicted_at_max_size():
+    cache = CredentialCache(max_size=2, ttl_seconds=60, clock=FakeClock())
+    cache.put("alice", "a", ALICE)
+    cache.put("bob", "b", BOB)
+    assert cache.get("alice", "a") == ALICE
+
+    cache.put("carol", "c", CAROL)
+
+    assert cache.get("bob", "b") is None
+    assert cache.get("alice", "a") == ALICE
+    assert cache.get("carol", "c") == CAROL
+
+
+def test_wrong_password_misses_the_cache():
+    cache = CredentialCache(max_size=10, ttl_seconds=60, clock=FakeClock())
+    cache.put("alice", "secret", ALICE)
+
+    assert cache.get("alice", "guess") is None
+    assert cache.get("bob", "secret") is None
+
+
+def test_invalidate_drops_every_entry_of_a_user():
+    cache = CredentialCache(max_size=10, ttl_seconds=60, clock=FakeClock())
+    cache.put("alice", "old", ALICE)
+    cache.put("alice", "new", ALICE)
+    cache.put("bob", "b", BOB)
+
+    cache.invalidate("alice")
+
+    assert cache.get("alice", "old") is None
+    assert cache.get("alice", "new") is None
+    assert cache.get("bob", "b") == BOB
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = CredentialCache(max_size=0, ttl_seconds=60, clock=FakeClock())
+    cache.put("alice", "secret", ALICE)
+
+    assert cache.get("alice", "secret") is None
+
+
+def test_cached_basic_credentials_skip_the_users_table(count_statements):
+    credential_cache.clear()
+    client = TestClient(create_app())
+    auth = (settings.admin_username, settings.admin_password)
+    assert client.get("/api/auth/me", auth=auth).status_code == 200
+
+    with count_statements() as statements:
+        assert client.get("/api/auth/me", auth=auth).status_code == 200
+
+    assert not [statement for statement in statements if "users" in statement]
+
+
+def test_creating_a_user_drops_cached_credentials_for_the_name():
+    credential_cache.put("cache-target", "stale", ALICE)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/api/users",
+        json={"username": "cache-target", "password": "fresh-password", "role": "user"},
+        auth=(settings.admin_username, settings.admin_password),
+    )
+
+    assert response.status_code == 200
+    assert credential_cache.get("cache-target", "stale") is None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db import open_snapshot_session
+from app.main import create_app
+from app.models import ExportJob
+from app.services.export_cache import export_cache
+from app.services.export_jobs import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    export_job_runner,
+    recover_interrupted_jobs,
+    requeue_missing_result,
+)
+from app.services.export_service import iter_project_export
+
+
+def _job(project_id: int, status: str, owner: str, heartbeat_at: datetime | None) -> ExportJob:
+    now = datetime.utcnow()
+    return ExportJob(
+        project_id=project_id,
+        format="csv",
+        status=status,
+        progress=0.0,
+        error="",
+        owner=owner,
+        created_at=now - timedelta(hours=1),
+        heartbeat_at=heartbeat_at,
+        expires_at=now + timedelta(hours=1),
+    )
+
+
+def test_recovery_only_fails_jobs_with_an_expired_lease(session, dataset):
+    stale = datetime.utcnow() - timedelta(seconds=settings.export_job_lease_seconds * 2)
+    live = _job(dataset.project_id, JOB_RUNNING, "other-instance", datetime.utcnow())
+    expired = _job(dataset.project_id, JOB_RUNNING, "dead-instance", stale)
+    legacy = _job(dataset.project_id, JOB_QUEUED, None, None)
+    session.add_all([live, expired, legacy])
+    session.commit()
+
+    recover_interrupted_jobs(session)
+
+    session.refresh(live)
+    session.refresh(expired)
+    session.refresh(legacy)
+    assert live.status == JOB_RUNNING
+    assert expired.status == JOB_FAILED
+    assert legacy.status == JOB_FAILED
+
+
+def test_job_runs_only_when_owned_by_this_runner(session, dataset):
+    foreign = _job(dataset.project_id, JOB_QUEUED, "other-instance", datetime.utcnow())
+    owned = _job(dataset.project_id, JOB_QUEUED, export_job_runner.owner, datetime.utcnow())
+    session.add_all([foreign, owned])
+    session.commit()
+
+    export_job_runner._run(foreign.id)
+    export_job_runner._run(owned.id)
+
+    session.refresh(foreign)
+    session.refresh(owned)
+    assert foreign.status == JOB_QUEUED
+    assert owned.status == JOB_DONE
+    assert owned.progress == 1.0
+    assert owned.file_size > 0
+
+
+def test_rendering_reports_progress_per_row(dataset):
+    export_cache.clear()
+    fractions: list[float] = []
+
+    with open_snapshot_session() as snapshot:
+        content = b"".join(iter_project_export(snapshot, dataset.project_id, "csv", progress=fractions.append))
+
+    assert content
+    assert len(fractions) > 1
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1.0
+
+
+def test_done_job_without_its_file_is_rendered_again(session, dataset, monkeypatch, tmp_path):
+    submitted: list[int] = []
+    monkeypatch.setattr(export_job_runner, "submit", submitted.append)
+    lost = _job(dataset.project_id, JOB_DONE, "restarted-instance", datetime.utcnow())
+    lost.file_path = str(tmp_path / "lost.csv")
+    lost.file_size = 10
+    session.add(lost)
+    session.commit()
+    client = TestClient(create_app())
+    auth = (settings.admin_username, settings.admin_password)
+
+    response = client.get(f"/api/exports/{lost.id}/download", auth=auth)
+
+    assert response.status_code == 409
+    assert submitted == [lost.id]
+    session.refresh(lost)
+    assert lost.status == JOB_QUEUED
+    assert lost.owner == export_job_runner.owner
+    assert lost.file_path is None
+    assert client.get(f"/api/exports/{lost.id}", auth=auth).json()["download_url"] is None
+
+    export_job_runner._run(lost.id)
+
+    response = client.get(f"/api/exports/{lost.id}/download", auth=auth)
+    assert response.status_code == 200
+    assert response.content
+    assert submitted == [lost.id]
+
+
+def test_job_with_its_file_is_left_alone(session, dataset, monkeypatch, tmp_path):
+    submitted: list[int] = []
+    monkeypatch.setattr(export_job_runner, "submit", submitted.append)
+    kept = _job(dataset.project_id, JOB_DONE, "other-instance", datetime.utcnow())
+    kept.file_path = str(tmp_path / "kept.csv")
+    (tmp_path / "kept.csv").write_text("id\n")
+    session.add(kept)
+    session.commit()
+
+    assert not requeue_missing_result(session, kept)
+    assert kept.status == JOB_DONE
+    assert submitted == []
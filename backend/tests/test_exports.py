@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.exports import router
+from app.services.export_cache import export_cache
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    export_cache.clear()
+    return TestClient(app)
+
+
+def test_repeated_export_is_served_from_cache(client, dataset):
+    url = f"/projects/{dataset.project_id}/export.csv"
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-length"] == str(len(first.content))
+    assert second.content == first.content
+    assert client.get(url, headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+
+def test_cached_export_survives_eviction_after_lookup(client, dataset, monkeypatch):
+    url = f"/projects/{dataset.project_id}/export.csv"
+    expected = client.get(url).content
+    key = client.get(url).headers["etag"].strip('"')
+
+    open_cached = export_cache.open
+
+    def open_then_evict(cache_key):
+        file = open_cached(cache_key)
+        export_cache.clear()
+        return file
+
+    monkeypatch.setattr(export_cache, "open", open_then_evict)
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == expected
+    assert not (export_cache._directory / key).exists()
+
+
+def test_missing_cached_file_falls_back_to_rendering(client, dataset):
+    url = f"/projects/{dataset.project_id}/export.csv"
+    expected = client.get(url)
+    key = expected.headers["etag"].strip('"')
+    (export_cache._directory / key).unlink()
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    with export_cache.open(key) as file:
+        assert file.read() == expected.content
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_app
+
+
+def test_metrics_require_the_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    client = TestClient(create_app())
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "http_request" in response.text
+
+
+def test_metrics_are_not_served_without_a_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", None)
+    client = TestClient(create_app())
+
+    assert client.get("/metrics").status_code == 404
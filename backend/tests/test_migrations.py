@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, select
+
+from app.db_init import verify_schema
+from app.migrations import runner
+from app.migrations.runner import Migration, head_revision, load_migrations, schema_migrations, upgrade
+
+
+def test_upgrade_builds_the_model_schema_once(tmp_path):
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    assert upgrade(db_engine) == head_revision()
+    assert upgrade(db_engine) == head_revision()
+
+    assert verify_schema(db_engine) == []
+    with db_engine.connect() as connection:
+        revisions = connection.execute(select(schema_migrations.c.revision)).scalars().all()
+    assert sorted(revisions) == list(range(1, head_revision() + 1))
+
+
+def test_non_transactional_revision_runs_on_an_autocommit_connection(tmp_path, monkeypatch):
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    isolation_levels = []
+
+    def record_isolation(connection) -> None:
+        isolation_levels.append(connection.get_execution_options().get("isolation_level"))
+
+    extra = Migration(head_revision() + 1, "outside a transaction", record_isolation, transactional=False)
+    migrations = [*load_migrations(), extra]
+    monkeypatch.setattr(runner, "load_migrations", lambda: migrations)
+
+    assert upgrade(db_engine) == extra.revision
+    assert upgrade(db_engine) == extra.revision
+    assert isolation_levels == ["AUTOCOMMIT"]
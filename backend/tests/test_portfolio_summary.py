@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.main import create_app
+from app.models import Project
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import build_portfolio_summary, build_project_summary
+from benchmarks.generator import DatasetSizes, generate_dataset
+
+
+@pytest.fixture(scope="module")
+def portfolio(dataset) -> list[int]:
+    with SessionLocal() as db_session:
+        extra = [
+            generate_dataset(db_session, DatasetSizes(modules=5 + seed, nodes=3 * seed), seed=seed).project_id
+            for seed in range(2, 5)
+        ]
+    return [dataset.project_id, *extra]
+
+
+def test_portfolio_matches_per_project_summaries(session, portfolio):
+    results = build_portfolio_summary(session, portfolio)
+
+    assert [result.project_id for result in results] == portfolio
+    for result in results:
+        expected = build_project_summary(session, result.project_id)
+        assert result.totals.model_dump() == pytest.approx(expected.totals.model_dump(), rel=1e-9)
+        assert [scenario.model_dump() for scenario in result.scenarios] == [
+            pytest.approx(scenario.model_dump(), rel=1e-9) for scenario in expected.scenarios
+        ]
+
+
+def test_portfolio_of_all_projects_covers_every_project(session, portfolio):
+    results = build_portfolio_summary(session, None)
+
+    assert len(results) == session.scalar(select(func.count()).select_from(Project))
+    assert set(portfolio) <= {result.project_id for result in results}
+
+
+def test_portfolio_statements_do_not_grow_with_projects(session, portfolio, count_statements):
+    summary_cache.clear()
+    with count_statements() as single:
+        build_portfolio_summary(session, portfolio[:1])
+    with count_statements() as several:
+        build_portfolio_summary(session, portfolio)
+
+    assert len(several) == len(single)
+
+
+def test_missing_projects_are_not_found(portfolio):
+    missing = max(portfolio) + 1000
+    client = TestClient(create_app())
+
+    response = client.get(
+        "/api/projects/summary",
+        params={"ids": [portfolio[0], missing]},
+        auth=(settings.admin_username, settings.admin_password),
+    )
+
+    assert response.status_code == 404
+    assert str(missing) in response.json()["detail"]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.log_config import REQUEST_LOGGER
+from app.main import create_app
+
+
+def test_each_request_emits_one_json_record_with_its_fields():
+    client = TestClient(create_app())
+    (handler,) = [
+        handler for handler in logging.getLogger(REQUEST_LOGGER).handlers if handler.get_name() == "app.requests.json"
+    ]
+    stream = io.StringIO()
+    previous = handler.setStream(stream)
+    try:
+        response = client.get("/api/auth/me")
+    finally:
+        handler.setStream(previous)
+
+    (line,) = stream.getvalue().splitlines()
+    record = json.loads(line)
+    assert record["level"] == "INFO"
+    assert record["logger"] == REQUEST_LOGGER
+    assert record["http_method"] == "GET"
+    assert record["http_path"] == "/api/auth/me"
+    assert record["http_status"] == response.status_code
+    assert record["duration_ms"] >= 0
+    assert {"db_queries", "db_ms", "db_slowest_ms", "db_slowest_statement"} <= record.keys()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.scenarios import MIN_BUDGETED_ITERATIONS, affordable_iterations, simulate_totals
+from app.main import create_app
+from app.services.summary_service import build_project_simulation
+
+
+def _triangular_quantile(probability: float, low: float, mode: float, high: float) -> float:
+    split = (mode - low) / (high - low)
+    if probability < split:
+        return low + math.sqrt(probability * (high - low) * (mode - low))
+    return high - math.sqrt((1 - probability) * (high - low) * (high - mode))
+
+
+def test_seeded_simulation_is_reproducible(session, dataset):
+    first = build_project_simulation(session, dataset.project_id, 5_000, seed=7)
+    again = build_project_simulation(session, dataset.project_id, 5_000, seed=7)
+    other = build_project_simulation(session, dataset.project_id, 5_000, seed=8)
+
+    assert again.distribution == first.distribution
+    assert other.distribution.cost_p50 != first.distribution.cost_p50
+
+
+@pytest.mark.parametrize("distribution", ["pert", "triangular"])
+def test_percentiles_are_ordered(session, dataset, distribution):
+    summary = build_project_simulation(session, dataset.project_id, 5_000, seed=1, distribution=distribution)
+    result = summary.distribution
+
+    assert result.hours_p10 <= result.hours_p50 <= result.hours_p90
+    assert result.cost_p10 <= result.cost_p50 <= result.cost_p90
+    assert sum(result.hours_histogram.counts) == result.iterations
+
+
+def test_triangular_draws_match_the_analytic_quantiles():
+    result = simulate_totals(
+        hours=np.array([100.0]),
+        costs=np.array([0.0]),
+        spreads=np.array([(0.2, 0.6)]),
+        iterations=200_000,
+        seed=3,
+        distribution="triangular",
+    )
+
+    for percentile in (10, 50, 90):
+        expected = 100.0 * _triangular_quantile(percentile / 100, 0.8, 1.0, 1.6)
+        assert result.hours_percentiles[percentile] == pytest.approx(expected, abs=0.2)
+
+
+def test_pert_concentrates_closer_to_the_mode_than_triangular():
+    arguments = dict(hours=np.array([100.0]), costs=np.array([1000.0]), spreads=np.array([(0.2, 0.6)]), seed=3)
+    pert = simulate_totals(iterations=100_000, distribution="pert", **arguments)
+    triangular = simulate_totals(iterations=100_000, distribution="triangular", **arguments)
+
+    assert 100.0 < pert.hours_percentiles[50] < triangular.hours_percentiles[50]
+    assert pert.hours_percentiles[90] - pert.hours_percentiles[10] < (
+        triangular.hours_percentiles[90] - triangular.hours_percentiles[10]
+    )
+    # Cost follows the same draw as hours.
+    assert pert.cost_percentiles[50] == pytest.approx(pert.hours_percentiles[50] * 10, rel=1e-6)
+
+
+def test_iterations_are_clamped_to_the_sample_budget(monkeypatch):
+    monkeypatch.setattr(settings, "monte_carlo_max_samples", 6_000_000)
+
+    assert affordable_iterations(100_000, 40) == 100_000
+    assert affordable_iterations(100_000, 300) == 20_000
+    assert affordable_iterations(100_000, 10**7) == MIN_BUDGETED_ITERATIONS
+
+
+def test_simulation_of_a_missing_project_is_not_found():
+    client = TestClient(create_app())
+
+    response = client.get(
+        "/api/projects/999999/summary",
+        params={"mode": "monte_carlo"},
+        auth=(settings.admin_username, settings.admin_password),
+    )
+
+    assert response.status_code == 404
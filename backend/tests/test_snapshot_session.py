@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from sqlalchemy import select, update
+
+from app.db import SessionLocal, open_snapshot_session
+from app.models import Project
+
+
+def test_snapshot_reads_ignore_concurrent_commits(dataset):
+    with open_snapshot_session() as snapshot:
+        revision = snapshot.execute(select(Project.revision).where(Project.id == dataset.project_id)).scalar_one()
+
+        with SessionLocal() as writer:
+            writer.execute(
+                update(Project).where(Project.id == dataset.project_id).values(revision=Project.revision + 1)
+            )
+            writer.commit()
+
+        again = snapshot.execute(select(Project.revision).where(Project.id == dataset.project_id)).scalar_one()
+        assert again == revision
+
+    with SessionLocal() as session:
+        current = session.execute(select(Project.revision).where(Project.id == dataset.project_id)).scalar_one()
+    assert current == revision + 1
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api.projects import update_project_module
+from app.schemas import ProjectModuleUpdate
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import _get_project_revision, build_project_summary
+
+
+def test_delta_update_leaves_states_held_by_readers_untouched(session, dataset):
+    project_id = dataset.project_id
+    project_module_id = dataset.project_module_ids[0]
+    build_project_summary(session, project_id)
+    held = summary_cache.get(project_id, _get_project_revision(session, project_id))
+    held_totals = held.summary.totals
+    held_contributions = dict(held.contributions)
+
+    update_project_module(project_id, project_module_id, ProjectModuleUpdate(override_backend=123.0), session)
+
+    assert held.summary.totals == held_totals
+    assert held.contributions == held_contributions
+    updated = summary_cache.get(project_id, _get_project_revision(session, project_id))
+    assert updated is not held
+
+    summary_cache.clear()
+    recomputed = build_project_summary(session, project_id).totals
+    assert updated.summary.totals.cost_total == pytest.approx(recomputed.cost_total)
+    assert updated.summary.totals.hours_backend == pytest.approx(recomputed.hours_backend)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import build_project_summary
+
+
+def test_cold_summary_loads_inputs_in_constant_statements(session, dataset, count_statements):
+    summary_cache.clear()
+
+    with count_statements() as statements:
+        build_project_summary(session, dataset.project_id)
+
+    # Revision lookup plus the single union query for all inputs.
+    assert len(statements) == 2
+
+
+def test_warm_summary_only_checks_the_revision(session, dataset, count_statements):
+    build_project_summary(session, dataset.project_id)
+
+    with count_statements() as statements:
+        build_project_summary(session, dataset.project_id)
+
+    assert len(statements) == 1
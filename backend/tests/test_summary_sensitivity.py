@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models import ModuleRoleHours, ProjectModule
+from app.services.revision_service import bump_project_revision
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import build_project_sensitivity, build_project_summary
+
+HOURS_CHANGE = 0.2
+
+
+def _recomputed_totals(session, project_id: int, project_module_id: int, factor: float = 1.0, **levels):
+    """Project totals after scaling one module's hours and overriding its levels, without keeping the change."""
+
+    project_module = session.get(ProjectModule, project_module_id)
+    module = project_module.module
+    for role in ("frontend", "backend", "qa"):
+        override = getattr(project_module, f"override_{role}")
+        hours = override if override is not None else getattr(module, f"hours_{role}")
+        setattr(project_module, f"override_{role}", hours * factor)
+    for name, value in levels.items():
+        setattr(project_module, name, value)
+    session.execute(
+        update(ModuleRoleHours)
+        .where(ModuleRoleHours.module_id == module.id)
+        .values(hours=ModuleRoleHours.hours * factor)
+    )
+    bump_project_revision(session, project_id)
+    session.flush()
+    totals = build_project_summary(session, project_id).totals
+    # The rollback reuses the bumped revision for the next recomputation, so drop the state cached under it.
+    session.rollback()
+    summary_cache.clear()
+    return totals
+
+
+def test_ranking_is_ordered_by_the_largest_effect(session, dataset):
+    results = build_project_sensitivity(session, dataset.project_id, HOURS_CHANGE)
+
+    impacts = [item.impact for item in results]
+    assert impacts == sorted(impacts, reverse=True)
+    for item in results:
+        assert item.impact == pytest.approx(max(abs(effect.delta_cost) for effect in item.effects))
+
+
+def test_perturbed_module_matches_a_full_recomputation(session, dataset):
+    results = build_project_sensitivity(session, dataset.project_id, HOURS_CHANGE)
+    position, item = next((position, item) for position, item in enumerate(results) if item.item_type == "module")
+    summary_cache.clear()
+    base = build_project_summary(session, dataset.project_id).totals
+
+    recomputed = {
+        f"hours{sign}{HOURS_CHANGE * 100:g}%": _recomputed_totals(session, dataset.project_id, item.item_id, factor)
+        for sign, factor in (("+", 1 + HOURS_CHANGE), ("-", 1 - HOURS_CHANGE))
+    }
+    for effect in item.effects:
+        if effect.change not in recomputed:
+            name, value = effect.change.split("=")
+            level = {"true": True, "false": False}.get(value, value)
+            recomputed[effect.change] = _recomputed_totals(session, dataset.project_id, item.item_id, **{name: level})
+
+    assert {effect.change for effect in item.effects} == set(recomputed)
+    for effect in item.effects:
+        totals = recomputed[effect.change]
+        assert effect.delta_hours == pytest.approx(totals.hours_total - base.hours_total, rel=1e-9, abs=1e-9)
+        assert effect.delta_cost == pytest.approx(totals.cost_total - base.cost_total, rel=1e-9, abs=1e-6)
+    impact = max(abs(totals.cost_total - base.cost_total) for totals in recomputed.values())
+    assert item.impact == pytest.approx(impact, rel=1e-9)
+    assert all(other.impact >= impact * (1 - 1e-9) for other in results[:position])
+    assert all(other.impact <= impact * (1 + 1e-9) for other in results[position + 1 :])
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+from app.main import create_app
+from app.models import Project, ProjectCoefficient, Rate
+from app.schemas import RateUpsert, SummarySweepRequest
+from app.services.revision_service import bump_project_revision
+from app.services.summary_cache import summary_cache
+from app.services.summary_service import build_project_summary, build_project_sweep
+
+
+def _apply_point(session, project_id: int, point, rate_sets: list[list[RateUpsert]]) -> None:
+    session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(uncertainty_level=point.uncertainty_level, uiux_level=point.uiux_level, legacy_code=point.legacy_code)
+    )
+    session.execute(delete(ProjectCoefficient).where(ProjectCoefficient.project_id == project_id))
+    session.add_all(
+        ProjectCoefficient(project_id=project_id, name=name, multiplier=multiplier)
+        for name, multiplier in point.coefficients.items()
+    )
+    if point.rate_set is not None:
+        for rate in rate_sets[point.rate_set]:
+            session.execute(
+                update(Rate)
+                .where(Rate.role == rate.role, Rate.level == rate.level)
+                .values(hourly_rate=rate.hourly_rate)
+            )
+    bump_project_revision(session, project_id)
+    session.flush()
+
+
+def test_each_grid_point_equals_the_summary_with_its_settings_applied(session, dataset):
+    rates = session.execute(select(Rate)).scalars().all()
+    request = SummarySweepRequest(
+        uncertainty_levels=["known", "new_tech"],
+        uiux_levels=["mvp", "award"],
+        legacy_code=[False, True],
+        coefficients={"integration": [1.0, 1.2]},
+        rate_sets=[
+            [RateUpsert(role=rate.role, level=rate.level, hourly_rate=rate.hourly_rate * 1.5) for rate in rates]
+        ],
+    )
+
+    results = build_project_sweep(session, dataset.project_id, request)
+
+    assert len(results) == 16
+    for result in results:
+        _apply_point(session, dataset.project_id, result.point, request.rate_sets)
+        expected = build_project_summary(session, dataset.project_id)
+        # The rollback reuses the bumped revision for the next point, so drop the state cached under it.
+        session.rollback()
+        summary_cache.clear()
+        assert result.totals.model_dump() == pytest.approx(expected.totals.model_dump(), rel=1e-9)
+        assert [scenario.total_cost for scenario in result.scenarios] == pytest.approx(
+            [scenario.total_cost for scenario in expected.scenarios], rel=1e-9
+        )
+
+
+def test_grid_over_the_point_limit_is_rejected(dataset, monkeypatch):
+    monkeypatch.setattr(settings, "sweep_max_points", 3)
+    client = TestClient(create_app())
+
+    response = client.post(
+        f"/api/projects/{dataset.project_id}/summary/sweep",
+        json={"uncertainty_levels": ["known", "new_tech"], "legacy_code": [False, True]},
+        auth=(settings.admin_username, settings.admin_password),
+    )
+
+    assert response.status_code == 400
+    assert "limit is 3" in response.json()["detail"]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.main import create_app
+from app.models import Module, Project, ProjectCoefficient, ProjectModule
+from app.services import upsert_service
+from app.services.upsert_service import bulk_upsert, rows_as_applied
+
+KEY = ("project_id", "name")
+UPDATE = ("multiplier",)
+
+
+@pytest.fixture(params=["dialect", "generic"])
+def upsert_path(request, monkeypatch) -> str:
+    if request.param == "generic":
+        monkeypatch.setattr(upsert_service, "_DIALECT_INSERTS", {})
+    return request.param
+
+
+@pytest.fixture
+def project(session) -> Project:
+    project = Project(name="Upsert target")
+    session.add(project)
+    session.flush()
+    return project
+
+
+def _rows(project: Project, *pairs: tuple[str, float]) -> list[dict]:
+    return [{"project_id": project.id, "name": name, "multiplier": multiplier} for name, multiplier in pairs]
+
+
+def test_one_call_inserts_new_keys_and_updates_existing_ones(session, project, upsert_path):
+    (existing,) = bulk_upsert(session, ProjectCoefficient, _rows(project, ("a", 1.0)), KEY, UPDATE)
+    existing_id = existing.id
+
+    updated, inserted = bulk_upsert(session, ProjectCoefficient, _rows(project, ("a", 2.0), ("b", 3.0)), KEY, UPDATE)
+
+    assert (updated.id, updated.multiplier) == (existing_id, 2.0)
+    assert inserted.id != existing_id
+    assert inserted.multiplier == 3.0
+    stored = session.execute(
+        select(ProjectCoefficient.name, ProjectCoefficient.multiplier)
+        .where(ProjectCoefficient.project_id == project.id)
+        .order_by(ProjectCoefficient.name)
+    ).all()
+    assert [tuple(row) for row in stored] == [("a", 2.0), ("b", 3.0)]
+
+
+def test_repeated_keys_collapse_into_the_last_row(session, project, upsert_path):
+    rows = _rows(project, ("a", 1.0), ("b", 2.0), ("a", 5.0))
+
+    records = bulk_upsert(session, ProjectCoefficient, rows, KEY, UPDATE)
+
+    assert records[0] is records[2]
+    assert records[0].multiplier == 5.0
+    assert [row["multiplier"] for row in rows_as_applied(records, rows)] == [1.0, 2.0, 5.0]
+    assert [row["id"] for row in rows_as_applied(records, rows)] == [records[0].id, records[1].id, records[0].id]
+
+
+def test_records_follow_input_order(session, project, upsert_path):
+    bulk_upsert(session, ProjectCoefficient, _rows(project, ("b", 1.0)), KEY, UPDATE)
+
+    records = bulk_upsert(session, ProjectCoefficient, _rows(project, ("c", 1.0), ("a", 1.0), ("b", 1.0)), KEY, UPDATE)
+
+    assert [record.name for record in records] == ["c", "a", "b"]
+
+
+def test_rows_are_split_into_parameter_bounded_batches(session, project, monkeypatch, count_statements):
+    # Three columns per row: at most two rows per statement.
+    monkeypatch.setattr(upsert_service, "UPSERT_MAX_PARAMETERS", 6)
+    rows = _rows(project, *((f"k{index}", float(index)) for index in range(5)))
+
+    with count_statements() as statements:
+        records = bulk_upsert(session, ProjectCoefficient, rows, KEY, UPDATE)
+
+    assert len([statement for statement in statements if statement.startswith("INSERT")]) == 3
+    assert [(record.name, record.multiplier) for record in records] == [
+        (row["name"], row["multiplier"]) for row in rows
+    ]
+
+
+def test_generic_path_uses_a_fixed_number_of_statements(session, project, monkeypatch, count_statements):
+    monkeypatch.setattr(upsert_service, "_DIALECT_INSERTS", {})
+    bulk_upsert(session, ProjectCoefficient, _rows(project, ("a", 1.0), ("b", 1.0)), KEY, UPDATE)
+    rows = _rows(project, ("a", 2.0), ("b", 2.0), *((f"k{index}", 1.0) for index in range(20)))
+
+    with count_statements() as statements:
+        records = bulk_upsert(session, ProjectCoefficient, rows, KEY, UPDATE)
+
+    # Lookup, one executemany update, one multi-row insert and the reload.
+    assert len(statements) == 4
+    assert [record.name for record in records] == [row["name"] for row in rows]
+    assert records[0].multiplier == 2.0
+
+
+def test_assignment_endpoint_reports_each_entry_as_applied(session):
+    module_id = session.execute(select(Module.id).limit(1)).scalar_one()
+    project = Project(name="Assignment responses")
+    session.add(project)
+    session.flush()
+    project_module = ProjectModule(project_id=project.id, module_id=module_id, custom_name="Module")
+    session.add(project_module)
+    session.commit()
+    client = TestClient(create_app())
+
+    response = client.post(
+        f"/api/projects/{project.id}/assignments",
+        json=[
+            {"project_module_id": project_module.id, "role": "backend", "level": "junior"},
+            {"project_module_id": project_module.id, "role": "backend", "level": "middle"},
+        ],
+        auth=(settings.admin_username, settings.admin_password),
+    )
+
+    assert response.status_code == 200
+    first, second = response.json()
+    assert (first["level"], second["level"]) == ("junior", "middle")
+    assert first["id"] == second["id"]
+    stored = client.get(
+        f"/api/projects/{project.id}/assignments", auth=(settings.admin_username, settings.admin_password)
+    ).json()
+    assert [entry["level"] for entry in stored] == ["middle"]